@@ -2,24 +2,102 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable
+import json
 import logging
 from datetime import timedelta
+from time import monotonic, perf_counter
 from typing import Any
 
-import aiohttp
-import async_timeout
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.helpers import config_validation as cv
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL
+from .client import CannotConnect, FALS22Client
+from .const import (
+    CONF_ADDITIONAL_HOSTS,
+    CONF_COMPACT_STATISTICS,
+    CONF_EXPORT_MAX_FILE_SIZE,
+    CONF_EXPORT_ROTATE_INTERVAL,
+    CONF_ENTRY_TYPE,
+    CONF_EXPORT_SAMPLES,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_HEDGE_REQUESTS,
+    CONF_HISTORY_DEPTH,
+    CONF_MAX_RETRIES,
+    CONF_HOST,
+    CONF_POLL_DEADLINE,
+    CONF_PROFILES,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SYNC_POLLING,
+    CONF_THIN_POLLING,
+    CONF_WRITE_QUEUE_MAX_AGE,
+    DATA_FLEET,
+    DATA_ORCHESTRATOR,
+    DOMAIN,
+    EVENT_FALS22,
+    DEFAULT_COMPACT_STATISTICS,
+    DEFAULT_EXPORT_MAX_FILE_SIZE,
+    DEFAULT_EXPORT_ROTATE_INTERVAL,
+    DEFAULT_EXPORT_SAMPLES,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_HEDGE_REQUESTS,
+    DEFAULT_HISTORY_DEPTH,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POLL_DEADLINE,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SYNC_POLLING,
+    DEFAULT_THIN_POLLING,
+    DEFAULT_WRITE_QUEUE_MAX_AGE,
+    ENTRY_TYPE_FLEET,
+    PROFILE_SETTINGS,
+    SIGNAL_UNITS_CHANGED,
+)
+from .compact_statistics import HourlyStatistics
+from .device_helper import get_device_info, settings_equal
+from .exporter import SampleExporter
+from .fleet import FleetAggregator
+from .metrics import FALS22MetricsView, PollStats
+from .orchestrator import ManualVentilationOrchestrator
+from .profiler import CYCLE_FAILED, CYCLE_REPEATED, CycleProfiler
+from .rediscovery import UnitRediscovery
+from .runtime import VentilationAccounting
+from .sample_clock import DeviceSampleClock
+from .sample_history import SampleHistory, history_depth
+from .ventilation_logic import (
+    device_time,
+    evaluate_ventilation,
+    seconds_until_working_window,
+)
+from .write_queue import FALS22WriteQueue
+from .websocket import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
+# Keep polling at the full rate this long after a write to follow its effect
+WRITE_ACTIVITY_PERIOD = 300  # seconds
+
+# Outcomes of a settings write
+WRITE_ACCEPTED = "accepted"
+WRITE_QUEUED = "queued"
+WRITE_REJECTED = "rejected"
+
 # Add the missing platforms
 PLATFORMS: list[Platform] = [
     Platform.SENSOR, 
@@ -29,6 +107,11 @@ PLATFORMS: list[Platform] = [
     Platform.TIME,
 ]
 
+# A fleet entry only has aggregate sensors
+FLEET_PLATFORMS: list[Platform] = [Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 # Service schemas
 SET_MANUAL_VENTILATION_SCHEMA = vol.Schema(
     {
@@ -37,6 +120,20 @@ SET_MANUAL_VENTILATION_SCHEMA = vol.Schema(
     }
 )
 
+FLEET_MANUAL_VENTILATION_SCHEMA = vol.Schema(
+    {
+        vol.Optional("duration", default=30): vol.All(
+            vol.Coerce(int), vol.Range(min=5, max=300)
+        ),
+        vol.Optional("max_running"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional("request_rate", default=2): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=20)
+        ),
+        vol.Optional("config_entry_id"): cv.string,
+        vol.Optional("stop", default=False): cv.boolean,
+    }
+)
+
 UPDATE_MULTIPLE_SETTINGS_SCHEMA = vol.Schema(
     {
         vol.Optional("min_temp"): vol.All(vol.Coerce(int), vol.Range(min=0, max=35)),
@@ -48,13 +145,58 @@ UPDATE_MULTIPLE_SETTINGS_SCHEMA = vol.Schema(
     }
 )
 
+SAVE_PROFILE_SCHEMA = UPDATE_MULTIPLE_SETTINGS_SCHEMA.extend(
+    {
+        vol.Required("name"): cv.string,
+        vol.Optional("config_entry_id"): cv.string,
+        vol.Optional("working_time_from"): cv.time,
+        vol.Optional("working_time_to"): cv.time,
+    }
+)
+
+APPLY_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required("name"): cv.string,
+        vol.Optional("config_entry_id"): cv.string,
+    }
+)
+
+DELETE_PROFILE_SCHEMA = APPLY_PROFILE_SCHEMA
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("cycles", default=5): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+        vol.Optional("timeout", default=300): vol.All(
+            vol.Coerce(int), vol.Range(min=10, max=3600)
+        ),
+        vol.Optional("config_entry_id"): cv.string,
+        vol.Optional("write_file", default=False): cv.boolean,
+    }
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the FALS22 integration."""
+    hass.http.register_view(FALS22MetricsView())
+    async_register_websocket_commands(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up FALS22 from a config entry."""
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_FLEET:
+        return await _async_setup_fleet_entry(hass, entry)
+
     coordinator = FALS22DataUpdateCoordinator(hass, entry)
+    await coordinator.write_queue.async_load()
+    await coordinator.history.async_load()
+    await coordinator.runtime.async_load()
+    await coordinator.async_configure_exporter()
+    coordinator.configure_compact_statistics()
     await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    async_dispatcher_send(hass, SIGNAL_UNITS_CHANGED)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -70,6 +212,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         else:
             _LOGGER.error("Failed to set manual ventilation mode")
 
+    async def async_fleet_manual_ventilation(call: ServiceCall) -> None:
+        """Handle fleet manual ventilation service call."""
+        running: ManualVentilationOrchestrator | None = hass.data.get(DATA_ORCHESTRATOR)
+        if call.data["stop"]:
+            if running is not None:
+                await running.async_stop()
+            return
+        if running is not None and not running.done:
+            raise HomeAssistantError("A fleet manual ventilation is already running")
+
+        targets = _get_target_coordinators(hass, call.data.get("config_entry_id"))
+        orchestrator = ManualVentilationOrchestrator(
+            hass,
+            targets,
+            call.data["duration"],
+            call.data.get("max_running"),
+            call.data["request_rate"],
+        )
+        hass.data[DATA_ORCHESTRATOR] = orchestrator
+        orchestrator.async_start()
+
     async def async_update_multiple_settings(call: ServiceCall) -> None:
         """Handle update multiple settings service call."""
         settings = {k: v for k, v in call.data.items()}
@@ -80,6 +243,117 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         else:
             _LOGGER.error("Failed to update settings: %s", settings)
 
+    async def async_save_profile(call: ServiceCall) -> None:
+        """Handle save profile service call."""
+        name = call.data["name"]
+        profile = _profile_from_call(call.data)
+
+        for target in _get_target_coordinators(hass, call.data.get("config_entry_id")):
+            # Without explicit values the current device settings are stored
+            values = profile or {
+                key: target.data.get("settings", {}).get(key)
+                for key in PROFILE_SETTINGS
+                if target.data.get("settings", {}).get(key) is not None
+            }
+            profiles = {**target.entry.options.get(CONF_PROFILES, {}), name: values}
+            hass.config_entries.async_update_entry(
+                target.entry, options={**target.entry.options, CONF_PROFILES: profiles}
+            )
+            _LOGGER.debug("Saved profile %s for %s: %s", name, target.host, values)
+
+    async def async_apply_profile(call: ServiceCall) -> ServiceResponse:
+        """Handle apply profile service call."""
+        name = call.data["name"]
+        targets = [
+            target
+            for target in _get_target_coordinators(hass, call.data.get("config_entry_id"))
+            if name in target.entry.options.get(CONF_PROFILES, {})
+        ]
+        if not targets:
+            raise HomeAssistantError(f"Profile {name} is not defined")
+
+        results = await asyncio.gather(
+            *(
+                target.async_apply_settings(target.entry.options[CONF_PROFILES][name])
+                for target in targets
+            )
+        )
+        response: dict[str, Any] = {}
+        not_applied: list[str] = []
+        for target, (status, mismatches) in zip(targets, results):
+            response[target.entry.entry_id] = {
+                "host": target.host,
+                "status": status,
+                "applied": status == WRITE_ACCEPTED and not mismatches,
+                "mismatches": mismatches,
+            }
+            if status == WRITE_QUEUED:
+                _LOGGER.warning(
+                    "Profile %s is applied to %s once it is reachable", name, target.host
+                )
+                not_applied.append(f"{target.host} (queued until reachable)")
+            elif status == WRITE_REJECTED:
+                _LOGGER.error("Failed to apply profile %s to %s", name, target.host)
+                not_applied.append(f"{target.host} (write failed)")
+            elif mismatches:
+                _LOGGER.warning(
+                    "Profile %s was not fully applied to %s: %s",
+                    name,
+                    target.host,
+                    mismatches,
+                )
+                not_applied.append(f"{target.host} ({', '.join(mismatches)})")
+
+        if call.return_response:
+            return response
+        if not_applied:
+            raise HomeAssistantError(
+                f"Profile {name} was not fully applied to {'; '.join(not_applied)}"
+            )
+        return None
+
+    async def async_delete_profile(call: ServiceCall) -> None:
+        """Handle delete profile service call."""
+        name = call.data["name"]
+
+        for target in _get_target_coordinators(hass, call.data.get("config_entry_id")):
+            profiles = dict(target.entry.options.get(CONF_PROFILES, {}))
+            if profiles.pop(name, None) is not None:
+                hass.config_entries.async_update_entry(
+                    target.entry, options={**target.entry.options, CONF_PROFILES: profiles}
+                )
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Handle profile service call."""
+        targets = _get_target_coordinators(hass, call.data.get("config_entry_id"))
+        if not targets:
+            raise HomeAssistantError("There are no FaLs22 units to profile")
+        if any(target.profiler is not None for target in targets):
+            raise HomeAssistantError("A profile is already being recorded")
+
+        profilers = [target.async_start_profile(call.data["cycles"]) for target in targets]
+        try:
+            # Slow or heartbeat polling would otherwise block the call for hours,
+            # after the timeout the cycles recorded so far are returned
+            await asyncio.wait(
+                [profiler.done for profiler in profilers], timeout=call.data["timeout"]
+            )
+        finally:
+            for target in targets:
+                target.async_stop_profile()
+
+        result: dict[str, Any] = {
+            target.entry.entry_id: {"host": target.host, **profiler.summary()}
+            for target, profiler in zip(targets, profilers)
+        }
+        if call.data["write_file"]:
+            path = hass.config.path(
+                f"{DOMAIN}_profile_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.json"
+            )
+            await hass.async_add_executor_job(_write_json, path, result)
+            _LOGGER.info("Wrote profile to %s", path)
+        return result
+
     hass.services.async_register(
         DOMAIN,
         "set_manual_ventilation",
@@ -87,6 +361,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         schema=SET_MANUAL_VENTILATION_SCHEMA,
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        "fleet_manual_ventilation",
+        async_fleet_manual_ventilation,
+        schema=FLEET_MANUAL_VENTILATION_SCHEMA,
+    )
+
     hass.services.async_register(
         DOMAIN,
         "update_multiple_settings",
@@ -94,21 +375,79 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         schema=UPDATE_MULTIPLE_SETTINGS_SCHEMA,
     )
 
+    hass.services.async_register(
+        DOMAIN, "save_profile", async_save_profile, schema=SAVE_PROFILE_SCHEMA
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "apply_profile",
+        async_apply_profile,
+        schema=APPLY_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN, "delete_profile", async_delete_profile, schema=DELETE_PROFILE_SCHEMA
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "profile",
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
     # Set up options update listener
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
     return True
 
 
+async def _async_setup_fleet_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up the aggregates of a group of units."""
+    aggregator = FleetAggregator(hass, entry)
+    aggregator.async_start()
+    hass.data.setdefault(DATA_FLEET, {})[entry.entry_id] = aggregator
+
+    await hass.config_entries.async_forward_entry_setups(entry, FLEET_PLATFORMS)
+    return True
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_FLEET:
+        if unload_ok := await hass.config_entries.async_unload_platforms(
+            entry, FLEET_PLATFORMS
+        ):
+            hass.data[DATA_FLEET].pop(entry.entry_id).async_stop()
+        return unload_ok
+
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        async_dispatcher_send(hass, SIGNAL_UNITS_CHANGED)
+        coordinator.rediscovery.async_cancel()
+        if coordinator.profiler is not None:
+            coordinator.profiler.finish()
+        if coordinator.exporter is not None:
+            await coordinator.exporter.async_stop()
+        if coordinator.compact_statistics is not None:
+            # The running hour is seeded from the history again, finished
+            # hours waiting for the recorder would be lost
+            coordinator.compact_statistics.async_import()
         
         # Remove services if this was the last entry
         if not hass.data[DOMAIN]:
+            if (orchestrator := hass.data.pop(DATA_ORCHESTRATOR, None)) is not None:
+                await orchestrator.async_stop()
             hass.services.async_remove(DOMAIN, "set_manual_ventilation")
+            hass.services.async_remove(DOMAIN, "fleet_manual_ventilation")
             hass.services.async_remove(DOMAIN, "update_multiple_settings")
+            hass.services.async_remove(DOMAIN, "save_profile")
+            hass.services.async_remove(DOMAIN, "apply_profile")
+            hass.services.async_remove(DOMAIN, "delete_profile")
+            hass.services.async_remove(DOMAIN, "profile")
             
     return unload_ok
 
@@ -119,11 +458,80 @@ async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     
     # Update the polling interval
     scan_interval = entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL)
+    coordinator.scan_interval = scan_interval
+    coordinator.sync_polling = entry.options.get(CONF_SYNC_POLLING, DEFAULT_SYNC_POLLING)
+    coordinator.thin_polling = entry.options.get(CONF_THIN_POLLING, DEFAULT_THIN_POLLING)
+    coordinator.heartbeat_interval = entry.options.get(
+        CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+    )
     coordinator.update_interval = timedelta(seconds=scan_interval)
+    coordinator.client.address.set_hosts(_candidate_hosts(entry))
+    _configure_requests(coordinator.client, entry)
+    coordinator.poll_deadline = entry.options.get(CONF_POLL_DEADLINE, DEFAULT_POLL_DEADLINE)
+    coordinator.write_queue.max_age = 60 * entry.options.get(
+        CONF_WRITE_QUEUE_MAX_AGE, DEFAULT_WRITE_QUEUE_MAX_AGE
+    )
+    coordinator.history.resize(
+        history_depth(
+            entry.options.get(CONF_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH), scan_interval
+        )
+    )
+    await coordinator.async_configure_exporter()
+    coordinator.configure_compact_statistics()
     
     _LOGGER.debug("Updated scan interval to %s seconds", scan_interval)
 
 
+def _candidate_hosts(entry: ConfigEntry) -> list[str]:
+    """Return the configured host followed by the additional addresses of the device."""
+    additional = entry.options.get(CONF_ADDITIONAL_HOSTS, "")
+    hosts = [entry.data["host"]]
+    hosts += [host.strip() for host in additional.split(",") if host.strip()]
+    return list(dict.fromkeys(hosts))
+
+
+def _configure_requests(client: FALS22Client, entry: ConfigEntry) -> None:
+    """Apply the timeout and retry options to the client."""
+    client.timeout = entry.options.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT)
+    client.max_retries = entry.options.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES)
+    client.hedging = entry.options.get(CONF_HEDGE_REQUESTS, DEFAULT_HEDGE_REQUESTS)
+
+
+def _get_target_coordinators(
+    hass: HomeAssistant, entry_id: str | None
+) -> list[FALS22DataUpdateCoordinator]:
+    """Return the coordinators a service call applies to.
+
+    The config entry of a fleet stands for the units in its group.
+    """
+    coordinators = hass.data.get(DOMAIN, {})
+    if entry_id is None:
+        return list(coordinators.values())
+    if (aggregator := hass.data.get(DATA_FLEET, {}).get(entry_id)) is not None:
+        return [coordinators[member] for member in aggregator.members if member in coordinators]
+    if entry_id not in coordinators:
+        raise HomeAssistantError(f"Unknown FaLs22 config entry: {entry_id}")
+    return [coordinators[entry_id]]
+
+
+def _profile_from_call(data: dict[str, Any]) -> dict[str, Any]:
+    """Convert profile service data to device settings."""
+    profile = {key: value for key, value in data.items() if key in PROFILE_SETTINGS}
+    if (start := data.get("working_time_from")) is not None:
+        profile["working_hours_from"] = start.hour
+        profile["working_minutes_from"] = start.minute
+    if (end := data.get("working_time_to")) is not None:
+        profile["working_hours_to"] = end.hour
+        profile["working_minutes_to"] = end.minute
+    return profile
+
+
+def _write_json(path: str, data: Any) -> None:
+    """Write data to a JSON file."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+
+
 class FALS22DataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the FALS22 API."""
 
@@ -133,98 +541,442 @@ class FALS22DataUpdateCoordinator(DataUpdateCoordinator):
         self.entry = entry
         self.host = entry.data["host"]
         self.password = entry.data.get("password")
-        self.session = async_get_clientsession(hass)
+        # Shared by all entities of the unit
+        self.device_info = get_device_info(entry)
+        self.client = FALS22Client(
+            async_get_clientsession(hass), _candidate_hosts(entry), self.password
+        )
+        _configure_requests(self.client, entry)
+        self.poll_deadline = entry.options.get(CONF_POLL_DEADLINE, DEFAULT_POLL_DEADLINE)
+        self.write_queue = FALS22WriteQueue(
+            hass,
+            entry.entry_id,
+            60 * entry.options.get(CONF_WRITE_QUEUE_MAX_AGE, DEFAULT_WRITE_QUEUE_MAX_AGE),
+        )
+        # At short scan intervals the configured depth would not cover the
+        # 24 h window
+        self.history = SampleHistory(
+            hass,
+            entry.entry_id,
+            history_depth(
+                entry.options.get(CONF_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH),
+                entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL),
+            ),
+        )
+        self.runtime = VentilationAccounting(hass, entry.entry_id)
+        self.sample_clock = DeviceSampleClock()
+        self.exporter: SampleExporter | None = None
+        # Set while live values are compacted into hourly statistics
+        self.compact_statistics: HourlyStatistics | None = None
+        self.poll_stats = PollStats()
+        self.rediscovery = UnitRediscovery(hass, self)
+        # Set while the profile service records update cycles
+        self.profiler: CycleProfiler | None = None
+        # Listener callbacks, so the profiler can time them one by one
+        self._update_callbacks: list[CALLBACK_TYPE] = []
+        self.sync_polling = entry.options.get(CONF_SYNC_POLLING, DEFAULT_SYNC_POLLING)
+        self.thin_polling = entry.options.get(CONF_THIN_POLLING, DEFAULT_THIN_POLLING)
+        self.heartbeat_interval = entry.options.get(
+            CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+        )
+        # Loop times until which manual mode runs and of the last write
+        self._manual_until = 0.0
+        # Set while the fleet orchestrator confirmed manual mode, the end is
+        # then known without polling at the full rate
+        self.manual_confirmed = False
+        self._device_id: str | None = None
+        self._last_write = -WRITE_ACTIVITY_PERIOD
+        # Settings are read again after writes even if the live sample repeats
+        self._settings_changed = True
 
         # Get scan interval from options or use default
-        scan_interval = entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL)
+        self.scan_interval = entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL)
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=scan_interval),
+            update_interval=timedelta(seconds=self.scan_interval),
+            # Repeated samples return the previous data without notifying entities
+            always_update=False,
         )
 
-    def _get_url(self, endpoint: str) -> str:
-        """Get the full URL for an endpoint."""
-        base_url = f"http://{self.host}"
-        if self.password:
-            return f"{base_url}{endpoint}?pass={self.password}"
-        return f"{base_url}{endpoint}"
-
-    async def _async_fetch_data(self, endpoint: str) -> dict | list:
-        """Fetch data from a specific endpoint."""
-        url = self._get_url(endpoint)
-        try:
-            async with async_timeout.timeout(10):
-                async with self.session.get(url) as response:
-                    if response.status != 200:
-                        raise UpdateFailed(f"Error fetching data: {response.status}")
-                    
-                    data = await response.json()
-                    
-                    # Check for authentication failure
-                    if isinstance(data, dict) and data.get("auth") is False:
-                        raise UpdateFailed("Authentication failed")
-                    
-                    return data
-        except asyncio.TimeoutError as err:
-            raise UpdateFailed("Timeout fetching data") from err
-        except aiohttp.ClientError as err:
-            raise UpdateFailed(f"Error fetching data: {err}") from err
-
     async def _async_update_data(self) -> dict:
         """Update data via library."""
+        started = monotonic()
+        if self.profiler is not None:
+            self.profiler.start_cycle()
+        try:
+            # Retries stop when the deadline of the whole poll is used up
+            data = await self._async_poll(monotonic() + self.poll_deadline)
+        except UpdateFailed:
+            if self.profiler is not None:
+                self.profiler.mark_cycle(CYCLE_FAILED)
+            self.poll_stats.record(monotonic() - started, success=False)
+            self.rediscovery.poll_failed()
+            raise
+        finally:
+            if self.profiler is not None:
+                # The listeners run right after this method returns, the
+                # cycle ends with the next iteration of the event loop
+                self.hass.loop.call_soon(self._end_profile_cycle)
+        self.poll_stats.record(monotonic() - started, success=True)
+        self.rediscovery.poll_succeeded()
+        return data
+
+    async def _async_poll(self, deadline: float) -> dict:
+        """Poll the device and build the coordinator data."""
+        self.write_queue.drop_expired()
         try:
             # Fetch live data
-            live_data = await self._async_fetch_data("/data/live")
-            settings_data = await self._async_fetch_data("/data/settings")
+            live_data = await self.client.get_live(deadline)
+
+            if isinstance(live_data, dict):
+                is_new = self.sample_clock.observe(
+                    device_time(live_data),
+                    live_data,
+                    self.hass.loop.time(),
+                    dt_util.now(),
+                )
+                if (
+                    not is_new
+                    and self.data is not None
+                    and not self.write_queue
+                    and not self._settings_changed
+                ):
+                    _LOGGER.debug("Device %s repeated its previous sample", self.host)
+                    if self.profiler is not None:
+                        self.profiler.mark_cycle(CYCLE_REPEATED)
+                    self._update_poll_interval(live_data, self.data.get("settings"))
+                    # Nothing changed on the device, but the locally tracked
+                    # manual mode may have ended since the last poll
+                    self._fire_events(self.data, None)
+                    return self.data
+
+            # The device is reachable again, deliver writes that failed before
+            # reading the settings so they reflect the replayed values
+            if self.write_queue:
+                await self._async_replay_writes(deadline)
+
+            settings_data = await self.client.get_settings(deadline)
+            self._settings_changed = False
+            normalise_started = perf_counter() if self.profiler is not None else 0.0
             
             _LOGGER.debug("Raw live_data: %s", live_data)
             _LOGGER.debug("Raw settings_data: %s", settings_data)
             
-            # Extract single objects from arrays if needed
-            if isinstance(live_data, list) and live_data:
-                live_data = live_data[0]
-                _LOGGER.debug("Extracted live_data from array: %s", live_data)
-            if isinstance(settings_data, list) and settings_data:
-                settings_data = settings_data[0]
-                _LOGGER.debug("Extracted settings_data from array: %s", settings_data)
-            
+            finished_cycle = None
+            if isinstance(live_data, dict):
+                self._update_poll_interval(live_data, settings_data)
+                sample_time = dt_util.utcnow().timestamp()
+                self.history.add(sample_time, live_data)
+                if self.compact_statistics is not None:
+                    self.compact_statistics.add(sample_time, live_data)
+                finished_cycle = self.runtime.update(sample_time, live_data)
+
             result = {
                 "live": live_data,
                 "settings": settings_data,
             }
+            if isinstance(live_data, dict) and isinstance(settings_data, dict):
+                # The working hours are compared with the device clock
+                now = device_time(live_data) or dt_util.now()
+                result["derived"] = evaluate_ventilation([(live_data, settings_data, now)])[0]
+            result["runtime"] = self.runtime.as_dict()
+            result["clock"] = self.sample_clock.as_dict()
+            if self.exporter is not None:
+                if isinstance(live_data, dict):
+                    self.exporter.add(sample_time, live_data, result.get("derived"))
+                result["export"] = self.exporter.as_dict()
             _LOGGER.debug("Final coordinator data: %s", result)
+            self._fire_events(result, finished_cycle)
+            if self.profiler is not None:
+                self.profiler.record("normalise", perf_counter() - normalise_started)
             return result
         except Exception as err:
             _LOGGER.error("Error communicating with API: %s", err)
+            self.update_interval = timedelta(seconds=self.scan_interval)
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
-    async def async_set_manual_mode(self, duration: int, turn_on: bool) -> bool:
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, keeping the callback for the profiler."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        self._update_callbacks.append(update_callback)
+
+        @callback
+        def remove_callback() -> None:
+            remove_listener()
+            self._update_callbacks.remove(update_callback)
+
+        return remove_callback
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, timing them while profiled."""
+        if self.profiler is None:
+            super().async_update_listeners()
+            return
+        self.profiler.dispatch(list(self._update_callbacks))
+
+    @callback
+    def async_start_profile(self, cycles: int) -> CycleProfiler:
+        """Start recording the timings of the next update cycles."""
+        self.profiler = CycleProfiler(cycles)
+        self.client.profiler = self.profiler
+        return self.profiler
+
+    @callback
+    def async_stop_profile(self) -> None:
+        """Stop recording timings."""
+        self.profiler = None
+        self.client.profiler = None
+
+    @callback
+    def _end_profile_cycle(self) -> None:
+        """End the profiled cycle once its listeners ran."""
+        if self.profiler is not None:
+            self.profiler.end_cycle()
+
+    async def async_set_host(self, host: str) -> None:
+        """Move the config entry to a new address of the unit and poll it."""
+        entry = self.entry
+        old_host = entry.data[CONF_HOST]
+        self.hass.config_entries.async_update_entry(
+            entry,
+            data={**entry.data, CONF_HOST: host},
+            # Entries created by the config flow use the host as unique id
+            unique_id=host if entry.unique_id == old_host else entry.unique_id,
+            title=entry.title.replace(old_host, host),
+        )
+        self.host = host
+        self.client.address.set_hosts(_candidate_hosts(entry))
+        # The entities share this dict, updating it in place keeps the
+        # device info they report in line with the registry
+        self.device_info.update(get_device_info(entry))
+        device_registry = dr.async_get(self.hass)
+        if device := device_registry.async_get_device(identifiers={(DOMAIN, entry.entry_id)}):
+            device_registry.async_update_device(
+                device.id,
+                configuration_url=self.device_info["configuration_url"],
+                name=self.device_info["name"],
+            )
+        await self.async_request_refresh()
+
+    async def async_configure_exporter(self) -> None:
+        """Start, reconfigure or stop the sample export from the options."""
+        options = self.entry.options
+        if not options.get(CONF_EXPORT_SAMPLES, DEFAULT_EXPORT_SAMPLES):
+            if self.exporter is not None:
+                await self.exporter.async_stop()
+                self.exporter = None
+            return
+
+        max_file_size = 1024 * 1024 * options.get(
+            CONF_EXPORT_MAX_FILE_SIZE, DEFAULT_EXPORT_MAX_FILE_SIZE
+        )
+        rotate_interval = 3600 * options.get(
+            CONF_EXPORT_ROTATE_INTERVAL, DEFAULT_EXPORT_ROTATE_INTERVAL
+        )
+        if self.exporter is None:
+            self.exporter = SampleExporter(
+                self.hass, self.entry.entry_id, self.host, max_file_size, rotate_interval
+            )
+            self.exporter.start()
+        else:
+            self.exporter.max_file_size = max_file_size
+            self.exporter.rotate_interval = rotate_interval
+
+    def configure_compact_statistics(self) -> None:
+        """Start or stop compacting live values into hourly statistics."""
+        if not self.entry.options.get(CONF_COMPACT_STATISTICS, DEFAULT_COMPACT_STATISTICS):
+            if self.compact_statistics is not None:
+                self.compact_statistics.async_import()
+                self.compact_statistics = None
+            return
+        if self.compact_statistics is None:
+            self.compact_statistics = HourlyStatistics(self.hass, self.entry)
+            # The samples of the running hour survive a restart in the history
+            self.compact_statistics.seed(self.history.samples())
+
+    def _update_poll_interval(self, live: dict[str, Any], settings: Any) -> None:
+        """Set the delay until the next poll."""
+        now = self.hass.loop.time()
+        delay = float(self.scan_interval)
+        if self.sync_polling:
+            # Poll again right after the next expected device update
+            delay = self.sample_clock.next_poll_delay(now, self.scan_interval)
+
+        if (
+            self.thin_polling
+            and isinstance(settings, dict)
+            and live.get("on") != 1
+            and not self.write_queue
+            and now >= self._manual_until
+            and now - self._last_write >= WRITE_ACTIVITY_PERIOD
+        ):
+            # The device does not ventilate on its own outside the working hours
+            device_now = dt_util.now().replace(tzinfo=None) + timedelta(
+                seconds=self.sample_clock.clock_offset or 0
+            )
+            if until_start := seconds_until_working_window(settings, device_now):
+                delay = max(delay, min(self.heartbeat_interval, until_start))
+
+        if self.manual_confirmed and now < self._manual_until:
+            delay = max(delay, min(self.heartbeat_interval, self._manual_until - now))
+
+        self.update_interval = timedelta(seconds=delay)
+
+    @property
+    def manual_remaining(self) -> float:
+        """Return the seconds until manual mode ends, tracked locally."""
+        return max(0.0, self._manual_until - self.hass.loop.time())
+
+    def _fire_events(
+        self, result: dict[str, Any], finished_cycle: dict[str, float] | None
+    ) -> None:
+        """Fire the device trigger events for what changed since the last poll."""
+        events: list[dict[str, Any]] = []
+        if self._manual_until and self.hass.loop.time() >= self._manual_until:
+            self._manual_until = 0.0
+            events.append({"type": "manual_mode_ended"})
+
+        if self.data is not None:
+            old_live = self.data.get("live") or {}
+            old_settings = self.data.get("settings") or {}
+            live = result["live"] if isinstance(result["live"], dict) else {}
+            settings = result["settings"] if isinstance(result["settings"], dict) else {}
+            if old_live.get("on") != 1 and live.get("on") == 1:
+                events.append({"type": "ventilation_started"})
+            elif old_live.get("on") == 1 and live.get("on") == 0:
+                event: dict[str, Any] = {"type": "ventilation_stopped"}
+                if finished_cycle is not None:
+                    event["duration"] = finished_cycle["duration"]
+                    event["moisture_removed"] = finished_cycle["moisture_removed"]
+                events.append(event)
+            if "code" in settings and old_settings.get("code") != settings["code"]:
+                events.append({"type": "keylock_changed", "keylock": settings["code"] == 1})
+            if "message" in live and old_live.get("message") != live["message"]:
+                events.append({"type": "message_changed", "message": live["message"]})
+
+        if not events:
+            return
+        if self._device_id is None:
+            device = dr.async_get(self.hass).async_get_device(
+                identifiers={(DOMAIN, self.entry.entry_id)}
+            )
+            if device is None:
+                return
+            self._device_id = device.id
+        for event in events:
+            self.hass.bus.async_fire(EVENT_FALS22, {"device_id": self._device_id, **event})
+
+    def _note_write(self) -> None:
+        """Read the settings again and keep the full poll rate after a write."""
+        self._settings_changed = True
+        self._last_write = self.hass.loop.time()
+
+    async def _async_replay_writes(self, deadline: float) -> None:
+        """Send the queued writes as one settings and one manual mode request."""
+        try:
+            if settings := self.write_queue.pending_settings():
+                self._note_write()
+                if await self.client.post_settings(settings, deadline):
+                    _LOGGER.info("Replayed pending settings for %s: %s", self.host, settings)
+                else:
+                    _LOGGER.error("Device %s rejected pending settings %s", self.host, settings)
+                self.write_queue.clear_settings(settings)
+
+            if (manual := self.write_queue.pending_manual()) is not None:
+                duration, turn_on = manual
+                self._note_write()
+                if await self.client.post_manual(duration, turn_on, deadline):
+                    self._track_manual_mode(duration, turn_on)
+                else:
+                    _LOGGER.error("Device %s rejected pending manual mode request", self.host)
+                self.write_queue.clear_manual()
+        except CannotConnect as err:
+            _LOGGER.warning("Error replaying pending writes, keeping them queued: %s", err)
+
+    async def async_set_manual_mode(
+        self, duration: int, turn_on: bool, queue_on_failure: bool = True
+    ) -> bool:
         """Set manual ventilation mode."""
-        url = self._get_url("/postmanually")
-        data = {
-            "duration": duration,
-            "on": 1 if turn_on else 0,
-        }
-        
         try:
-            async with async_timeout.timeout(10):
-                async with self.session.post(url, data=data) as response:
-                    return response.status == 200
-        except (asyncio.TimeoutError, aiohttp.ClientError) as err:
+            success = await self.client.post_manual(duration, turn_on)
+        except CannotConnect as err:
             _LOGGER.error("Error setting manual mode: %s", err)
+            if not queue_on_failure:
+                return False
+            self.write_queue.queue_manual(duration, turn_on)
+            _LOGGER.warning("Queued manual mode request until %s is reachable", self.host)
             return False
+        if success:
+            self._note_write()
+            # A queued request is older and would undo this one when replayed
+            self.write_queue.clear_manual()
+            self._track_manual_mode(duration, turn_on)
+        return success
+
+    def _track_manual_mode(self, duration: int, turn_on: bool) -> None:
+        """Track manual mode the device accepted, the duration is in minutes."""
+        # Poll at the full rate while manual mode runs
+        if turn_on:
+            self._manual_until = self.hass.loop.time() + 60 * duration
+        elif self._manual_until:
+            # Ends it now, the next poll reports the end
+            self._manual_until = self.hass.loop.time()
+
+    async def async_apply_settings(
+        self, target: dict[str, Any]
+    ) -> tuple[str, dict[str, Any]]:
+        """Write the settings that differ from the device and verify them.
+
+        Returns the outcome of the write and the fields that did not read
+        back as expected. Queued and rejected writes are not verified.
+        """
+        current = self.data.get("settings", {})
+        changes = {
+            key: value
+            for key, value in target.items()
+            if not settings_equal(current.get(key), value)
+        }
+        if not changes:
+            _LOGGER.debug("Settings of %s already match", self.host)
+            return WRITE_ACCEPTED, {}
+
+        if (status := await self.async_write_settings(changes)) != WRITE_ACCEPTED:
+            return status, {}
+
+        await self.async_refresh()
+        settings = self.data.get("settings", {}) if self.last_update_success else {}
+        return WRITE_ACCEPTED, {
+            key: {"expected": value, "actual": settings.get(key)}
+            for key, value in changes.items()
+            if not settings_equal(settings.get(key), value)
+        }
 
     async def async_update_settings(self, settings: dict) -> bool:
         """Update device settings."""
-        url = self._get_url("/postsettings")
-        
+        return await self.async_write_settings(settings) == WRITE_ACCEPTED
+
+    async def async_write_settings(self, settings: dict) -> str:
+        """Update device settings, queueing them while the device is unreachable.
+
+        Returns WRITE_ACCEPTED, WRITE_QUEUED or WRITE_REJECTED.
+        """
+        self._note_write()
         try:
-            async with async_timeout.timeout(10):
-                async with self.session.post(url, data=settings) as response:
-                    return response.status == 200
-        except (asyncio.TimeoutError, aiohttp.ClientError) as err:
+            success = await self.client.post_settings(settings)
+        except CannotConnect as err:
             _LOGGER.error("Error updating settings: %s", err)
-            return False
+            self.write_queue.queue_settings(settings)
+            _LOGGER.warning("Queued settings %s until %s is reachable", settings, self.host)
+            return WRITE_QUEUED
+        if not success:
+            return WRITE_REJECTED
+        # Queued values for the same fields are older and would undo the write
+        self.write_queue.drop_settings(settings)
+        return WRITE_ACCEPTED
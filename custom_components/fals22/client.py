@@ -0,0 +1,434 @@
+"""Async client for the HTTP API of FaLs22 dewpoint ventilation units.
+
+This module has no Home Assistant dependencies and only needs aiohttp, so
+it can be used by scripts like fleet_poller.py as well.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import ipaddress
+import json
+import logging
+import socket
+import time
+from typing import Any, Protocol, TypedDict
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+ENDPOINT_LIVE = "/data/live"
+ENDPOINT_SETTINGS = "/data/settings"
+ENDPOINT_POST_SETTINGS = "/postsettings"
+ENDPOINT_POST_MANUAL = "/postmanually"
+ENDPOINTS = (ENDPOINT_LIVE, ENDPOINT_SETTINGS, ENDPOINT_POST_SETTINGS, ENDPOINT_POST_MANUAL)
+
+# Live data fields every FaLs22 unit reports
+REQUIRED_LIVE_FIELDS = ["temp_in", "temp_out", "hum_in", "hum_out"]
+
+DEFAULT_TIMEOUT = 10  # seconds
+# First pause between retries, doubled for every further retry
+RETRY_BACKOFF = 0.25  # seconds
+# No retry is started with less time than this left in the deadline
+MIN_ATTEMPT_TIME = 1  # seconds
+# Latencies kept for the p95, and how many are needed before hedging
+LATENCY_SAMPLES = 100
+MIN_LATENCY_SAMPLES = 20
+# Hedged requests earned per request, and the most that can be saved up
+HEDGE_RATIO = 0.1
+HEDGE_BURST = 5
+# Time allowed for the candidate addresses to answer a race
+RACE_TIMEOUT = 5  # seconds
+# Resolved addresses are used this long before the hostname is resolved again
+DNS_TTL = 300  # seconds
+
+
+class LiveData(TypedDict, total=False):
+    """Live values reported by /data/live."""
+
+    temp_in: float
+    temp_out: float
+    hum_in: float
+    hum_out: float
+    abs_hum_in: float
+    abs_hum_out: float
+    operating_hours: int
+    message: str
+    on: int
+    year: int
+    month: int
+    day: int
+    hours: int
+    minutes: int
+
+
+# Settings reported by /data/settings and accepted by /postsettings, the
+# functional form allows the "break" key
+Settings = TypedDict(
+    "Settings",
+    {
+        "min_temp": float,
+        "max_temp": float,
+        "ventilation": int,
+        "break": int,
+        "min_hum": float,
+        "difference": float,
+        "working_hours_from": int,
+        "working_minutes_from": int,
+        "working_hours_to": int,
+        "working_minutes_to": int,
+    },
+    total=False,
+)
+
+
+def is_fals22_live_data(data: Any) -> bool:
+    """Return True if live data has the fields every FaLs22 unit reports."""
+    return isinstance(data, dict) and all(field in data for field in REQUIRED_LIVE_FIELDS)
+
+
+class PhaseRecorder(Protocol):
+    """Receiver of request timings, see profiler.CycleProfiler."""
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Record the duration of a phase."""
+
+
+class FALS22Error(Exception):
+    """Base error of the FaLs22 client."""
+
+
+class CannotConnect(FALS22Error):
+    """The unit could not be reached or answered with an HTTP error."""
+
+
+class InvalidAuth(FALS22Error):
+    """The unit rejected the password."""
+
+
+class InvalidData(FALS22Error):
+    """The unit answered with data that is not FaLs22 data."""
+
+
+class FALS22Client:
+    """Client for one FaLs22 unit.
+
+    The aiohttp session is passed in so connections are reused across
+    requests and shared with other clients. Every request takes an optional
+    deadline, a time.monotonic() value that the request, its retries and
+    the address race before it must not run past. It is passed per call
+    because polls and writes of one unit share the client.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        hosts: str | list[str],
+        password: str | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = 0,
+        hedging: bool = False,
+    ) -> None:
+        """Initialize the client.
+
+        Reads are retried up to max_retries times after connection errors.
+        With hedging a second read is sent when the first one takes longer
+        than the p95 latency of the unit, for at most HEDGE_RATIO of the
+        requests.
+        """
+        self.session = session
+        self.address = DeviceAddress([hosts] if isinstance(hosts, str) else hosts, password)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.hedging = hedging
+        self.latency = LatencyTracker()
+        self.retries = 0
+        self.hedges = 0
+        self._hedge_tokens = 0.0
+        # Set while the coordinator is profiled
+        self.profiler: PhaseRecorder | None = None
+
+    @property
+    def host(self) -> str:
+        """Return the address in use, or the first candidate."""
+        return self.address.host or self.address.hosts[0]
+
+    async def get_live(self, deadline: float | None = None) -> LiveData:
+        """Return the live values."""
+        return await self._async_get(ENDPOINT_LIVE, deadline)  # type: ignore[return-value]
+
+    async def get_settings(self, deadline: float | None = None) -> Settings:
+        """Return the settings."""
+        return await self._async_get(ENDPOINT_SETTINGS, deadline)  # type: ignore[return-value]
+
+    async def post_settings(
+        self, settings: dict[str, Any], deadline: float | None = None
+    ) -> bool:
+        """Write settings, returning False if the unit rejected them."""
+        return await self._async_post(ENDPOINT_POST_SETTINGS, settings, deadline)
+
+    async def post_manual(
+        self, duration: int, turn_on: bool, deadline: float | None = None
+    ) -> bool:
+        """Switch manual ventilation for a duration in minutes."""
+        return await self._async_post(
+            ENDPOINT_POST_MANUAL, {"duration": duration, "on": 1 if turn_on else 0}, deadline
+        )
+
+    def _attempt_end(self, deadline: float | None) -> float:
+        """Return the time the next attempt must end, cut short by the deadline."""
+        end = time.monotonic() + self.timeout
+        if deadline is None:
+            return end
+        if deadline <= time.monotonic():
+            raise CannotConnect("Deadline exceeded")
+        return min(end, deadline)
+
+    async def _async_get(self, endpoint: str, deadline: float | None) -> dict[str, Any]:
+        """Fetch an endpoint, retrying connection errors within the deadline."""
+        attempt = 0
+        while True:
+            try:
+                return await self._async_get_hedged(endpoint, deadline)
+            except CannotConnect as err:
+                backoff = RETRY_BACKOFF * 2**attempt
+                if attempt >= self.max_retries or (
+                    deadline is not None
+                    and deadline - time.monotonic() < backoff + MIN_ATTEMPT_TIME
+                ):
+                    raise
+                _LOGGER.debug("Retrying %s of %s: %s", endpoint, self.host, err)
+                attempt += 1
+                self.retries += 1
+                await asyncio.sleep(backoff)
+
+    async def _async_get_hedged(self, endpoint: str, deadline: float | None) -> dict[str, Any]:
+        """Fetch an endpoint, sending a second request if the first one is slow."""
+        end = self._attempt_end(deadline)
+        self._hedge_tokens = min(HEDGE_BURST, self._hedge_tokens + HEDGE_RATIO)
+        delay = self.latency.p95() if self.hedging else None
+        if delay is None or delay >= end - time.monotonic():
+            return await self._async_get_once(endpoint, end)
+
+        requests = [asyncio.ensure_future(self._async_get_once(endpoint, end))]
+        try:
+            done, _ = await asyncio.wait(requests, timeout=delay)
+            if not done and self._hedge_tokens >= 1:
+                self._hedge_tokens -= 1
+                self.hedges += 1
+                _LOGGER.debug("Hedging %s of %s after %.2f s", endpoint, self.host, delay)
+                requests.append(asyncio.ensure_future(self._async_get_once(endpoint, end)))
+            errors: list[CannotConnect] = []
+            for next_done in asyncio.as_completed(requests):
+                try:
+                    return await next_done
+                except CannotConnect as err:
+                    # The other request may still succeed
+                    errors.append(err)
+            raise errors[-1]
+        finally:
+            for request in requests:
+                request.cancel()
+
+    async def _async_get_once(self, endpoint: str, end: float) -> dict[str, Any]:
+        """Fetch an endpoint once, address race included, before end."""
+        await self.address.async_ensure(self.session, end - time.monotonic())
+        started = time.monotonic()
+        if started >= end:
+            raise CannotConnect("Timeout fetching data")
+        try:
+            async with self.session.get(
+                self.address.url(endpoint), timeout=aiohttp.ClientTimeout(total=end - started)
+            ) as response:
+                if response.status != 200:
+                    raise CannotConnect(f"Error fetching data: {response.status}")
+                body = await response.read()
+        except asyncio.TimeoutError as err:
+            # Race the addresses again on the next request
+            self.address.invalidate()
+            raise CannotConnect("Timeout fetching data") from err
+        except aiohttp.ClientError as err:
+            self.address.invalidate()
+            raise CannotConnect(f"Error fetching data: {err}") from err
+        received = time.monotonic()
+        self.latency.add(received - started)
+        try:
+            data = json.loads(body)
+        except ValueError as err:
+            raise InvalidData("Invalid response format") from err
+        if self.profiler is not None:
+            self.profiler.record("request", received - started)
+            self.profiler.record("decode", time.monotonic() - received)
+
+        if isinstance(data, dict) and data.get("auth") is False:
+            raise InvalidAuth("Authentication failed")
+        # The unit wraps single objects in an array
+        if isinstance(data, list) and data:
+            data = data[0]
+        if not isinstance(data, dict):
+            raise InvalidData("Invalid response format")
+        return data
+
+    async def _async_post(
+        self, endpoint: str, data: dict[str, Any], deadline: float | None
+    ) -> bool:
+        """Post form data to an endpoint."""
+        # Writes are not repeated, a failed write is queued by the caller
+        end = self._attempt_end(deadline)
+        await self.address.async_ensure(self.session, end - time.monotonic())
+        if (remaining := end - time.monotonic()) <= 0:
+            raise CannotConnect("Timeout sending data")
+        timeout = aiohttp.ClientTimeout(total=remaining)
+        try:
+            async with self.session.post(
+                self.address.url(endpoint), data=data, timeout=timeout
+            ) as response:
+                return response.status == 200
+        except asyncio.TimeoutError as err:
+            self.address.invalidate()
+            raise CannotConnect("Timeout sending data") from err
+        except aiohttp.ClientError as err:
+            self.address.invalidate()
+            raise CannotConnect(f"Error sending data: {err}") from err
+
+
+class LatencyTracker:
+    """The p95 of the latest request latencies of a unit."""
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self._samples: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._p95: float | None = None
+
+    def add(self, latency: float) -> None:
+        """Add the latency of a successful request."""
+        self._samples.append(latency)
+        self._p95 = None
+
+    def p95(self) -> float | None:
+        """Return the p95 latency, None until enough requests were seen."""
+        if len(self._samples) < MIN_LATENCY_SAMPLES:
+            return None
+        if self._p95 is None:
+            ordered = sorted(self._samples)
+            self._p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        return self._p95
+
+
+class DeviceAddress:
+    """Pick the fastest of several addresses of one device.
+
+    The candidates may be hostnames or IP addresses. They are raced against
+    each other and the winner is kept until invalidate() is called after a
+    failure. Hostnames are resolved once per DNS_TTL and the URLs of all
+    endpoints are built with the resolved address, so a poll does not need
+    a lookup or any string formatting.
+    """
+
+    def __init__(self, hosts: list[str], password: str | None = None) -> None:
+        """Initialize the address."""
+        self.hosts = hosts
+        self.password = password
+        self.host: str | None = None
+        self.urls: dict[str, str] = {}
+        self._expires = 0.0
+
+    def set_hosts(self, hosts: list[str]) -> None:
+        """Replace the candidates, racing them again if the winner is gone."""
+        self.hosts = hosts
+        if self.host not in hosts:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Forget the winner so the next request races the candidates again."""
+        self.host = None
+        self.urls = {}
+        self._expires = 0.0
+
+    async def async_ensure(
+        self, session: aiohttp.ClientSession, timeout: float = RACE_TIMEOUT
+    ) -> None:
+        """Make sure the URLs point at a reachable, freshly resolved address.
+
+        A race of the candidates takes at most timeout, and never more than
+        RACE_TIMEOUT.
+        """
+        if self.urls and time.monotonic() < self._expires:
+            return
+        if self.host is None:
+            self.host = await self._async_race(session, timeout)
+        address = await async_resolve(self.host)
+        self._build_urls(address)
+        self._expires = time.monotonic() + DNS_TTL
+
+    def url(self, endpoint: str) -> str:
+        """Return the URL of an endpoint, falling back to the first candidate."""
+        if (url := self.urls.get(endpoint)) is not None:
+            return url
+        return self._format_url(self.host or self.hosts[0], endpoint)
+
+    def _build_urls(self, address: str) -> None:
+        """Build the URLs of all endpoints for the resolved address."""
+        self.urls = {endpoint: self._format_url(address, endpoint) for endpoint in ENDPOINTS}
+
+    def _format_url(self, address: str, endpoint: str) -> str:
+        """Return the URL of an endpoint on an address."""
+        if address.count(":") > 1 and not address.startswith("["):
+            # IPv6 literal
+            address = f"[{address}]"
+        if self.password:
+            return f"http://{address}{endpoint}?pass={self.password}"
+        return f"http://{address}{endpoint}"
+
+    async def _async_race(self, session: aiohttp.ClientSession, timeout: float) -> str:
+        """Return the candidate whose live data answers first."""
+        if len(self.hosts) == 1 or timeout <= 0:
+            return self.hosts[0]
+
+        async def probe(host: str) -> str:
+            async with session.get(self._format_url(host, ENDPOINT_LIVE)) as response:
+                response.raise_for_status()
+                return host
+
+        tasks = [asyncio.ensure_future(probe(host)) for host in self.hosts]
+        try:
+            for next_done in asyncio.as_completed(tasks, timeout=min(timeout, RACE_TIMEOUT)):
+                try:
+                    host = await next_done
+                except (aiohttp.ClientError, OSError) as err:
+                    _LOGGER.debug("Address candidate failed: %s", err)
+                    continue
+                _LOGGER.debug("Using address %s of %s", host, self.hosts)
+                return host
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+        # Nothing answered, the request itself will report the error
+        return self.hosts[0]
+
+
+async def async_resolve(host: str) -> str:
+    """Return an IP address for host, which may already be one or carry a port."""
+    name, port = host, ""
+    if host.count(":") == 1:
+        name, port = host.split(":")
+    try:
+        ipaddress.ip_address(name.strip("[]"))
+    except ValueError:
+        pass
+    else:
+        return host
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            name, int(port or 80), type=socket.SOCK_STREAM
+        )
+    except (OSError, ValueError) as err:
+        _LOGGER.debug("Cannot resolve %s: %s", host, err)
+        return host
+    address = infos[0][4][0]
+    if ":" in address:
+        address = f"[{address}]"
+    return f"{address}:{port}" if port else address
@@ -0,0 +1,132 @@
+"""Hourly long-term statistics of FALS22 live values."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+import math
+from typing import Any
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, HISTORY_FIELDS, SENSOR_TYPES
+
+_LOGGER = logging.getLogger(__name__)
+
+# Finished hours kept while the recorder is not running
+MAX_PENDING_HOURS = 168
+
+_UNITS = {
+    description.key: description.native_unit_of_measurement
+    for description in SENSOR_TYPES
+    if description.key in HISTORY_FIELDS
+}
+
+
+class _Hour:
+    """Count, sum, minimum and maximum of one field in one hour."""
+
+    __slots__ = ("count", "total", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        """Initialize an empty hour."""
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+
+def statistic_id(entry_id: str, field: str) -> str:
+    """Return the id of the external statistic of a field."""
+    return f"{DOMAIN}:{entry_id.lower()}_{field}"
+
+
+class HourlyStatistics:
+    """Aggregate live samples into hourly mean, minimum and maximum.
+
+    Only the running hour is kept per field. When a sample of a later hour
+    arrives the finished hour is imported as external statistics, one
+    batch per field. Hours that could not be imported because the recorder
+    is not running are kept and imported with the next batch.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the statistics."""
+        self.hass = hass
+        self.entry = entry
+        self.hour_start: float | None = None
+        self._hours = {field: _Hour() for field in HISTORY_FIELDS}
+        self._pending: dict[str, list[StatisticData]] = {field: [] for field in HISTORY_FIELDS}
+
+    def seed(self, samples: list[tuple[float, dict[str, float]]]) -> None:
+        """Restore the running hour from the sample history after a restart."""
+        if not samples:
+            return
+        hour_start = samples[-1][0] // 3600 * 3600
+        for timestamp, sample in samples:
+            if timestamp >= hour_start:
+                self.add(timestamp, sample)
+
+    def add(self, timestamp: float, live: dict[str, Any]) -> None:
+        """Add a live sample, importing the previous hour once it is over."""
+        hour_start = timestamp // 3600 * 3600
+        if self.hour_start is None:
+            self.hour_start = hour_start
+        elif hour_start > self.hour_start:
+            self._finish_hour()
+            self.hour_start = hour_start
+            self.async_import()
+        elif hour_start < self.hour_start:
+            # The clock of the host went back, the sample would reopen an imported hour
+            return
+
+        for field, hour in self._hours.items():
+            value = live.get(field)
+            if isinstance(value, (int, float)) and not math.isnan(value):
+                hour.add(float(value))
+
+    def _finish_hour(self) -> None:
+        """Move the aggregates of the running hour to the pending imports."""
+        start = datetime.fromtimestamp(self.hour_start or 0, timezone.utc)
+        for field, hour in self._hours.items():
+            if hour.count:
+                pending = self._pending[field]
+                pending.append(
+                    StatisticData(
+                        start=start,
+                        mean=hour.total / hour.count,
+                        min=hour.minimum,
+                        max=hour.maximum,
+                    )
+                )
+                del pending[:-MAX_PENDING_HOURS]
+            self._hours[field] = _Hour()
+
+    @callback
+    def async_import(self) -> None:
+        """Import the finished hours as external statistics."""
+        if "recorder" not in self.hass.config.components:
+            _LOGGER.debug("Recorder not running, keeping hourly statistics of %s", self.entry.title)
+            return
+        for field, pending in self._pending.items():
+            if not pending:
+                continue
+            metadata = StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{self.entry.title} {field}",
+                source=DOMAIN,
+                statistic_id=statistic_id(self.entry.entry_id, field),
+                unit_of_measurement=_UNITS.get(field),
+            )
+            async_add_external_statistics(self.hass, metadata, list(pending))
+            pending.clear()
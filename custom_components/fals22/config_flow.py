@@ -1,12 +1,9 @@
 """Config flow for FALS22 Dewpoint Ventilation integration."""
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import Any
 
-import aiohttp
-import async_timeout
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -14,9 +11,60 @@ from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_NAME
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, selector
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL, DEFAULT_NAME
+from .const import (
+    CONF_ADDITIONAL_HOSTS,
+    CONF_COMPACT_STATISTICS,
+    CONF_AREA,
+    CONF_ENTRY_TYPE,
+    CONF_EXPORT_MAX_FILE_SIZE,
+    CONF_EXPORT_ROTATE_INTERVAL,
+    CONF_EXPORT_SAMPLES,
+    CONF_GROUP_BY,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_HEDGE_REQUESTS,
+    CONF_HISTORY_DEPTH,
+    CONF_LABEL,
+    CONF_MAC_ADDRESS,
+    CONF_MAX_RETRIES,
+    CONF_POLL_DEADLINE,
+    CONF_REDISCOVERY,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SYNC_POLLING,
+    CONF_THIN_POLLING,
+    CONF_WRITE_QUEUE_MAX_AGE,
+    DOMAIN,
+    DEFAULT_EXPORT_MAX_FILE_SIZE,
+    DEFAULT_EXPORT_ROTATE_INTERVAL,
+    DEFAULT_COMPACT_STATISTICS,
+    DEFAULT_EXPORT_SAMPLES,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_HEDGE_REQUESTS,
+    DEFAULT_HISTORY_DEPTH,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POLL_DEADLINE,
+    DEFAULT_REDISCOVERY,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_NAME,
+    DEFAULT_SYNC_POLLING,
+    DEFAULT_THIN_POLLING,
+    DEFAULT_WRITE_QUEUE_MAX_AGE,
+    ENTRY_TYPE_FLEET,
+    GROUP_BY_ALL,
+    GROUP_BY_AREA,
+    GROUP_BY_LABEL,
+)
+from .client import (
+    CannotConnect as ClientCannotConnect,
+    FALS22Client,
+    InvalidAuth as ClientInvalidAuth,
+    InvalidData as ClientInvalidData,
+    is_fals22_live_data,
+)
+from .discovery import async_resolve_addresses, async_scan, parse_host_range
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,52 +76,53 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+CONF_HOST_RANGE = "host_range"
+CONF_HOSTS = "hosts"
+
+STEP_SCAN_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_HOST_RANGE): str,
+        vol.Optional(CONF_PASSWORD, default=""): str,
+    }
+)
+
+STEP_FLEET_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME, default=f"{DEFAULT_NAME} Fleet"): str,
+        vol.Required(CONF_GROUP_BY, default=GROUP_BY_ALL): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=[GROUP_BY_ALL, GROUP_BY_AREA, GROUP_BY_LABEL],
+                translation_key=CONF_GROUP_BY,
+            )
+        ),
+        vol.Optional(CONF_AREA): selector.AreaSelector(),
+        vol.Optional(CONF_LABEL): selector.LabelSelector(),
+    }
+)
+
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect.
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
-    session = async_get_clientsession(hass)
     host = data[CONF_HOST]
     password = data.get(CONF_PASSWORD, "")
     name = data.get(CONF_NAME, DEFAULT_NAME)
-    
-    # Build the test URL
-    base_url = f"http://{host}/data/live"
-    if password:
-        test_url = f"{base_url}?pass={password}"
-    else:
-        test_url = base_url
-    
+
+    client = FALS22Client(async_get_clientsession(hass), host, password)
     try:
-        async with async_timeout.timeout(10):
-            async with session.get(test_url) as response:
-                if response.status != 200:
-                    raise CannotConnect(f"HTTP {response.status}")
-                
-                data_response = await response.json()
-                
-                # Check for authentication failure
-                if isinstance(data_response, dict) and data_response.get("auth") is False:
-                    raise InvalidAuth("Authentication failed")
-                
-                # Validate response structure
-                if isinstance(data_response, list) and data_response:
-                    data_response = data_response[0]
-                
-                if not isinstance(data_response, dict):
-                    raise InvalidData("Invalid response format")
-                
-                # Check for expected fields
-                required_fields = ["temp_in", "temp_out", "hum_in", "hum_out"]
-                if not all(field in data_response for field in required_fields):
-                    raise InvalidData("Missing required data fields")
-                    
-    except asyncio.TimeoutError as err:
-        raise CannotConnect("Connection timeout") from err
-    except aiohttp.ClientError as err:
-        raise CannotConnect(f"Connection error: {err}") from err
+        live = await client.get_live()
+    except ClientCannotConnect as err:
+        raise CannotConnect(str(err)) from err
+    except ClientInvalidAuth as err:
+        raise InvalidAuth(str(err)) from err
+    except ClientInvalidData as err:
+        raise InvalidData(str(err)) from err
+
+    # Check for expected fields
+    if not is_fals22_live_data(live):
+        raise InvalidData("Missing required data fields")
 
     # Return info that you want to store in the config entry.
     return {
@@ -89,16 +138,33 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovered: dict[str, dict[str, Any]] = {}
+        self._scan_password = ""
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> OptionsFlowHandler:
         """Get the options flow for this handler."""
         return OptionsFlowHandler(config_entry)
 
+    @classmethod
+    @callback
+    def async_supports_options_flow(cls, config_entry: config_entries.ConfigEntry) -> bool:
+        """Return True for unit entries, fleet entries have no options."""
+        return config_entry.data.get(CONF_ENTRY_TYPE) != ENTRY_TYPE_FLEET
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the initial step."""
+        """Let the user enter a unit or scan the network."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "scan", "fleet"])
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle a unit entered by hand."""
         errors: dict[str, str] = {}
         
         if user_input is not None:
@@ -121,9 +187,132 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return self.async_create_entry(title=info["title"], data=user_input)
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="manual", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+        )
+
+    async def async_step_fleet(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Add aggregate sensors over all units, or those of an area or label."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            group_by = user_input[CONF_GROUP_BY]
+            data = {
+                CONF_ENTRY_TYPE: ENTRY_TYPE_FLEET,
+                CONF_NAME: user_input[CONF_NAME],
+                CONF_GROUP_BY: group_by,
+            }
+            if group_by == GROUP_BY_AREA and not user_input.get(CONF_AREA):
+                errors[CONF_AREA] = "area_required"
+            elif group_by == GROUP_BY_LABEL and not user_input.get(CONF_LABEL):
+                errors[CONF_LABEL] = "label_required"
+            else:
+                group = GROUP_BY_ALL
+                if group_by == GROUP_BY_AREA:
+                    group = data[CONF_AREA] = user_input[CONF_AREA]
+                elif group_by == GROUP_BY_LABEL:
+                    group = data[CONF_LABEL] = user_input[CONF_LABEL]
+                await self.async_set_unique_id(f"{ENTRY_TYPE_FLEET}_{group_by}_{group}")
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(title=user_input[CONF_NAME], data=data)
+
+        return self.async_show_form(
+            step_id="fleet", data_schema=STEP_FLEET_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Scan a subnet or address range for units."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                hosts = parse_host_range(user_input[CONF_HOST_RANGE])
+            except ValueError:
+                errors[CONF_HOST_RANGE] = "invalid_host_range"
+            else:
+                configured = await async_resolve_addresses(
+                    host.strip()
+                    for entry in self._async_current_entries()
+                    for host in (
+                        entry.data.get(CONF_HOST, ""),
+                        *entry.options.get(CONF_ADDITIONAL_HOSTS, "").split(","),
+                    )
+                    if host.strip()
+                )
+                self._scan_password = user_input.get(CONF_PASSWORD, "")
+                self._discovered = await async_scan(
+                    async_get_clientsession(self.hass),
+                    [host for host in hosts if host not in configured],
+                    self._scan_password,
+                )
+                if self._discovered:
+                    return await self.async_step_select()
+                errors["base"] = "no_devices_found"
+
+        return self.async_show_form(
+            step_id="scan", data_schema=STEP_SCAN_DATA_SCHEMA, errors=errors
+        )
+
+    async def async_step_select(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Let the user pick the discovered units to add."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            selected = user_input[CONF_HOSTS]
+            if not selected:
+                errors["base"] = "no_selection"
+            else:
+                entries = [self._entry_data(host, len(selected) > 1) for host in selected]
+                # Every further unit gets its own entry from an import flow
+                for data in entries[1:]:
+                    self.hass.async_create_task(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN,
+                            context={"source": config_entries.SOURCE_IMPORT},
+                            data=data,
+                        )
+                    )
+                await self.async_set_unique_id(entries[0][CONF_HOST])
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title=_entry_title(entries[0]), data=entries[0]
+                )
+
+        hosts = {
+            host: f"{host} ({live.get('temp_in')} °C, {live.get('hum_in')} %)"
+            for host, live in self._discovered.items()
+        }
+        return self.async_show_form(
+            step_id="select",
+            data_schema=vol.Schema(
+                {vol.Required(CONF_HOSTS, default=list(hosts)): cv.multi_select(hosts)}
+            ),
+            errors=errors,
+            description_placeholders={"count": str(len(hosts))},
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create an entry for a unit selected in a scan."""
+        await self.async_set_unique_id(import_data[CONF_HOST])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(title=_entry_title(import_data), data=import_data)
+
+    def _entry_data(self, host: str, numbered: bool) -> dict[str, Any]:
+        """Return the entry data for a discovered unit."""
+        # Several units get the last part of their address to keep entity ids apart
+        name = f"{DEFAULT_NAME} {host.rsplit('.', 1)[-1]}" if numbered else DEFAULT_NAME
+        return {CONF_NAME: name, CONF_HOST: host, CONF_PASSWORD: self._scan_password}
+
+
+def _entry_title(data: dict[str, Any]) -> str:
+    """Return the title of a config entry like validate_input does."""
+    return f"{data[CONF_NAME]} ({data[CONF_HOST]})"
+
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
     """Handle a option flow for FALS22."""
@@ -137,7 +326,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
     ) -> FlowResult:
         """Manage the options."""
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            # Keep options that are not part of this form, like profiles
+            return self.async_create_entry(
+                title="", data={**self.config_entry.options, **user_input}
+            )
 
         options_schema = vol.Schema(
             {
@@ -145,6 +337,98 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     "scan_interval",
                     default=self.config_entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL),
                 ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+                vol.Optional(
+                    CONF_REQUEST_TIMEOUT,
+                    default=self.config_entry.options.get(
+                        CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=30)),
+                vol.Optional(
+                    CONF_POLL_DEADLINE,
+                    default=self.config_entry.options.get(
+                        CONF_POLL_DEADLINE, DEFAULT_POLL_DEADLINE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=120)),
+                vol.Optional(
+                    CONF_MAX_RETRIES,
+                    default=self.config_entry.options.get(
+                        CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5)),
+                vol.Optional(
+                    CONF_HEDGE_REQUESTS,
+                    default=self.config_entry.options.get(
+                        CONF_HEDGE_REQUESTS, DEFAULT_HEDGE_REQUESTS
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_WRITE_QUEUE_MAX_AGE,
+                    default=self.config_entry.options.get(
+                        CONF_WRITE_QUEUE_MAX_AGE, DEFAULT_WRITE_QUEUE_MAX_AGE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                vol.Optional(
+                    CONF_HISTORY_DEPTH,
+                    default=self.config_entry.options.get(
+                        CONF_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=20160)),
+                vol.Optional(
+                    CONF_SYNC_POLLING,
+                    default=self.config_entry.options.get(
+                        CONF_SYNC_POLLING, DEFAULT_SYNC_POLLING
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_THIN_POLLING,
+                    default=self.config_entry.options.get(
+                        CONF_THIN_POLLING, DEFAULT_THIN_POLLING
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_HEARTBEAT_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=3600)),
+                vol.Optional(
+                    CONF_ADDITIONAL_HOSTS,
+                    default=self.config_entry.options.get(CONF_ADDITIONAL_HOSTS, ""),
+                ): str,
+                vol.Optional(
+                    CONF_REDISCOVERY,
+                    default=self.config_entry.options.get(
+                        CONF_REDISCOVERY, DEFAULT_REDISCOVERY
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_MAC_ADDRESS,
+                    default=self.config_entry.options.get(CONF_MAC_ADDRESS, ""),
+                ): str,
+                vol.Optional(
+                    CONF_COMPACT_STATISTICS,
+                    default=self.config_entry.options.get(
+                        CONF_COMPACT_STATISTICS, DEFAULT_COMPACT_STATISTICS
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_EXPORT_SAMPLES,
+                    default=self.config_entry.options.get(
+                        CONF_EXPORT_SAMPLES, DEFAULT_EXPORT_SAMPLES
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_EXPORT_MAX_FILE_SIZE,
+                    default=self.config_entry.options.get(
+                        CONF_EXPORT_MAX_FILE_SIZE, DEFAULT_EXPORT_MAX_FILE_SIZE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1024)),
+                vol.Optional(
+                    CONF_EXPORT_ROTATE_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_EXPORT_ROTATE_INTERVAL, DEFAULT_EXPORT_ROTATE_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=168)),
             }
         )
 
@@ -1,175 +1,657 @@
 """Constants for the FALS22 integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntityDescription,
+)
+from homeassistant.components.number import NumberDeviceClass, NumberEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.components.switch import SwitchEntityDescription
+from homeassistant.components.time import TimeEntityDescription
+from homeassistant.const import EntityCategory
+from homeassistant.helpers.typing import StateType
+
+if TYPE_CHECKING:
+    from . import FALS22DataUpdateCoordinator
+    from .fleet import FleetAggregator
 
 DOMAIN = "fals22"
 
 # Configuration keys
 CONF_HOST = "host"
 CONF_PASSWORD = "password"
+CONF_PROFILES = "profiles"
+CONF_ADDITIONAL_HOSTS = "additional_hosts"
+CONF_WRITE_QUEUE_MAX_AGE = "write_queue_max_age"
+CONF_HISTORY_DEPTH = "history_depth"
+CONF_SYNC_POLLING = "sync_polling"
+CONF_THIN_POLLING = "thin_polling"
+CONF_HEARTBEAT_INTERVAL = "heartbeat_interval"
+CONF_EXPORT_SAMPLES = "export_samples"
+CONF_EXPORT_MAX_FILE_SIZE = "export_max_file_size"
+CONF_EXPORT_ROTATE_INTERVAL = "export_rotate_interval"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_POLL_DEADLINE = "poll_deadline"
+CONF_MAX_RETRIES = "max_retries"
+CONF_HEDGE_REQUESTS = "hedge_requests"
+CONF_REDISCOVERY = "rediscovery"
+CONF_MAC_ADDRESS = "mac_address"
+CONF_COMPACT_STATISTICS = "compact_statistics"
+CONF_ENTRY_TYPE = "entry_type"
+CONF_GROUP_BY = "group_by"
+CONF_AREA = "area"
+CONF_LABEL = "label"
+
+# Entries of this type aggregate the units instead of connecting to one
+ENTRY_TYPE_FLEET = "fleet"
+GROUP_BY_ALL = "all"
+GROUP_BY_AREA = "area"
+GROUP_BY_LABEL = "label"
+
+# Fleet aggregators by entry id, apart from the coordinators in hass.data[DOMAIN]
+DATA_FLEET = f"{DOMAIN}_fleet"
+# The running fleet manual ventilation
+DATA_ORCHESTRATOR = f"{DOMAIN}_orchestrator"
+
+# Fired for the device triggers
+EVENT_FALS22 = f"{DOMAIN}_event"
+
+# Sent when a unit entry is set up or unloaded
+SIGNAL_UNITS_CHANGED = f"{DOMAIN}_units_changed"
 
 # Default values
 DEFAULT_NAME = "FaLs22"
 DEFAULT_SCAN_INTERVAL = 60  # 1 minutes
+DEFAULT_WRITE_QUEUE_MAX_AGE = 60  # minutes
+DEFAULT_HISTORY_DEPTH = 1440  # samples, 24 hours at the default interval
+DEFAULT_SYNC_POLLING = False
+DEFAULT_THIN_POLLING = False
+DEFAULT_HEARTBEAT_INTERVAL = 900  # seconds
+DEFAULT_EXPORT_SAMPLES = False
+DEFAULT_EXPORT_MAX_FILE_SIZE = 10  # MB
+DEFAULT_EXPORT_ROTATE_INTERVAL = 24  # hours
+DEFAULT_REQUEST_TIMEOUT = 10  # seconds
+DEFAULT_POLL_DEADLINE = 30  # seconds
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_HEDGE_REQUESTS = True
+DEFAULT_REDISCOVERY = True
+DEFAULT_COMPACT_STATISTICS = False
+
+# Settings that are stored in a named profile and written by apply_profile
+PROFILE_SETTINGS = [
+    "min_temp",
+    "max_temp",
+    "ventilation",
+    "break",
+    "min_hum",
+    "difference",
+    "working_hours_from",
+    "working_minutes_from",
+    "working_hours_to",
+    "working_minutes_to",
+]
 
 # Device info
 MANUFACTURER = "DNE Elektronik-Systeme Gmbh"
 MODEL = "FaLs22"
+FLEET_MODEL = "FaLs22 Fleet"
+
+
+# Descriptions are created once and shared by the entities of all units.
+# Value functions get the coordinator data, which always holds "live" and
+# "settings" once the first refresh succeeded.
+
+
+@dataclass(frozen=True, kw_only=True)
+class FALS22SensorEntityDescription(SensorEntityDescription):
+    """Sensor reading a value from the coordinator data."""
+
+    value_fn: Callable[[dict[str, Any]], StateType]
+    attributes_fn: Callable[[dict[str, Any]], dict[str, Any] | None] | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class FALS22StatisticSensorEntityDescription(SensorEntityDescription):
+    """Rolling mean of a live value over a window."""
+
+    field: str
+    window: str
+    entity_registry_enabled_default: bool = False
+
+
+@dataclass(frozen=True, kw_only=True)
+class FALS22TrendSensorEntityDescription(SensorEntityDescription):
+    """Hourly rate of change of a live value."""
+
+    field: str
+
+
+@dataclass(frozen=True, kw_only=True)
+class FALS22FleetSensorEntityDescription(SensorEntityDescription):
+    """Aggregate of a fleet entry."""
+
+    value_fn: Callable[[FleetAggregator], StateType]
+    attributes_fn: Callable[[FleetAggregator], dict[str, Any] | None] | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class FALS22BinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Binary sensor reading a value from the coordinator data."""
+
+    # The entity is unavailable while this part of the data is missing
+    data_key: str
+    is_on_fn: Callable[[dict[str, Any]], bool | None]
+    attributes_fn: Callable[[FALS22DataUpdateCoordinator], dict[str, Any] | None]
+
+
+@dataclass(frozen=True, kw_only=True)
+class FALS22NumberEntityDescription(NumberEntityDescription):
+    """Number writing one device setting."""
+
+
+@dataclass(frozen=True, kw_only=True)
+class FALS22TimeEntityDescription(TimeEntityDescription):
+    """Time writing the hours and minutes settings of a working time."""
+
+    hours_key: str
+    minutes_key: str
+
+
+def _part(data_key: str, key: str) -> Callable[[dict[str, Any]], StateType]:
+    """Return the value function of a value in one part of the data."""
+    return lambda data: (data.get(data_key) or {}).get(key)
+
 
-# Sensor types with their properties and translation keys
-SENSOR_TYPES = {
+def _live(key: str) -> Callable[[dict[str, Any]], StateType]:
+    """Return the value function of a live value."""
+    return _part("live", key)
+
+
+def _message(data: dict[str, Any]) -> StateType:
+    """Return the device message without padding."""
+    message = (data.get("live") or {}).get("message")
+    return message.strip() if isinstance(message, str) else message
+
+
+def _temp_in_attributes(data: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the device time and the working hours."""
+    live_data = data.get("live")
+    settings = data.get("settings") or {}
+    if not live_data:
+        return None
+    return {
+        "last_update": f"{live_data.get('day', 0):02d}.{live_data.get('month', 0):02d}.{live_data.get('year', 0)} {live_data.get('hours', 0):02d}:{live_data.get('minutes', 0):02d}",
+        "working_hours_from": f"{settings.get('working_hours_from', 0):02d}:{settings.get('working_minutes_from', 0):02d}",
+        "working_hours_to": f"{settings.get('working_hours_to', 0):02d}:{settings.get('working_minutes_to', 0):02d}",
+    }
+
+
+def _last_cycle_attributes(data: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the last finished ventilation cycle."""
+    last_cycle = (data.get("runtime") or {}).get("last_cycle")
+    if not last_cycle:
+        return None
+    return {
+        "last_cycle_duration": last_cycle["duration"],
+        "last_cycle_moisture_removed": last_cycle["moisture_removed"],
+    }
+
+
+def _clock_attributes(data: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the drift of the device clock."""
+    clock = data.get("clock") or {}
+    if clock.get("clock_drift") is None:
+        return None
+    return {"drift_per_day": clock["clock_drift"]}
+
+
+def _export_attributes(data: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the progress of the sample export."""
+    export = data.get("export")
+    if not export:
+        return None
+    return {
+        "exported": export["exported"],
+        "buffered": export["buffered"],
+        "file": export["file"],
+    }
+
+
+SENSOR_TYPES: tuple[FALS22SensorEntityDescription, ...] = (
     # Temperature sensors
-    "temp_in": {
-        "translation_key": "temp_in",
-        "native_unit_of_measurement": "°C",
-        "device_class": "temperature",
-        "state_class": "measurement",
-        "icon": "mdi:thermometer",
-        "data_key": "live",
-    },
-    "temp_out": {
-        "translation_key": "temp_out",
-        "native_unit_of_measurement": "°C",
-        "device_class": "temperature",
-        "state_class": "measurement",
-        "icon": "mdi:thermometer",
-        "data_key": "live",
-    },
+    FALS22SensorEntityDescription(
+        key="temp_in",
+        translation_key="temp_in",
+        native_unit_of_measurement="°C",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:thermometer",
+        value_fn=_live("temp_in"),
+        attributes_fn=_temp_in_attributes,
+    ),
+    FALS22SensorEntityDescription(
+        key="temp_out",
+        translation_key="temp_out",
+        native_unit_of_measurement="°C",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:thermometer",
+        value_fn=_live("temp_out"),
+    ),
     # Humidity sensors
-    "hum_in": {
-        "translation_key": "hum_in",
-        "native_unit_of_measurement": "%",
-        "device_class": "humidity",
-        "state_class": "measurement",
-        "icon": "mdi:water-percent",
-        "data_key": "live",
-    },
-    "hum_out": {
-        "translation_key": "hum_out",
-        "native_unit_of_measurement": "%", 
-        "device_class": "humidity",
-        "state_class": "measurement",
-        "icon": "mdi:water-percent",
-        "data_key": "live",
-    },
-    "abs_hum_in": {
-        "translation_key": "abs_hum_in",
-        "native_unit_of_measurement": "g/m³",
-        "state_class": "measurement",
-        "icon": "mdi:water",
-        "data_key": "live",
-    },
-    "abs_hum_out": {
-        "translation_key": "abs_hum_out",
-        "native_unit_of_measurement": "g/m³",
-        "state_class": "measurement", 
-        "icon": "mdi:water",
-        "data_key": "live",
-    },
+    FALS22SensorEntityDescription(
+        key="hum_in",
+        translation_key="hum_in",
+        native_unit_of_measurement="%",
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water-percent",
+        value_fn=_live("hum_in"),
+    ),
+    FALS22SensorEntityDescription(
+        key="hum_out",
+        translation_key="hum_out",
+        native_unit_of_measurement="%",
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water-percent",
+        value_fn=_live("hum_out"),
+    ),
+    FALS22SensorEntityDescription(
+        key="abs_hum_in",
+        translation_key="abs_hum_in",
+        native_unit_of_measurement="g/m³",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water",
+        value_fn=_live("abs_hum_in"),
+    ),
+    FALS22SensorEntityDescription(
+        key="abs_hum_out",
+        translation_key="abs_hum_out",
+        native_unit_of_measurement="g/m³",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water",
+        value_fn=_live("abs_hum_out"),
+    ),
+    # Dewpoint sensors, calculated from the live values
+    FALS22SensorEntityDescription(
+        key="dewpoint_in",
+        translation_key="dewpoint_in",
+        native_unit_of_measurement="°C",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:thermometer-water",
+        value_fn=_part("derived", "dewpoint_in"),
+    ),
+    FALS22SensorEntityDescription(
+        key="dewpoint_out",
+        translation_key="dewpoint_out",
+        native_unit_of_measurement="°C",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:thermometer-water",
+        value_fn=_part("derived", "dewpoint_out"),
+    ),
     # Status sensors
-    "operating_hours": {
-        "translation_key": "operating_hours",
-        "native_unit_of_measurement": "h",
-        "state_class": "total_increasing",
-        "icon": "mdi:clock",
-        "data_key": "live",
-    },
-    "message": {
-        "translation_key": "message",
-        "icon": "mdi:message-text",
-        "data_key": "live",
-    },
+    FALS22SensorEntityDescription(
+        key="operating_hours",
+        translation_key="operating_hours",
+        native_unit_of_measurement="h",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:clock",
+        value_fn=_live("operating_hours"),
+    ),
+    FALS22SensorEntityDescription(
+        key="message",
+        translation_key="message",
+        icon="mdi:message-text",
+        value_fn=_message,
+    ),
+    # Ventilation accounting, kept by the coordinator
+    FALS22SensorEntityDescription(
+        key="runtime_today",
+        translation_key="runtime_today",
+        native_unit_of_measurement="h",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:fan-clock",
+        value_fn=_part("runtime", "runtime_today"),
+        attributes_fn=_last_cycle_attributes,
+    ),
+    FALS22SensorEntityDescription(
+        key="runtime_total",
+        translation_key="runtime_total",
+        native_unit_of_measurement="h",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:fan-clock",
+        value_fn=_part("runtime", "runtime_total"),
+    ),
+    FALS22SensorEntityDescription(
+        key="moisture_removed_today",
+        translation_key="moisture_removed_today",
+        native_unit_of_measurement="g·h/m³",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:water-minus",
+        value_fn=_part("runtime", "moisture_removed_today"),
+    ),
+    FALS22SensorEntityDescription(
+        key="moisture_removed_total",
+        translation_key="moisture_removed_total",
+        native_unit_of_measurement="g·h/m³",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:water-minus",
+        value_fn=_part("runtime", "moisture_removed_total"),
+    ),
+    FALS22SensorEntityDescription(
+        key="cycles_today",
+        translation_key="cycles_today",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:counter",
+        value_fn=_part("runtime", "cycles_today"),
+    ),
+    FALS22SensorEntityDescription(
+        key="cycles_total",
+        translation_key="cycles_total",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:counter",
+        value_fn=_part("runtime", "cycles_total"),
+    ),
+    # Device sample clock diagnostics
+    FALS22SensorEntityDescription(
+        key="sample_interval",
+        translation_key="sample_interval",
+        native_unit_of_measurement="s",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer-sync-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_part("clock", "sample_interval"),
+    ),
+    FALS22SensorEntityDescription(
+        key="clock_offset",
+        translation_key="clock_offset",
+        native_unit_of_measurement="s",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:clock-alert-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_part("clock", "clock_offset"),
+        attributes_fn=_clock_attributes,
+    ),
+    # Sample export diagnostics
+    FALS22SensorEntityDescription(
+        key="export_dropped",
+        translation_key="export_dropped",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:database-alert-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_part("export", "export_dropped"),
+        attributes_fn=_export_attributes,
+    ),
+)
+
+# Live values kept in the in-memory sample history
+HISTORY_FIELDS = [
+    "temp_in",
+    "temp_out",
+    "hum_in",
+    "hum_out",
+    "abs_hum_in",
+    "abs_hum_out",
+]
+
+# Rolling statistic windows in seconds
+STATISTIC_WINDOWS = {
+    "1h": 3600,
+    "24h": 86400,
 }
 
-# Binary sensor for ventilation state
-BINARY_SENSOR_TYPES = {
-    "on": {
-        "translation_key": "on",
-        "device_class": "running",
-        "icon": "mdi:fan",
-        "data_key": "live",
+_SENSORS_BY_KEY = {description.key: description for description in SENSOR_TYPES}
+
+# Rolling mean sensors, minimum and maximum are exposed as attributes
+STATISTIC_SENSOR_TYPES: tuple[FALS22StatisticSensorEntityDescription, ...] = tuple(
+    FALS22StatisticSensorEntityDescription(
+        key=f"{field}_mean_{window}",
+        translation_key=f"{field}_mean_{window}",
+        native_unit_of_measurement=_SENSORS_BY_KEY[field].native_unit_of_measurement,
+        device_class=_SENSORS_BY_KEY[field].device_class,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon=_SENSORS_BY_KEY[field].icon,
+        field=field,
+        window=window,
+    )
+    for field in HISTORY_FIELDS
+    for window in STATISTIC_WINDOWS
+)
+
+# Window of the sliding linear regression behind the trend sensors
+TREND_WINDOW = 1800  # seconds
+TREND_MIN_SAMPLES = 3
+
+# Rate of change sensors, computed from the sample history
+TREND_SENSOR_TYPES: tuple[FALS22TrendSensorEntityDescription, ...] = (
+    FALS22TrendSensorEntityDescription(
+        key="abs_hum_in_trend",
+        translation_key="abs_hum_in_trend",
+        native_unit_of_measurement="g/m³/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water-sync",
+        field="abs_hum_in",
+    ),
+    FALS22TrendSensorEntityDescription(
+        key="temp_in_trend",
+        translation_key="temp_in_trend",
+        native_unit_of_measurement="°C/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:thermometer-lines",
+        field="temp_in",
+    ),
+)
+
+# Sensors of a fleet entry, kept up to date by the fleet aggregator
+FLEET_SENSOR_TYPES: tuple[FALS22FleetSensorEntityDescription, ...] = (
+    FALS22FleetSensorEntityDescription(
+        key="abs_hum_in_mean",
+        translation_key="fleet_abs_hum_in_mean",
+        native_unit_of_measurement="g/m³",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water",
+        value_fn=lambda aggregator: aggregator.abs_hum_in_mean,
+    ),
+    FALS22FleetSensorEntityDescription(
+        key="abs_hum_in_max",
+        translation_key="fleet_abs_hum_in_max",
+        native_unit_of_measurement="g/m³",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water-alert",
+        value_fn=lambda aggregator: aggregator.abs_hum_in_max,
+    ),
+    FALS22FleetSensorEntityDescription(
+        key="units_ventilating",
+        translation_key="fleet_units_ventilating",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:fan",
+        value_fn=lambda aggregator: aggregator.units_ventilating,
+    ),
+    FALS22FleetSensorEntityDescription(
+        key="units_available",
+        translation_key="fleet_units_available",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:lan-connect",
+        value_fn=lambda aggregator: aggregator.units_available,
+        attributes_fn=lambda aggregator: {"units": len(aggregator.members)},
+    ),
+    FALS22FleetSensorEntityDescription(
+        key="operating_hours_total",
+        translation_key="fleet_operating_hours_total",
+        native_unit_of_measurement="h",
+        state_class=SensorStateClass.TOTAL,
+        icon="mdi:clock",
+        value_fn=lambda aggregator: aggregator.operating_hours,
+    ),
+)
+
+
+def _ventilation_running(data: dict[str, Any]) -> bool | None:
+    """Return True if the fan is running."""
+    is_on = (data.get("live") or {}).get("on")
+    return None if is_on is None else is_on == 1
+
+
+def _ventilation_attributes(
+    coordinator: FALS22DataUpdateCoordinator,
+) -> dict[str, Any] | None:
+    """Return the ventilation settings and the writes waiting for the device."""
+    live_data = coordinator.data.get("live")
+    settings = coordinator.data.get("settings") or {}
+    if not live_data:
+        return None
+    return {
+        "operating_hours": live_data.get("operating_hours", 0),
+        "message": live_data.get("message", "").strip(),
+        "ventilation_duration": settings.get("ventilation", 0),
+        "break_duration": settings.get("break", 0),
+        "keylock_enabled": settings.get("code", 0) == 1,
+        "pending_writes": coordinator.write_queue.as_attributes(),
     }
-}
 
-# Number entity types with translation keys
-NUMBER_TYPES = {
-    "min_temp": {
-        "translation_key": "min_temp",
-        "icon": "mdi:thermometer-low",
-        "native_min_value": 0,
-        "native_max_value": 35,
-        "native_step": 1,
-        "native_unit_of_measurement": "°C",
-        "device_class": "temperature",
-    },
-    "max_temp": {
-        "translation_key": "max_temp",
-        "icon": "mdi:thermometer-high",
-        "native_min_value": 0,
-        "native_max_value": 40,
-        "native_step": 1,
-        "native_unit_of_measurement": "°C",
-        "device_class": "temperature",
-    },
-    "ventilation": {
-        "translation_key": "ventilation",
-        "icon": "mdi:timer",
-        "native_min_value": 0,
-        "native_max_value": 99,
-        "native_step": 1,
-        "native_unit_of_measurement": "min",
-        "device_class": "duration",
-    },
-    "break": {
-        "translation_key": "break",
-        "icon": "mdi:timer-pause",
-        "native_min_value": 0,
-        "native_max_value": 90,
-        "native_step": 1,
-        "native_unit_of_measurement": "min",
-        "device_class": "duration",
-    },
-    "min_hum": {
-        "translation_key": "min_hum",
-        "icon": "mdi:water-percent",
-        "native_min_value": 10,
-        "native_max_value": 90,
-        "native_step": 1,
-        "native_unit_of_measurement": "%",
-        "device_class": "humidity",
-    },
-    "difference": {
-        "translation_key": "difference",
-        "icon": "mdi:delta",
-        "native_min_value": 0.0,
-        "native_max_value": 5.0,
-        "native_step": 0.1,
-        "native_unit_of_measurement": "g/m³",
-    },
-}
 
-# Time entity types with translation keys
-TIME_TYPES = {
-    "working_time_from": {
-        "translation_key": "working_time_from",
-        "icon": "mdi:clock-start",
-        "hours_key": "working_hours_from",
-        "minutes_key": "working_minutes_from",
-    },
-    "working_time_to": {
-        "translation_key": "working_time_to",
-        "icon": "mdi:clock-end", 
-        "hours_key": "working_hours_to",
-        "minutes_key": "working_minutes_to",
-    },
-}
+# Binary sensors for the ventilation state
+BINARY_SENSOR_TYPES: tuple[FALS22BinarySensorEntityDescription, ...] = (
+    FALS22BinarySensorEntityDescription(
+        key="ventilation_running",
+        translation_key="on",
+        device_class=BinarySensorDeviceClass.RUNNING,
+        icon="mdi:fan",
+        data_key="live",
+        is_on_fn=_ventilation_running,
+        attributes_fn=_ventilation_attributes,
+    ),
+    FALS22BinarySensorEntityDescription(
+        key="ventilation_allowed",
+        translation_key="ventilation_allowed",
+        icon="mdi:fan-clock",
+        data_key="derived",
+        is_on_fn=lambda data: (data.get("derived") or {}).get("ventilation_allowed"),
+        attributes_fn=lambda coordinator: {
+            "blocked_by": (coordinator.data.get("derived") or {}).get(
+                "ventilation_blockers", []
+            )
+        },
+    ),
+)
 
-# Switch entity types with translation keys
-SWITCH_TYPES = {
-    "manual_mode": {
-        "translation_key": "manual_mode",
-        "icon": "mdi:fan-auto",
-    },
-    "keylock": {
-        "translation_key": "keylock",
-        "icon": "mdi:lock",
-    },
-}
+# Number entity types, one per device setting
+NUMBER_TYPES: tuple[FALS22NumberEntityDescription, ...] = (
+    FALS22NumberEntityDescription(
+        key="min_temp",
+        translation_key="min_temp",
+        icon="mdi:thermometer-low",
+        native_min_value=0,
+        native_max_value=35,
+        native_step=1,
+        native_unit_of_measurement="°C",
+        device_class=NumberDeviceClass.TEMPERATURE,
+    ),
+    FALS22NumberEntityDescription(
+        key="max_temp",
+        translation_key="max_temp",
+        icon="mdi:thermometer-high",
+        native_min_value=0,
+        native_max_value=40,
+        native_step=1,
+        native_unit_of_measurement="°C",
+        device_class=NumberDeviceClass.TEMPERATURE,
+    ),
+    FALS22NumberEntityDescription(
+        key="ventilation",
+        translation_key="ventilation",
+        icon="mdi:timer",
+        native_min_value=0,
+        native_max_value=99,
+        native_step=1,
+        native_unit_of_measurement="min",
+        device_class=NumberDeviceClass.DURATION,
+    ),
+    FALS22NumberEntityDescription(
+        key="break",
+        translation_key="break",
+        icon="mdi:timer-pause",
+        native_min_value=0,
+        native_max_value=90,
+        native_step=1,
+        native_unit_of_measurement="min",
+        device_class=NumberDeviceClass.DURATION,
+    ),
+    FALS22NumberEntityDescription(
+        key="min_hum",
+        translation_key="min_hum",
+        icon="mdi:water-percent",
+        native_min_value=10,
+        native_max_value=90,
+        native_step=1,
+        native_unit_of_measurement="%",
+        device_class=NumberDeviceClass.HUMIDITY,
+    ),
+    FALS22NumberEntityDescription(
+        key="difference",
+        translation_key="difference",
+        icon="mdi:delta",
+        native_min_value=0.0,
+        native_max_value=5.0,
+        native_step=0.1,
+        native_unit_of_measurement="g/m³",
+    ),
+)
+
+# Duration of manual ventilation, kept by the coordinator
+MANUAL_DURATION_NUMBER = FALS22NumberEntityDescription(
+    key="manual_duration",
+    translation_key="manual_duration",
+    icon="mdi:timer-play",
+    native_min_value=5,
+    native_max_value=300,
+    native_step=5,
+    native_unit_of_measurement="min",
+    device_class=NumberDeviceClass.DURATION,
+)
+
+# Time entity types for the working hours
+TIME_TYPES: tuple[FALS22TimeEntityDescription, ...] = (
+    FALS22TimeEntityDescription(
+        key="working_time_from",
+        translation_key="working_time_from",
+        icon="mdi:clock-start",
+        hours_key="working_hours_from",
+        minutes_key="working_minutes_from",
+    ),
+    FALS22TimeEntityDescription(
+        key="working_time_to",
+        translation_key="working_time_to",
+        icon="mdi:clock-end",
+        hours_key="working_hours_to",
+        minutes_key="working_minutes_to",
+    ),
+)
+
+# Switch entity types
+MANUAL_MODE_SWITCH = SwitchEntityDescription(
+    key="manual_mode",
+    translation_key="manual_mode",
+    icon="mdi:fan-auto",
+)
+KEYLOCK_SWITCH = SwitchEntityDescription(
+    key="keylock",
+    translation_key="keylock",
+    icon="mdi:lock",
+)
+SWITCH_TYPES: tuple[SwitchEntityDescription, ...] = (MANUAL_MODE_SWITCH, KEYLOCK_SWITCH)
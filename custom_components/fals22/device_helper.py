@@ -1,4 +1,6 @@
 """Helper functions for FALS22 device info."""
+from typing import Any
+
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.const import CONF_NAME
 
@@ -30,3 +32,14 @@ def get_entity_name_prefix(config_entry) -> str:
     # Remove any non-alphanumeric characters except underscores
     prefix = "".join(c for c in prefix if c.isalnum() or c == "_")
     return prefix
+
+
+def settings_equal(current: Any, wanted: Any) -> bool:
+    """Compare a device setting with a wanted value."""
+    if current is None or wanted is None:
+        return current is wanted
+    try:
+        # The device reports the humidity difference with one decimal
+        return abs(float(current) - float(wanted)) < 0.05
+    except (TypeError, ValueError):
+        return current == wanted
@@ -0,0 +1,105 @@
+"""Discovery of FaLs22 units on the local network."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import ipaddress
+import logging
+from typing import Any
+
+import aiohttp
+
+from .client import FALS22Client, FALS22Error, async_resolve, is_fals22_live_data
+
+_LOGGER = logging.getLogger(__name__)
+
+# Probes running at the same time, a /24 takes a few rounds
+SCAN_CONCURRENCY = 64
+# Units on the LAN answer well within this time
+PROBE_TIMEOUT = 2  # seconds
+# Largest range scanned, a /22
+MAX_SCAN_HOSTS = 1024
+
+
+def parse_host_range(text: str) -> list[str]:
+    """Return the addresses of a subnet, an address range or a single address.
+
+    Accepted are `192.168.1.0/24`, `192.168.1.10-192.168.1.50`,
+    `192.168.1.10-50` and `192.168.1.10`. Raises ValueError for anything
+    else or for ranges larger than MAX_SCAN_HOSTS.
+    """
+    text = text.strip()
+    if "/" in text:
+        network = ipaddress.ip_network(text, strict=False)
+        if network.num_addresses > MAX_SCAN_HOSTS + 2:
+            raise ValueError(f"Subnet {network} is too large to scan")
+        hosts = network.hosts() if network.num_addresses > 2 else iter(network)
+        return [str(host) for host in hosts]
+
+    if "-" in text:
+        first_text, last_text = (part.strip() for part in text.split("-", 1))
+        first = ipaddress.ip_address(first_text)
+        if "." in last_text or ":" in last_text:
+            last = ipaddress.ip_address(last_text)
+        else:
+            # Only the last part of the end address is given
+            last = ipaddress.ip_address(f"{first_text.rsplit('.', 1)[0]}.{last_text}")
+        count = int(last) - int(first) + 1
+        if count < 1:
+            raise ValueError(f"Empty address range {text}")
+        if count > MAX_SCAN_HOSTS:
+            raise ValueError(f"Address range {text} is too large to scan")
+        return [str(first + offset) for offset in range(count)]
+
+    return [str(ipaddress.ip_address(text))]
+
+
+async def async_probe(
+    session: aiohttp.ClientSession, host: str, password: str = ""
+) -> dict[str, Any] | None:
+    """Return the live data of host if it is a FaLs22 unit."""
+    client = FALS22Client(session, host, password, timeout=PROBE_TIMEOUT)
+    try:
+        live = await client.get_live()
+    except FALS22Error:
+        return None
+    return dict(live) if is_fals22_live_data(live) else None
+
+
+async def async_scan(
+    session: aiohttp.ClientSession,
+    hosts: Iterable[str],
+    password: str = "",
+) -> dict[str, dict[str, Any]]:
+    """Probe the hosts in parallel and return the live data of the units found."""
+    semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+
+    async def probe(host: str) -> tuple[str, dict[str, Any] | None]:
+        async with semaphore:
+            return host, await async_probe(session, host, password)
+
+    results = await asyncio.gather(*(probe(host) for host in hosts))
+    found = {host: live for host, live in results if live is not None}
+    _LOGGER.debug("Discovered FaLs22 units: %s", list(found))
+    return found
+
+
+async def async_resolve_addresses(hosts: Iterable[str]) -> set[str]:
+    """Return the hosts and the IP addresses they resolve to, without ports.
+
+    A scan compares these with the plain addresses of a range, so units
+    configured by hostname, with a port or as additional address are
+    recognised as well.
+    """
+    hosts = set(hosts)
+    resolved = await asyncio.gather(*(async_resolve(host) for host in hosts))
+    return {_without_port(host) for host in (*hosts, *resolved)}
+
+
+def _without_port(host: str) -> str:
+    """Return the address or name of a host without brackets and port."""
+    if host.startswith("["):
+        return host[1 : host.find("]")]
+    if host.count(":") == 1:
+        return host.split(":")[0]
+    return host
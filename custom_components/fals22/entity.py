@@ -0,0 +1,31 @@
+"""Base entity for FALS22 units."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+if TYPE_CHECKING:
+    from . import FALS22DataUpdateCoordinator
+
+
+class FALS22Entity(CoordinatorEntity["FALS22DataUpdateCoordinator"]):
+    """Entity of one unit, described by a shared entity description.
+
+    Descriptions and the device info are shared by the entities of all
+    units, an entity only keeps its coordinator and unique id.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: FALS22DataUpdateCoordinator,
+        description: EntityDescription,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_{description.key}"
+        self._attr_device_info = coordinator.device_info
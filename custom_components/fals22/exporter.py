@@ -0,0 +1,202 @@
+"""Export of FALS22 live samples to rotating compressed CSV files."""
+from __future__ import annotations
+
+import asyncio
+import csv
+from datetime import datetime, timedelta, timezone
+import gzip
+import logging
+import os
+import time
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Columns of every export file, the same for all devices
+EXPORT_FIELDS = [
+    "time",
+    "entry_id",
+    "host",
+    "device_time",
+    "temp_in",
+    "temp_out",
+    "hum_in",
+    "hum_out",
+    "abs_hum_in",
+    "abs_hum_out",
+    "dewpoint_in",
+    "dewpoint_out",
+    "on",
+    "operating_hours",
+]
+
+# Samples kept in memory, newer samples are dropped while it is full
+MAX_BUFFER = 5000
+# A flush starts when this many samples are buffered or the interval passed
+FLUSH_BATCH = 500
+FLUSH_INTERVAL = timedelta(minutes=5)
+
+
+class SampleExporter:
+    """Buffer samples of one device and append them to gzip CSV files.
+
+    Files are written from the executor in batches and rotated when they
+    exceed the configured size or age. Only one flush runs at a time, so
+    a slow disk fills the buffer and drops samples instead of blocking the
+    event loop; the number of dropped samples is reported.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        host: str,
+        max_file_size: int,
+        rotate_interval: int,
+    ) -> None:
+        """Initialize the exporter, sizes in bytes and intervals in seconds."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self.host = host
+        self.max_file_size = max_file_size
+        self.rotate_interval = rotate_interval
+        self.directory = hass.config.path(f"{DOMAIN}_export", entry_id)
+        self.dropped = 0
+        self.exported = 0
+        self._buffer: list[list[Any]] = []
+        # Set while a batch is written in the executor
+        self._flush_task: asyncio.Task[None] | None = None
+        self._path: str | None = None
+        self._opened = 0.0
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._unsub_stop: CALLBACK_TYPE | None = None
+
+    def start(self) -> None:
+        """Start flushing periodically and when Home Assistant stops."""
+        self._unsub_timer = async_track_time_interval(
+            self.hass, self._async_flush_timer, FLUSH_INTERVAL
+        )
+        self._unsub_stop = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_stop_event
+        )
+
+    async def async_stop(self) -> None:
+        """Stop the timer and write the remaining samples."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+        if self._flush_task is not None:
+            await self._flush_task
+        await self.async_flush()
+
+    async def _async_stop_event(self, _event: Event) -> None:
+        """Write the remaining samples when Home Assistant stops."""
+        # The listener removed itself when it was called
+        self._unsub_stop = None
+        await self.async_stop()
+
+    def add(
+        self, timestamp: float, live: dict[str, Any], derived: dict[str, Any] | None
+    ) -> None:
+        """Buffer a sample, flushing when a batch is complete."""
+        if len(self._buffer) >= MAX_BUFFER:
+            self.dropped += 1
+            return
+        derived = derived or {}
+        try:
+            device_time = (
+                f"{live['year']:04d}-{live['month']:02d}-{live['day']:02d}"
+                f"T{live['hours']:02d}:{live['minutes']:02d}"
+            )
+        except (KeyError, TypeError, ValueError):
+            device_time = None
+        self._buffer.append(
+            [
+                datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds"),
+                self.entry_id,
+                self.host,
+                device_time,
+                live.get("temp_in"),
+                live.get("temp_out"),
+                live.get("hum_in"),
+                live.get("hum_out"),
+                live.get("abs_hum_in"),
+                live.get("abs_hum_out"),
+                derived.get("dewpoint_in"),
+                derived.get("dewpoint_out"),
+                live.get("on"),
+                live.get("operating_hours"),
+            ]
+        )
+        if len(self._buffer) >= FLUSH_BATCH and self._flush_task is None:
+            self.hass.async_create_task(self.async_flush())
+
+    async def _async_flush_timer(self, _now: datetime) -> None:
+        """Flush on the timer."""
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Write the buffered samples from the executor."""
+        if self._flush_task is not None or not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        self._flush_task = self.hass.async_create_task(self._async_write(rows))
+        await self._flush_task
+
+    async def _async_write(self, rows: list[list[Any]]) -> None:
+        """Write a batch of rows, counting them as exported or dropped."""
+        try:
+            await self.hass.async_add_executor_job(self._write, rows)
+            self.exported += len(rows)
+        except OSError as err:
+            self.dropped += len(rows)
+            _LOGGER.error("Error exporting samples of %s: %s", self.host, err)
+        finally:
+            self._flush_task = None
+
+    def _write(self, rows: list[list[Any]]) -> None:
+        """Append rows to the current file, rotating it if needed."""
+        if (
+            self._path is None
+            or time.time() - self._opened >= self.rotate_interval
+            or not os.path.exists(self._path)
+            or os.path.getsize(self._path) >= self.max_file_size
+        ):
+            os.makedirs(self.directory, exist_ok=True)
+            self._opened = time.time()
+            stem = datetime.now(timezone.utc).strftime("samples-%Y%m%dT%H%M%SZ")
+            self._path = os.path.join(self.directory, f"{stem}.csv.gz")
+            sequence = 0
+            while os.path.exists(self._path):
+                # Rotated by size within the same second
+                sequence += 1
+                self._path = os.path.join(self.directory, f"{stem}-{sequence}.csv.gz")
+            new_file = True
+        else:
+            new_file = False
+
+        # Every batch is a gzip member of its own, so a file stays readable
+        # up to the last complete batch if Home Assistant stops while writing
+        with gzip.open(self._path, "at", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            if new_file:
+                writer.writerow(EXPORT_FIELDS)
+            writer.writerows(rows)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the exporter state for the coordinator data."""
+        return {
+            "export_dropped": self.dropped,
+            "exported": self.exported,
+            "buffered": len(self._buffer),
+            "file": self._path,
+        }
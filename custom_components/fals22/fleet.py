@@ -0,0 +1,253 @@
+"""Aggregates over a group of FALS22 units."""
+from __future__ import annotations
+
+import heapq
+import logging
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import (
+    CONF_AREA,
+    CONF_GROUP_BY,
+    CONF_LABEL,
+    DOMAIN,
+    GROUP_BY_AREA,
+    GROUP_BY_LABEL,
+    SIGNAL_UNITS_CHANGED,
+)
+
+if TYPE_CHECKING:
+    from . import FALS22DataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Contribution(NamedTuple):
+    """Values one unit adds to the aggregates."""
+
+    available: bool
+    abs_hum_in: float | None
+    on: bool
+    operating_hours: float
+
+
+_NO_CONTRIBUTION = _Contribution(False, None, False, 0.0)
+
+
+class FleetAggregator:
+    """Whole-group values kept up to date from the member coordinators.
+
+    Each coordinator update replaces the contribution of that one unit in
+    running sums and counts, so the mean, the number of running fans and the
+    total operating hours cost O(1) per update. The maximum uses a heap with
+    lazy deletion, O(log n). Units that are unavailable are left out, except
+    for the operating hours: the total is a TOTAL sensor, so a unit keeps its
+    last known hours instead of making the total dip until it is back.
+    Membership by area or label is read from the device registry and only
+    resolved again when units or devices change.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the aggregator."""
+        self.hass = hass
+        self.entry = entry
+        self.group_by = entry.data[CONF_GROUP_BY]
+        self.group = entry.data.get(CONF_AREA) or entry.data.get(CONF_LABEL)
+        self.abs_hum_sum = 0.0
+        self.abs_hum_count = 0
+        self.units_ventilating = 0
+        self.units_available = 0
+        self.operating_hours_total = 0.0
+        self._contributions: dict[str, _Contribution] = {}
+        self._unsub_members: dict[str, CALLBACK_TYPE] = {}
+        # (-abs_hum_in, entry id, version), entries of older versions are stale
+        self._heap: list[tuple[float, str, int]] = []
+        self._versions: dict[str, int] = {}
+        self._version = 0
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @property
+    def abs_hum_in_mean(self) -> float | None:
+        """Return the mean indoor absolute humidity."""
+        if not self.abs_hum_count:
+            return None
+        return round(self.abs_hum_sum / self.abs_hum_count, 2)
+
+    @property
+    def abs_hum_in_max(self) -> float | None:
+        """Return the highest indoor absolute humidity."""
+        heap = self._heap
+        while heap and self._versions.get(heap[0][1]) != heap[0][2]:
+            heapq.heappop(heap)
+        return -heap[0][0] if heap else None
+
+    @property
+    def operating_hours(self) -> float | None:
+        """Return the total operating hours."""
+        return round(self.operating_hours_total, 1) if self.units_available else None
+
+    @property
+    def members(self) -> list[str]:
+        """Return the config entry ids of the member units."""
+        return list(self._unsub_members)
+
+    @callback
+    def async_start(self) -> None:
+        """Follow the units and the device registry."""
+        self._unsubs.append(
+            async_dispatcher_connect(self.hass, SIGNAL_UNITS_CHANGED, self._async_sync_members)
+        )
+        if self.group_by in (GROUP_BY_AREA, GROUP_BY_LABEL):
+            self._unsubs.append(
+                self.hass.bus.async_listen(
+                    dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_registry_updated
+                )
+            )
+        self._async_sync_members()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the units."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        for entry_id in list(self._unsub_members):
+            self._remove_member(entry_id)
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update_callback when the aggregates changed."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    @callback
+    def _async_device_registry_updated(self, event: Event) -> None:
+        """Resolve the members again when a device got another area or labels."""
+        if event.data.get("action") != "update" or (
+            "area_id" in event.data.get("changes", {})
+            or "labels" in event.data.get("changes", {})
+        ):
+            self._async_sync_members()
+
+    @callback
+    def _async_sync_members(self) -> None:
+        """Follow the units that belong to the group now."""
+        coordinators: dict[str, FALS22DataUpdateCoordinator] = self.hass.data.get(DOMAIN, {})
+        wanted = {
+            entry_id: coordinator
+            for entry_id, coordinator in coordinators.items()
+            if self._in_group(entry_id)
+        }
+        changed = False
+        for entry_id in [entry_id for entry_id in self._unsub_members if entry_id not in wanted]:
+            changed |= self._remove_member(entry_id)
+        for entry_id, coordinator in wanted.items():
+            if entry_id in self._unsub_members:
+                continue
+            self._unsub_members[entry_id] = coordinator.async_add_listener(
+                self._member_listener(entry_id)
+            )
+            changed |= self._update_member(entry_id, coordinator)
+        _LOGGER.debug("Members of %s: %s", self.entry.title, list(self._unsub_members))
+        if changed:
+            self._async_notify()
+
+    def _in_group(self, entry_id: str) -> bool:
+        """Return True if the unit of a config entry belongs to the group."""
+        if self.group_by not in (GROUP_BY_AREA, GROUP_BY_LABEL):
+            return True
+        device = dr.async_get(self.hass).async_get_device(identifiers={(DOMAIN, entry_id)})
+        if device is None:
+            return False
+        if self.group_by == GROUP_BY_AREA:
+            return device.area_id == self.group
+        return self.group in device.labels
+
+    def _member_listener(self, entry_id: str) -> CALLBACK_TYPE:
+        """Return the coordinator listener of a member."""
+
+        @callback
+        def _async_updated() -> None:
+            coordinator = self.hass.data.get(DOMAIN, {}).get(entry_id)
+            if coordinator is not None and self._update_member(entry_id, coordinator):
+                self._async_notify()
+
+        return _async_updated
+
+    def _remove_member(self, entry_id: str) -> bool:
+        """Stop following a unit and take back its contribution."""
+        self._unsub_members.pop(entry_id)()
+        changed = self._apply(entry_id, _NO_CONTRIBUTION)
+        self._contributions.pop(entry_id, None)
+        self._versions.pop(entry_id, None)
+        return changed
+
+    def _update_member(self, entry_id: str, coordinator: FALS22DataUpdateCoordinator) -> bool:
+        """Replace the contribution of a unit with its current values."""
+        known_hours = self._contributions.get(entry_id, _NO_CONTRIBUTION).operating_hours
+        live = (coordinator.data or {}).get("live")
+        if not coordinator.last_update_success or not isinstance(live, dict):
+            return self._apply(entry_id, _NO_CONTRIBUTION._replace(operating_hours=known_hours))
+        abs_hum_in = live.get("abs_hum_in")
+        operating_hours = live.get("operating_hours")
+        return self._apply(
+            entry_id,
+            _Contribution(
+                True,
+                float(abs_hum_in) if isinstance(abs_hum_in, (int, float)) else None,
+                bool(live.get("on")),
+                float(operating_hours)
+                if isinstance(operating_hours, (int, float))
+                else known_hours,
+            ),
+        )
+
+    def _apply(self, entry_id: str, new: _Contribution) -> bool:
+        """Move the aggregates from the old to the new contribution of a unit."""
+        old = self._contributions.get(entry_id, _NO_CONTRIBUTION)
+        if old == new:
+            return False
+        self._contributions[entry_id] = new
+
+        self.units_available += new.available - old.available
+        self.units_ventilating += new.on - old.on
+        self.operating_hours_total += new.operating_hours - old.operating_hours
+        if old.abs_hum_in is not None:
+            self.abs_hum_sum -= old.abs_hum_in
+            self.abs_hum_count -= 1
+        if new.abs_hum_in is not None:
+            self.abs_hum_sum += new.abs_hum_in
+            self.abs_hum_count += 1
+
+        # Versions are unique across units, a unit that comes back does not
+        # revive its old heap entries
+        self._version += 1
+        self._versions[entry_id] = self._version
+        if new.abs_hum_in is not None:
+            heapq.heappush(self._heap, (-new.abs_hum_in, entry_id, self._version))
+        if len(self._heap) > 4 * len(self._versions) + 16:
+            # Drop the stale entries that never reached the top
+            self._heap = [item for item in self._heap if self._versions.get(item[1]) == item[2]]
+            heapq.heapify(self._heap)
+        return True
+
+    @callback
+    def _async_notify(self) -> None:
+        """Tell the sensors that the aggregates changed."""
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the aggregates."""
+        return {
+            "abs_hum_in_mean": self.abs_hum_in_mean,
+            "abs_hum_in_max": self.abs_hum_in_max,
+            "units_ventilating": self.units_ventilating,
+            "units_available": self.units_available,
+            "operating_hours_total": self.operating_hours,
+        }
@@ -0,0 +1,161 @@
+"""Poll many FaLs22 units concurrently without Home Assistant.
+
+Reads hosts from files or the command line and writes one record per unit
+and round as JSON lines or CSV, as soon as the unit answered:
+
+    python fleet_poller.py hosts.txt --settings --format csv > audit.csv
+    python fleet_poller.py 192.168.1.20 192.168.1.21 --interval 60
+
+Host files hold one unit per line as `host` or `host,password`, lines
+starting with # are ignored. Only aiohttp is needed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+from datetime import datetime, timezone
+import json
+import os
+import sys
+import time
+from typing import Any, Callable
+
+import aiohttp
+
+try:
+    from .client import FALS22Client, FALS22Error, LiveData, Settings
+except ImportError:  # run as a script
+    from client import FALS22Client, FALS22Error, LiveData, Settings
+
+RECORD_FIELDS = ["time", "host", "ok", "error", "latency_ms"]
+LIVE_FIELDS = list(LiveData.__annotations__)
+SETTINGS_FIELDS = [f"settings_{field}" for field in Settings.__annotations__]
+
+
+def read_hosts(sources: list[str], password: str) -> list[tuple[str, str]]:
+    """Return (host, password) pairs from host files and plain hosts."""
+    hosts = []
+    for source in sources:
+        if not os.path.isfile(source):
+            hosts.append((source, password))
+            continue
+        with open(source, encoding="utf-8") as file:
+            for line in file:
+                if not (line := line.strip()) or line.startswith("#"):
+                    continue
+                host, _, host_password = line.partition(",")
+                hosts.append((host.strip(), host_password.strip() or password))
+    return hosts
+
+
+async def poll_unit(
+    session: aiohttp.ClientSession,
+    host: str,
+    password: str,
+    timeout: float,
+    with_settings: bool,
+) -> dict[str, Any]:
+    """Poll one unit and return its record."""
+    client = FALS22Client(session, host, password, timeout=timeout)
+    record: dict[str, Any] = {
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": host,
+        "ok": True,
+        "error": None,
+    }
+    started = time.perf_counter()
+    try:
+        record.update(await client.get_live())
+        if with_settings:
+            settings = await client.get_settings()
+            record.update({f"settings_{key}": value for key, value in settings.items()})
+    except FALS22Error as err:
+        record["ok"] = False
+        record["error"] = str(err) or type(err).__name__
+    record["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return record
+
+
+async def poll_fleet(
+    hosts: list[tuple[str, str]],
+    write: Callable[[dict[str, Any]], None],
+    concurrency: int,
+    timeout: float,
+    with_settings: bool,
+    interval: float | None,
+    rounds: int | None,
+) -> None:
+    """Poll all units, repeating every interval seconds if given."""
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(host: str, password: str) -> dict[str, Any]:
+        async with semaphore:
+            return await poll_unit(session, host, password, timeout, with_settings)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        completed = 0
+        while True:
+            started = time.monotonic()
+            for next_done in asyncio.as_completed(
+                [limited(host, password) for host, password in hosts]
+            ):
+                write(await next_done)
+            completed += 1
+            if interval is None or (rounds is not None and completed >= rounds):
+                return
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the fleet poller from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("hosts", nargs="+", help="host files or hosts")
+    parser.add_argument("--password", default="", help="password for hosts without one")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=5, help="seconds per request")
+    parser.add_argument("--settings", action="store_true", help="also read the settings")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--interval", type=float, help="poll again every N seconds")
+    parser.add_argument("--rounds", type=int, help="stop after N rounds with --interval")
+    args = parser.parse_args(argv)
+
+    hosts = read_hosts(args.hosts, args.password)
+    if not hosts:
+        parser.error("no hosts given")
+
+    if args.format == "csv":
+        # The same columns for every unit, values a unit does not report stay empty
+        columns = RECORD_FIELDS + LIVE_FIELDS + (SETTINGS_FIELDS if args.settings else [])
+        writer = csv.DictWriter(sys.stdout, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+
+        def write(record: dict[str, Any]) -> None:
+            writer.writerow(record)
+            sys.stdout.flush()
+
+    else:
+
+        def write(record: dict[str, Any]) -> None:
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+
+    try:
+        asyncio.run(
+            poll_fleet(
+                hosts,
+                write,
+                args.concurrency,
+                args.timeout,
+                args.settings,
+                args.interval,
+                args.rounds,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Prometheus metrics of all FALS22 devices."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+import time
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from . import FALS22DataUpdateCoordinator
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Metric name -> (type, help)
+METRICS = {
+    "fals22_temperature_celsius": ("gauge", "Temperature"),
+    "fals22_relative_humidity_percent": ("gauge", "Relative humidity"),
+    "fals22_absolute_humidity_grams_per_cubic_meter": ("gauge", "Absolute humidity"),
+    "fals22_dewpoint_celsius": ("gauge", "Dewpoint"),
+    "fals22_ventilation_on": ("gauge", "1 while the fan runs"),
+    "fals22_ventilation_allowed": ("gauge", "1 while the conditions allow ventilation"),
+    "fals22_operating_hours": ("gauge", "Operating hours reported by the device"),
+    "fals22_ventilation_hours_total": ("counter", "Hours the fan was running"),
+    "fals22_moisture_removed_total": (
+        "counter",
+        "Absolute humidity difference integrated over the ventilation time in g*h/m3, "
+        "times with wetter outdoor air add nothing",
+    ),
+    "fals22_ventilation_cycles_total": ("counter", "Finished ventilation cycles"),
+    "fals22_clock_offset_seconds": ("gauge", "Offset of the device clock"),
+    "fals22_setting": ("gauge", "Device settings"),
+    "fals22_up": ("gauge", "1 if the last poll succeeded"),
+    "fals22_polls_total": ("counter", "Polls since Home Assistant started"),
+    "fals22_poll_failures_total": ("counter", "Failed polls since Home Assistant started"),
+    "fals22_poll_duration_seconds": ("gauge", "Duration of the last poll"),
+    "fals22_request_retries_total": ("counter", "Requests repeated after an error"),
+    "fals22_hedged_requests_total": ("counter", "Second requests sent because the first was slow"),
+    "fals22_last_success_timestamp_seconds": ("gauge", "Time of the last successful poll"),
+    "fals22_staleness_seconds": ("gauge", "Seconds since the last successful poll"),
+}
+
+# (metric, coordinator data key, field, extra labels)
+VALUE_METRICS: list[tuple[str, str, str, dict[str, str]]] = [
+    ("fals22_temperature_celsius", "live", "temp_in", {"location": "indoor"}),
+    ("fals22_temperature_celsius", "live", "temp_out", {"location": "outdoor"}),
+    ("fals22_relative_humidity_percent", "live", "hum_in", {"location": "indoor"}),
+    ("fals22_relative_humidity_percent", "live", "hum_out", {"location": "outdoor"}),
+    ("fals22_absolute_humidity_grams_per_cubic_meter", "live", "abs_hum_in", {"location": "indoor"}),
+    ("fals22_absolute_humidity_grams_per_cubic_meter", "live", "abs_hum_out", {"location": "outdoor"}),
+    ("fals22_dewpoint_celsius", "derived", "dewpoint_in", {"location": "indoor"}),
+    ("fals22_dewpoint_celsius", "derived", "dewpoint_out", {"location": "outdoor"}),
+    ("fals22_ventilation_on", "live", "on", {}),
+    ("fals22_ventilation_allowed", "derived", "ventilation_allowed", {}),
+    ("fals22_operating_hours", "live", "operating_hours", {}),
+    ("fals22_ventilation_hours_total", "runtime", "runtime_total", {}),
+    ("fals22_moisture_removed_total", "runtime", "moisture_removed_total", {}),
+    ("fals22_ventilation_cycles_total", "runtime", "cycles_total", {}),
+    ("fals22_clock_offset_seconds", "clock", "clock_offset", {}),
+]
+SETTING_FIELDS = ["min_temp", "max_temp", "ventilation", "break", "min_hum", "difference"]
+
+
+class PollStats:
+    """Health of the polls of one coordinator."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.polls = 0
+        self.failures = 0
+        self.last_duration: float | None = None
+        self.last_success: float | None = None
+        # Changes with every poll, the metrics cache is keyed by it
+        self.generation = 0
+
+    def record(self, duration: float, success: bool) -> None:
+        """Record a finished poll."""
+        self.polls += 1
+        self.generation += 1
+        self.last_duration = duration
+        if success:
+            self.last_success = time.time()
+        else:
+            self.failures += 1
+
+
+class FALS22MetricsView(HomeAssistantView):
+    """Serve the values and poll health of all devices in Prometheus format."""
+
+    url = "/api/fals22/metrics"
+    name = "api:fals22:metrics"
+    requires_auth = True
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        self._cache_key: tuple | None = None
+        self._cache = ""
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics."""
+        hass: HomeAssistant = request.app["hass"]
+        coordinators: dict[str, FALS22DataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+
+        # Everything but the staleness only changes with a poll
+        key = tuple(
+            (entry_id, id(coordinator), coordinator.poll_stats.generation)
+            for entry_id, coordinator in coordinators.items()
+        )
+        if key != self._cache_key:
+            self._cache = render_metrics(coordinators.values())
+            self._cache_key = key
+
+        now = time.time()
+        staleness = _Metrics()
+        for coordinator in coordinators.values():
+            if coordinator.poll_stats.last_success is not None:
+                staleness.sample(
+                    "fals22_staleness_seconds",
+                    _labels(coordinator),
+                    now - coordinator.poll_stats.last_success,
+                )
+        return web.Response(
+            body=(self._cache + staleness.text()).encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+
+def render_metrics(coordinators: Iterable[FALS22DataUpdateCoordinator]) -> str:
+    """Render the values and poll statistics of the coordinators."""
+    coordinators = list(coordinators)
+    metrics = _Metrics()
+
+    for name, data_key, field, extra in VALUE_METRICS:
+        for coordinator in coordinators:
+            data = (coordinator.data or {}).get(data_key) or {}
+            metrics.sample(name, {**_labels(coordinator), **extra}, data.get(field))
+
+    for coordinator in coordinators:
+        settings = (coordinator.data or {}).get("settings") or {}
+        for field in SETTING_FIELDS:
+            metrics.sample(
+                "fals22_setting", {**_labels(coordinator), "setting": field}, settings.get(field)
+            )
+
+    for coordinator in coordinators:
+        stats = coordinator.poll_stats
+        labels = _labels(coordinator)
+        metrics.sample("fals22_up", labels, coordinator.last_update_success)
+        metrics.sample("fals22_polls_total", labels, stats.polls)
+        metrics.sample("fals22_poll_failures_total", labels, stats.failures)
+        metrics.sample("fals22_poll_duration_seconds", labels, stats.last_duration)
+        metrics.sample("fals22_request_retries_total", labels, coordinator.client.retries)
+        metrics.sample("fals22_hedged_requests_total", labels, coordinator.client.hedges)
+        metrics.sample("fals22_last_success_timestamp_seconds", labels, stats.last_success)
+
+    return metrics.text()
+
+
+def _labels(coordinator: FALS22DataUpdateCoordinator) -> dict[str, str]:
+    """Return the labels identifying a device."""
+    return {
+        "entry_id": coordinator.entry.entry_id,
+        "name": coordinator.entry.data.get("name") or coordinator.entry.title,
+        "host": coordinator.host,
+    }
+
+
+class _Metrics:
+    """Builder for the Prometheus text exposition format."""
+
+    def __init__(self) -> None:
+        """Initialize the builder."""
+        # Samples grouped by metric, every metric must be written in one block
+        self._samples: dict[str, list[str]] = {}
+
+    def sample(self, name: str, labels: dict[str, str], value: Any) -> None:
+        """Add a sample, skipping values that are not numbers."""
+        if value is None or isinstance(value, str):
+            return
+        label_text = ",".join(f'{key}="{_escape(str(text))}"' for key, text in labels.items())
+        self._samples.setdefault(name, []).append(f"{name}{{{label_text}}} {float(value)!r}")
+
+    def text(self) -> str:
+        """Return the exposition text."""
+        lines = []
+        for name, samples in self._samples.items():
+            metric_type, help_text = METRICS[name]
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}", *samples]
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
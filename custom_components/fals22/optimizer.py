@@ -0,0 +1,302 @@
+"""Offline settings optimiser for FaLs22 units.
+
+Replays recorded live values against a grid of candidate settings and
+reports the ventilation hours and the moisture each candidate would have
+removed. The decision logic follows ventilation_logic.py: inside the
+working hours the fan runs when the indoor temperature is at least
+min_temp, the outdoor temperature at most max_temp, the indoor relative
+humidity above min_hum and the absolute humidity difference at least
+difference. While ventilation is allowed the fan alternates between
+`ventilation` minutes on and `break` minutes off.
+
+The replay is open loop: the recorded values already contain the effect of
+the settings that were active at the time, so the results are best used to
+compare candidates with each other.
+
+This script runs outside of Home Assistant and needs numpy:
+
+    python optimizer.py --db home-assistant_v2.db --device fals22 \\
+        --min-temp 5:12:1 --difference 0.5:2.5:0.5 --min-hum 50:70:5 \\
+        --ventilation 10:30:10 --break 0:30:15
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+from datetime import datetime, tzinfo
+import itertools
+import sqlite3
+import sys
+import time
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    sys.exit("The FaLs22 optimiser needs numpy: pip install numpy")
+
+# Entity id suffixes of the recorded live values, see README.md
+FIELD_ENTITIES = {
+    "temp_in": "indoor_temperature",
+    "temp_out": "outdoor_temperature",
+    "hum_in": "indoor_relative_humidity",
+    "hum_out": "outdoor_relative_humidity",
+    "abs_hum_in": "indoor_absolute_humidity",
+    "abs_hum_out": "outdoor_absolute_humidity",
+}
+SIMULATED_FIELDS = ["temp_in", "temp_out", "hum_in", "abs_hum_in", "abs_hum_out"]
+
+STEP = 60  # seconds between replayed samples
+DEFAULT_MAX_GAP = 3600  # seconds a recorded value stays valid
+DEFAULT_AIRFLOW = 100  # m³/h
+
+
+def parse_range(text: str) -> list[float]:
+    """Parse `start:stop:step` (inclusive) or a comma separated list."""
+    if ":" not in text:
+        return [float(value) for value in text.split(",")]
+    start, stop, step = (float(value) for value in text.split(":"))
+    count = int(round((stop - start) / step)) + 1
+    return [round(start + step * position, 6) for position in range(count)]
+
+
+def parse_window(text: str) -> tuple[int, int]:
+    """Parse `HH:MM-HH:MM` into start and end minute of the day."""
+    start, end = text.split("-")
+    return tuple(  # type: ignore[return-value]
+        int(part.split(":")[0]) * 60 + int(part.split(":")[1]) for part in (start, end)
+    )
+
+
+def load_recorder(path: str, entity_ids: dict[str, str]) -> dict[str, tuple]:
+    """Load the recorded states of the entities from a recorder database."""
+    series = {}
+    with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as connection:
+        for field, entity_id in entity_ids.items():
+            rows = connection.execute(
+                "SELECT states.last_updated_ts, states.state FROM states "
+                "JOIN states_meta ON states.metadata_id = states_meta.metadata_id "
+                "WHERE states_meta.entity_id = ? ORDER BY states.last_updated_ts",
+                (entity_id,),
+            ).fetchall()
+            series[field] = _to_arrays(rows)
+    return series
+
+
+def load_csv(path: str, entity_ids: dict[str, str]) -> dict[str, tuple]:
+    """Load a history export with entity_id, state and last_changed columns."""
+    fields = {entity_id: field for field, entity_id in entity_ids.items()}
+    rows: dict[str, list] = {field: [] for field in entity_ids}
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            if (field := fields.get(row["entity_id"])) is None:
+                continue
+            changed = datetime.fromisoformat(row["last_changed"].replace("Z", "+00:00"))
+            rows[field].append((changed.timestamp(), row["state"]))
+    return {field: _to_arrays(sorted(values)) for field, values in rows.items()}
+
+
+def _to_arrays(rows: list[tuple[float, str]]) -> tuple[np.ndarray, np.ndarray]:
+    """Convert state rows to timestamp and value arrays, dropping non-numbers."""
+    times, values = [], []
+    for timestamp, state in rows:
+        try:
+            value = float(state)
+        except (TypeError, ValueError):
+            continue
+        times.append(timestamp)
+        values.append(value)
+    return np.asarray(times, dtype=np.float64), np.asarray(values, dtype=np.float64)
+
+
+def resample(series: dict[str, tuple], max_gap: float) -> dict[str, np.ndarray]:
+    """Resample all series onto a common one-minute grid by holding values."""
+    missing = [field for field in SIMULATED_FIELDS if not len(series[field][0])]
+    if missing:
+        raise SystemExit(f"No recorded values for {', '.join(missing)}")
+    start = max(series[field][0][0] for field in SIMULATED_FIELDS)
+    end = min(series[field][0][-1] for field in SIMULATED_FIELDS)
+    grid = np.arange(np.ceil(start / STEP) * STEP, end, STEP)
+
+    resampled = {"time": grid}
+    for field in SIMULATED_FIELDS:
+        times, values = series[field]
+        index = np.searchsorted(times, grid, side="right") - 1
+        held = values[index]
+        held[grid - times[index] > max_gap] = np.nan
+        resampled[field] = held
+    return resampled
+
+
+def parse_time_zone(text: str) -> tzinfo:
+    """Parse an IANA time zone name such as `Europe/Berlin`."""
+    try:
+        return ZoneInfo(text)
+    except (ZoneInfoNotFoundError, ValueError) as err:
+        raise argparse.ArgumentTypeError(f"Unknown time zone {text}") from err
+
+
+def local_minute_of_day(times: np.ndarray, time_zone: tzinfo | None = None) -> np.ndarray:
+    """Return the minute of the day in time_zone, following daylight saving changes.
+
+    Without a time zone the local time of this computer is used.
+    """
+    hours = ((times - times[0]) // 3600).astype(np.int64)
+    offsets = np.asarray(
+        [
+            datetime.fromtimestamp(times[0] + 3600 * hour, time_zone)
+            .astimezone(time_zone)
+            .utcoffset()
+            .total_seconds()
+            for hour in range(int(hours[-1]) + 1)
+        ]
+    )
+    return ((times + offsets[hours]) // 60 % 1440).astype(np.int32)
+
+
+def simulate(
+    data: dict[str, np.ndarray],
+    window: tuple[int, int] | None,
+    max_temp: float,
+    airflow: float,
+    grid: dict[str, list[float]],
+    time_zone: tzinfo | None = None,
+) -> list[dict[str, float]]:
+    """Simulate every candidate and return ventilation hours and moisture.
+
+    The minutes are narrowed down step by step: to those the climate
+    thresholds allow, then to those the difference allows. There the
+    minutes and the moisture are counted per time since ventilation became
+    allowed, so each on/off cycle only looks at these counts, which are as
+    long as the longest run instead of the whole replay.
+    """
+    temp_in, temp_out = data["temp_in"], data["temp_out"]
+    hum_in = data["hum_in"]
+    difference_values = data["abs_hum_in"] - data["abs_hum_out"]
+
+    usable = ~np.isnan(temp_in + temp_out + hum_in + difference_values)
+    usable &= temp_out <= max_temp
+    if window is not None and window[0] != window[1]:
+        minute = local_minute_of_day(data["time"], time_zone)
+        start, end = window
+        if start < end:
+            usable &= (minute >= start) & (minute < end)
+        else:
+            usable &= (minute >= start) | (minute < end)
+    temp_in = np.nan_to_num(temp_in)
+    hum_in = np.nan_to_num(hum_in)
+    difference_values = np.nan_to_num(difference_values)
+
+    # Moisture per minute of ventilation in g
+    moisture = difference_values * airflow / 60
+    positions = np.arange(len(usable), dtype=np.int64)
+
+    results = []
+    for min_temp, min_hum in itertools.product(grid["min_temp"], grid["min_hum"]):
+        climate = usable & (temp_in >= min_temp) & (hum_in > min_hum)
+        climate_positions = positions[climate]
+        climate_differences = difference_values[climate]
+        climate_moisture = moisture[climate]
+        # True where the minute before is selected as well
+        follows = np.diff(climate_positions, prepend=-2) == 1
+        for difference in grid["difference"]:
+            allowed = climate_differences >= difference
+
+            # Minutes since ventilation became allowed, the cycle restarts there
+            starts = allowed & ~(follows & np.concatenate(([False], allowed))[:-1])
+            run_start = np.maximum.accumulate(np.where(starts, climate_positions, 0))
+            elapsed = (climate_positions - run_start)[allowed]
+            minutes_by_elapsed = np.bincount(elapsed)
+            moisture_by_elapsed = np.bincount(elapsed, weights=climate_moisture[allowed])
+            elapsed_values = np.arange(len(minutes_by_elapsed))
+
+            phases: dict[float, np.ndarray] = {}
+            for ventilation, pause in itertools.product(grid["ventilation"], grid["break"]):
+                if ventilation <= 0:
+                    running = np.zeros(len(elapsed_values), dtype=bool)
+                elif pause <= 0:
+                    running = np.ones(len(elapsed_values), dtype=bool)
+                else:
+                    length = ventilation + pause
+                    if length not in phases:
+                        phases[length] = elapsed_values % length
+                    running = phases[length] < ventilation
+                minutes = int(minutes_by_elapsed[running].sum())
+                removed = float(moisture_by_elapsed[running].sum())
+                results.append(
+                    {
+                        "min_temp": min_temp,
+                        "min_hum": min_hum,
+                        "difference": difference,
+                        "ventilation": ventilation,
+                        "break": pause,
+                        "ventilation_hours": round(minutes / 60, 1),
+                        "moisture_removed_g": round(removed, 1),
+                    }
+                )
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the optimiser from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--db", help="Home Assistant recorder SQLite database")
+    source.add_argument("--csv", help="history export with entity_id,state,last_changed")
+    parser.add_argument("--device", required=True, help="entity id prefix, e.g. fals22")
+    parser.add_argument("--min-temp", default="5:15:1")
+    parser.add_argument("--max-temp", type=float, default=40)
+    parser.add_argument("--min-hum", default="40:70:5")
+    parser.add_argument("--difference", default="0.5:3:0.5")
+    parser.add_argument("--ventilation", default="10:30:10")
+    parser.add_argument("--break", dest="pause", default="0:30:10")
+    parser.add_argument("--working-hours", help="HH:MM-HH:MM in local time")
+    parser.add_argument(
+        "--time-zone",
+        type=parse_time_zone,
+        help="time zone of the working hours, e.g. Europe/Berlin, default: this computer",
+    )
+    parser.add_argument("--airflow", type=float, default=DEFAULT_AIRFLOW, help="m³/h")
+    parser.add_argument("--max-gap", type=float, default=DEFAULT_MAX_GAP, help="seconds")
+    parser.add_argument("--top", type=int, default=20, help="candidates to print")
+    parser.add_argument("--output", help="write all results to this CSV file")
+    args = parser.parse_args(argv)
+
+    entity_ids = {
+        field: f"sensor.{args.device}_{suffix}" for field, suffix in FIELD_ENTITIES.items()
+    }
+    started = time.perf_counter()
+    series = load_recorder(args.db, entity_ids) if args.db else load_csv(args.csv, entity_ids)
+    data = resample(series, args.max_gap)
+    loaded = time.perf_counter()
+
+    grid = {
+        "min_temp": parse_range(args.min_temp),
+        "min_hum": parse_range(args.min_hum),
+        "difference": parse_range(args.difference),
+        "ventilation": parse_range(args.ventilation),
+        "break": parse_range(args.pause),
+    }
+    window = parse_window(args.working_hours) if args.working_hours else None
+    results = simulate(data, window, args.max_temp, args.airflow, grid, args.time_zone)
+    results.sort(key=lambda result: result["moisture_removed_g"], reverse=True)
+    finished = time.perf_counter()
+
+    print(
+        f"Replayed {len(data['time'])} minutes against {len(results)} candidates "
+        f"(loading {loaded - started:.1f} s, simulation {finished - loaded:.1f} s)",
+        file=sys.stderr,
+    )
+    columns = list(results[0]) if results else []
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(results)
+    print("\t".join(columns))
+    for result in results[: args.top]:
+        print("\t".join(str(result[column]) for column in columns))
+
+
+if __name__ == "__main__":
+    main()
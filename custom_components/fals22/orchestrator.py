@@ -0,0 +1,289 @@
+"""Staggered manual ventilation of many FALS22 units."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from . import FALS22DataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Time the device gets to switch the fan on before the state is read back
+CONFIRM_DELAY = 2  # seconds
+# Device update interval assumed until the sample clock learned it
+DEFAULT_SAMPLE_INTERVAL = 60  # seconds
+# Reads of the state before a start that was not confirmed counts as failed
+MAX_CONFIRM_REFRESHES = 4
+# A confirming refresh reads the live data and the settings
+REFRESH_REQUESTS = 2
+
+
+class RequestPacer:
+    """Space requests to the units evenly at a maximum rate."""
+
+    def __init__(self, hass: HomeAssistant, rate: float) -> None:
+        """Initialize the pacer for a number of requests per second."""
+        self.hass = hass
+        self.rate = rate
+        self._next = 0.0
+
+    async def async_wait(self, requests: int = 1) -> None:
+        """Wait until the next requests are allowed."""
+        now = self.hass.loop.time()
+        start = max(now, self._next)
+        self._next = start + requests / self.rate
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class ManualVentilationOrchestrator:
+    """Run manual ventilation on many units with a limit on running fans.
+
+    Units are started one after the other at the request rate, in waves
+    that fill the free places under max_running. Fans that run on their own
+    take a place as well. The end of manual mode is tracked locally from
+    the duration, so a place is handed to the next unit without asking the
+    device. Each start is confirmed in the background from the next device
+    sample taken after it, after which the unit polls at the heartbeat
+    interval until its manual mode ends.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: list[FALS22DataUpdateCoordinator],
+        duration: int,
+        max_running: int | None,
+        request_rate: float,
+    ) -> None:
+        """Initialize the orchestrator."""
+        self.hass = hass
+        self.duration = duration
+        self.max_running = max_running or len(coordinators)
+        self.pacer = RequestPacer(hass, request_rate)
+        self.entry_ids = [coordinator.entry.entry_id for coordinator in coordinators]
+        self.pending: deque[str] = deque(self.entry_ids)
+        # Entry ids of the units in manual mode started by the orchestrator
+        self.running: set[str] = set()
+        self.finished: list[str] = []
+        self.failed: list[str] = []
+        self._stopping = False
+        self._wake = asyncio.Event()
+        self._unsubs: list[CALLBACK_TYPE] = [
+            coordinator.async_add_listener(self._async_wake) for coordinator in coordinators
+        ]
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._task: asyncio.Task[None] | None = None
+        # Entry id -> task confirming that the fan of the unit runs
+        self._confirming: dict[str, asyncio.Task[None]] = {}
+
+    @property
+    def done(self) -> bool:
+        """Return True once all units finished or the run was stopped."""
+        return self._task is not None and self._task.done()
+
+    @callback
+    def async_start(self) -> None:
+        """Start the run in the background."""
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"{DOMAIN} fleet manual ventilation"
+        )
+
+    async def async_stop(self) -> None:
+        """Drop the waiting units and end manual mode of the running ones."""
+        self._stopping = True
+        self.pending.clear()
+        self._wake.set()
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the progress of the run."""
+        return {
+            "pending": list(self.pending),
+            "running": {
+                entry_id: round(coordinator.manual_remaining)
+                for entry_id in self.running
+                if (coordinator := self._coordinator(entry_id)) is not None
+            },
+            "finished": self.finished,
+            "failed": self.failed,
+        }
+
+    def _coordinator(self, entry_id: str) -> FALS22DataUpdateCoordinator | None:
+        """Return the coordinator of a unit that is still set up."""
+        return self.hass.data.get(DOMAIN, {}).get(entry_id)
+
+    @callback
+    def _async_wake(self, *_: Any) -> None:
+        """Look at the places again."""
+        self._wake.set()
+
+    async def _async_run(self) -> None:
+        """Start the units as places become free until all of them ran."""
+        _LOGGER.info(
+            "Starting manual ventilation of %s units, at most %s at a time",
+            len(self.pending),
+            self.max_running,
+        )
+        try:
+            while not self._stopping:
+                self._wake.clear()
+                self._collect_finished()
+                if not self.pending and not self.running:
+                    break
+                free = self.max_running - len(self.running) - self._running_on_their_own()
+                while free > 0 and self.pending and not self._stopping:
+                    entry_id = self.pending.popleft()
+                    if await self._async_start_unit(entry_id):
+                        free -= 1
+                self._schedule_wake()
+                await self._wake.wait()
+            if self._stopping:
+                await self._async_stop_running()
+        finally:
+            self._cancel_timer()
+            self._cancel_confirming()
+            for unsub in self._unsubs:
+                unsub()
+            self._unsubs.clear()
+            for entry_id in self.running:
+                if (coordinator := self._coordinator(entry_id)) is not None:
+                    coordinator.manual_confirmed = False
+            _LOGGER.info("Manual ventilation of the units ended: %s", self.as_dict())
+
+    def _collect_finished(self) -> None:
+        """Free the places of the units whose manual time is over."""
+        for entry_id in list(self.running):
+            coordinator = self._coordinator(entry_id)
+            if coordinator is None or coordinator.manual_remaining <= 0:
+                self.running.discard(entry_id)
+                self.finished.append(entry_id)
+                if coordinator is not None:
+                    coordinator.manual_confirmed = False
+
+    def _running_on_their_own(self) -> int:
+        """Return the number of fans running that the orchestrator did not start."""
+        return sum(
+            1
+            for entry_id in self.entry_ids
+            if entry_id not in self.running
+            and (coordinator := self._coordinator(entry_id)) is not None
+            and coordinator.last_update_success
+            and _fan_on(coordinator)
+        )
+
+    async def _async_start_unit(self, entry_id: str) -> bool:
+        """Start manual mode on a unit, return True if it takes a place."""
+        coordinator = self._coordinator(entry_id)
+        if coordinator is None or not coordinator.last_update_success:
+            _LOGGER.warning("Skipping unreachable unit %s", entry_id)
+            self.failed.append(entry_id)
+            return False
+
+        await self.pacer.async_wait()
+        # Not queued while unreachable, a late start would exceed max_running
+        if not await coordinator.async_set_manual_mode(
+            self.duration, True, queue_on_failure=False
+        ):
+            _LOGGER.warning("Failed to start manual ventilation of %s", coordinator.host)
+            self.failed.append(entry_id)
+            return False
+        self.running.add(entry_id)
+        # The next units start while this one waits for a device update
+        self._confirming[entry_id] = self.hass.async_create_background_task(
+            self._async_confirm_unit(entry_id, coordinator),
+            f"{DOMAIN} confirm manual ventilation {coordinator.host}",
+        )
+        return True
+
+    async def _async_confirm_unit(
+        self, entry_id: str, coordinator: FALS22DataUpdateCoordinator
+    ) -> None:
+        """Confirm that the fan runs, or free its place and switch it off.
+
+        The device only refreshes its live values periodically, so the
+        first reads after the start may still show the fan off. The first
+        sample read serves as reference, a later one was taken after the
+        start. The start fails if such a sample shows the fan off, or if
+        MAX_CONFIRM_REFRESHES reads did not confirm it.
+        """
+        try:
+            delay: float = CONFIRM_DELAY
+            first_sample = None
+            for _ in range(MAX_CONFIRM_REFRESHES):
+                await asyncio.sleep(delay)
+                await self.pacer.async_wait(REFRESH_REQUESTS)
+                await coordinator.async_refresh()
+                if coordinator.last_update_success and _fan_on(coordinator):
+                    coordinator.manual_confirmed = True
+                    return
+                sample = coordinator.sample_clock.device_time
+                if coordinator.last_update_success and sample is not None:
+                    if first_sample is None:
+                        first_sample = sample
+                    elif sample != first_sample:
+                        break
+                # Read again right after the next expected device update
+                delay = coordinator.sample_clock.next_poll_delay(
+                    self.hass.loop.time(), 0
+                ) or DEFAULT_SAMPLE_INTERVAL / 2
+
+            _LOGGER.warning("Manual ventilation of %s was not confirmed", coordinator.host)
+            self.running.discard(entry_id)
+            self.failed.append(entry_id)
+            await coordinator.async_set_manual_mode(self.duration, False, queue_on_failure=False)
+            self._wake.set()
+        finally:
+            self._confirming.pop(entry_id, None)
+
+    def _cancel_confirming(self) -> None:
+        """Stop confirming the started units."""
+        for task in self._confirming.values():
+            task.cancel()
+        self._confirming.clear()
+
+    async def _async_stop_running(self) -> None:
+        """End manual mode of the units the orchestrator started."""
+        self._cancel_confirming()
+        for entry_id in list(self.running):
+            if (coordinator := self._coordinator(entry_id)) is None:
+                continue
+            await self.pacer.async_wait()
+            coordinator.manual_confirmed = False
+            if not await coordinator.async_set_manual_mode(self.duration, False):
+                _LOGGER.error("Failed to end manual ventilation of %s", coordinator.host)
+                continue
+            await self.pacer.async_wait(REFRESH_REQUESTS)
+            await coordinator.async_request_refresh()
+        self.running.clear()
+
+    def _schedule_wake(self) -> None:
+        """Look at the places again when the first running unit ends."""
+        self._cancel_timer()
+        remaining = [
+            coordinator.manual_remaining
+            for entry_id in self.running
+            if (coordinator := self._coordinator(entry_id)) is not None
+        ]
+        if remaining:
+            self._unsub_timer = async_call_later(self.hass, min(remaining), self._async_wake)
+
+    def _cancel_timer(self) -> None:
+        """Cancel the wake up timer."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+
+def _fan_on(coordinator: FALS22DataUpdateCoordinator) -> bool:
+    """Return True if the last live data of a unit shows the fan running."""
+    return (coordinator.data or {}).get("live", {}).get("on") == 1
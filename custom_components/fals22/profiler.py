@@ -0,0 +1,181 @@
+"""Timing of the phases of coordinator update cycles."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable
+import time
+from typing import Any
+
+# Phases in the order they run in a cycle
+PHASES = ["request", "decode", "normalise", "dispatch"]
+
+# Kinds of update cycles, only full cycles are part of the phase timings
+CYCLE_FULL = "full"
+CYCLE_REPEATED = "repeated"
+CYCLE_FAILED = "failed"
+
+
+class _Timing:
+    """Count, total and maximum of the durations of one phase."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize the timing."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Add a duration."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: _Timing) -> None:
+        """Add the durations of another timing."""
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timing in milliseconds."""
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 3) if self.count else None,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class CycleProfiler:
+    """Record the timings of the next update cycles of one coordinator.
+
+    The client and the coordinator only call into the profiler while one is
+    attached, so there is no cost when profiling is off. Request and decode
+    are timed per HTTP request, normalise covers building the coordinator
+    data and dispatch the coordinator listeners. For entity listeners the
+    state and attribute properties are evaluated once more on their own to
+    split the time into property evaluation and the remaining state write.
+
+    Polls that found a repeated sample skip most of the work and failed
+    polls wait for timeouts, so their cycles are only counted apart and
+    the timings recorded in them are left out.
+    """
+
+    def __init__(self, cycles: int) -> None:
+        """Initialize the profiler for a number of cycles."""
+        self.cycles = cycles
+        self.completed = 0
+        self.started = time.time()
+        self.phases = {phase: _Timing() for phase in PHASES}
+        self.cycle = _Timing()
+        # Cycle kind -> timing of the cycles that were not full cycles
+        self.skipped: dict[str, _Timing] = {}
+        # Entity id or listener name -> part -> timing
+        self.listeners: dict[str, dict[str, _Timing]] = {}
+        self.done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._cycle_started: float | None = None
+        self._cycle_kind = CYCLE_FULL
+        # Timings of the running cycle, added once it ended as a full cycle
+        self._cycle_phases: dict[str, _Timing] = {}
+        self._cycle_listeners: dict[str, dict[str, _Timing]] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Record the duration of a phase."""
+        phases = self.phases if self._cycle_started is None else self._cycle_phases
+        phases.setdefault(phase, _Timing()).add(seconds)
+
+    def start_cycle(self) -> None:
+        """Mark the start of an update cycle."""
+        self._cycle_started = time.perf_counter()
+        self._cycle_kind = CYCLE_FULL
+        self._cycle_phases = {}
+        self._cycle_listeners = {}
+
+    def mark_cycle(self, kind: str) -> None:
+        """Mark the running cycle as repeated or failed."""
+        self._cycle_kind = kind
+
+    def end_cycle(self) -> None:
+        """Mark the end of an update cycle, after its listeners ran."""
+        if self._cycle_started is None or self.done.done():
+            return
+        duration = time.perf_counter() - self._cycle_started
+        self._cycle_started = None
+        if self._cycle_kind != CYCLE_FULL:
+            self.skipped.setdefault(self._cycle_kind, _Timing()).add(duration)
+            return
+
+        self.cycle.add(duration)
+        for phase, timing in self._cycle_phases.items():
+            self.phases.setdefault(phase, _Timing()).merge(timing)
+        for name, parts in self._cycle_listeners.items():
+            listener = self.listeners.setdefault(name, {})
+            for part, timing in parts.items():
+                listener.setdefault(part, _Timing()).merge(timing)
+        self.completed += 1
+        if self.completed >= self.cycles:
+            self.done.set_result(None)
+
+    def finish(self) -> None:
+        """Stop early with the cycles recorded so far."""
+        if not self.done.done():
+            self.done.set_result(None)
+
+    def dispatch(self, listeners: Iterable[Callable[[], None]]) -> None:
+        """Call the coordinator listeners, timing each of them."""
+        # Without the extra property evaluation of the profiler
+        dispatch = 0.0
+        recorded = self.listeners if self._cycle_started is None else self._cycle_listeners
+        for update_callback in listeners:
+            entity = getattr(update_callback, "__self__", None)
+            name = getattr(entity, "entity_id", None) or getattr(
+                update_callback, "__qualname__", repr(update_callback)
+            )
+            timings = recorded.setdefault(name, {})
+
+            properties = 0.0
+            if entity is not None and hasattr(entity, "async_write_ha_state"):
+                started = time.perf_counter()
+                try:
+                    _evaluate_properties(entity)
+                except Exception:  # pylint: disable=broad-except
+                    # The state write reports the error itself
+                    pass
+                properties = time.perf_counter() - started
+                timings.setdefault("properties", _Timing()).add(properties)
+
+            started = time.perf_counter()
+            update_callback()
+            # The state write evaluates the properties again
+            total = time.perf_counter() - started
+            dispatch += total
+            timings.setdefault("state_write", _Timing()).add(max(0.0, total - properties))
+        self.record("dispatch", dispatch)
+
+    def summary(self) -> dict[str, Any]:
+        """Return the recorded timings."""
+        return {
+            "started": self.started,
+            "cycles": self.completed,
+            "cycle": self.cycle.as_dict(),
+            "skipped_cycles": {
+                kind: timing.as_dict() for kind, timing in self.skipped.items()
+            },
+            "phases": {phase: timing.as_dict() for phase, timing in self.phases.items()},
+            "listeners": {
+                name: {part: timing.as_dict() for part, timing in parts.items()}
+                for name, parts in sorted(
+                    self.listeners.items(),
+                    key=lambda item: -sum(timing.total for timing in item[1].values()),
+                )
+            },
+        }
+
+
+def _evaluate_properties(entity: Any) -> None:
+    """Evaluate the properties an entity state write reads."""
+    if entity.available:
+        entity.state  # pylint: disable=pointless-statement
+    entity.extra_state_attributes  # pylint: disable=pointless-statement
@@ -0,0 +1,75 @@
+"""Dewpoint calculation for FALS22 live values using precomputed tables."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+import math
+from typing import Any
+
+# Magnus coefficients over water (Sonntag 1990)
+MAGNUS_A = 17.62
+MAGNUS_B = 243.12
+
+# The device reports values with one decimal, so tables with a resolution of
+# 0.1 reproduce the exact formula for every value it can send
+TABLE_RESOLUTION = 10
+TABLE_MIN_TEMP = -40.0
+TABLE_MAX_TEMP = 60.0
+
+_TEMP_OFFSET = round(-TABLE_MIN_TEMP * TABLE_RESOLUTION)
+_MAGNUS_TERM = array(
+    "d",
+    (
+        MAGNUS_A * temp / (MAGNUS_B + temp)
+        for temp in (
+            step / TABLE_RESOLUTION
+            for step in range(
+                round(TABLE_MIN_TEMP * TABLE_RESOLUTION),
+                round(TABLE_MAX_TEMP * TABLE_RESOLUTION) + 1,
+            )
+        )
+    ),
+)
+# Index 0 (0 % relative humidity) has no dewpoint and is never looked up
+_LN_HUMIDITY = array(
+    "d",
+    [0.0]
+    + [math.log(step / (100 * TABLE_RESOLUTION)) for step in range(1, 100 * TABLE_RESOLUTION + 1)],
+)
+
+
+def as_float(value: Any) -> float | None:
+    """Return a device value as float, None if it is missing or not a number."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        # The device reports values it cannot measure as "" or "--"
+        return None
+    return None if math.isnan(number) else number
+
+
+def _magnus_term(temperature: float) -> float:
+    """Return a*T/(b+T) from the table or the formula outside its range."""
+    index = round(temperature * TABLE_RESOLUTION) + _TEMP_OFFSET
+    if 0 <= index < len(_MAGNUS_TERM):
+        return _MAGNUS_TERM[index]
+    return MAGNUS_A * temperature / (MAGNUS_B + temperature)
+
+
+def dewpoint(temperature: Any, humidity: Any) -> float | None:
+    """Return the dewpoint in °C for a temperature in °C and relative humidity in %."""
+    temperature, humidity = as_float(temperature), as_float(humidity)
+    if temperature is None or humidity is None or humidity <= 0:
+        return None
+    index = min(round(humidity * TABLE_RESOLUTION), 100 * TABLE_RESOLUTION)
+    if index == 0:
+        return None
+    gamma = _LN_HUMIDITY[index] + _magnus_term(temperature)
+    return MAGNUS_B * gamma / (MAGNUS_A - gamma)
+
+
+def dewpoints(
+    temperatures: Sequence[Any], humidities: Sequence[Any]
+) -> list[float | None]:
+    """Return the dewpoints for pairs of temperature and relative humidity."""
+    return [dewpoint(temp, hum) for temp, hum in zip(temperatures, humidities)]
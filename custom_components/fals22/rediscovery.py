@@ -0,0 +1,219 @@
+"""Finding a FALS22 unit again after its address changed."""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import format_mac
+
+from .client import FALS22Client, FALS22Error
+from .const import (
+    CONF_HOST,
+    CONF_MAC_ADDRESS,
+    CONF_REDISCOVERY,
+    DEFAULT_REDISCOVERY,
+    DOMAIN,
+    PROFILE_SETTINGS,
+)
+from .device_helper import settings_equal
+from .discovery import PROBE_TIMEOUT, async_probe, async_scan, parse_host_range
+
+if TYPE_CHECKING:
+    from . import FALS22DataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Failed polls in a row before the subnet is scanned
+REDISCOVERY_FAILURES = 3
+# Time between scans while the unit stays lost
+REDISCOVERY_RETRY = 900  # seconds
+# Prefix length of the subnet scanned around the last address
+REDISCOVERY_PREFIX = 24
+# Slack for the operating hours counter, it counts whole hours
+OPERATING_HOURS_SLACK = 1
+ARP_TABLE = "/proc/net/arp"
+
+
+def hours_continue(live: dict[str, Any], known_live: dict[str, Any], hours_lost: float) -> bool:
+    """Return True if the operating hours continue from the last known value.
+
+    The counter may only have advanced by the time the unit was lost.
+    """
+    hours = live.get("operating_hours")
+    known_hours = known_live.get("operating_hours")
+    if not isinstance(hours, (int, float)) or not isinstance(known_hours, (int, float)):
+        return False
+    return known_hours <= hours <= known_hours + hours_lost + OPERATING_HOURS_SLACK
+
+
+def settings_match(settings: Any, known_settings: dict[str, Any]) -> bool:
+    """Return True if all known settings are found on the unit."""
+    if not isinstance(settings, dict):
+        return False
+    keys = [key for key in PROFILE_SETTINGS if key in known_settings]
+    return bool(keys) and all(
+        settings_equal(settings.get(key), known_settings[key]) for key in keys
+    )
+
+
+def read_arp_table() -> dict[str, str]:
+    """Return the MAC addresses in the ARP cache of the host by IP address."""
+    table: dict[str, str] = {}
+    try:
+        with open(ARP_TABLE, encoding="ascii") as file:
+            next(file, None)
+            for line in file:
+                fields = line.split()
+                # Incomplete entries have the flags 0x0
+                if len(fields) >= 4 and fields[2] != "0x0":
+                    table[fields[0]] = format_mac(fields[3])
+    except OSError:
+        pass
+    return table
+
+
+class UnitRediscovery:
+    """Scan the subnet for a unit after sustained poll failures.
+
+    A DHCP lease change leaves the coordinator polling an address the unit
+    no longer has. After REDISCOVERY_FAILURES failed polls the /24 around
+    the last address is probed once, at most every REDISCOVERY_RETRY
+    seconds. The unit is recognised by its MAC address in the ARP cache if
+    one is configured, else by the continuity of its operating hours and
+    its settings. Only an unambiguous match moves the config entry.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: FALS22DataUpdateCoordinator) -> None:
+        """Initialize the rediscovery."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.failures = 0
+        self._last_success = hass.loop.time()
+        self._last_scan: float | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @callback
+    def poll_succeeded(self) -> None:
+        """Note a successful poll."""
+        self.failures = 0
+        self._last_success = self.hass.loop.time()
+
+    @callback
+    def poll_failed(self) -> None:
+        """Note a failed poll and start a scan if the unit seems to be lost."""
+        self.failures += 1
+        options = self.coordinator.entry.options
+        now = self.hass.loop.time()
+        if (
+            not options.get(CONF_REDISCOVERY, DEFAULT_REDISCOVERY)
+            or self.failures < REDISCOVERY_FAILURES
+            or (self._task is not None and not self._task.done())
+            or (self._last_scan is not None and now - self._last_scan < REDISCOVERY_RETRY)
+        ):
+            return
+        self._last_scan = now
+        self._task = self.hass.async_create_background_task(
+            self._async_rediscover(), f"{DOMAIN} rediscovery {self.coordinator.host}"
+        )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel a running scan."""
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _async_rediscover(self) -> None:
+        """Look for the unit and move the config entry to its new address."""
+        entry = self.coordinator.entry
+        host = entry.data[CONF_HOST]
+        try:
+            network = ipaddress.ip_network(f"{host}/{REDISCOVERY_PREFIX}", strict=False)
+        except ValueError:
+            # Hostnames are resolved again on every failure anyway
+            return
+        if network.version != 4:
+            return
+
+        # Addresses of configured units are not the lost one
+        taken = {
+            other.data.get(CONF_HOST) for other in self.hass.config_entries.async_entries(DOMAIN)
+        }
+        hosts = [
+            candidate for candidate in parse_host_range(str(network)) if candidate not in taken
+        ]
+        _LOGGER.info(
+            "%s did not answer %s polls, looking for it in %s", host, self.failures, network
+        )
+
+        if mac := entry.options.get(CONF_MAC_ADDRESS):
+            found = await self._async_find_by_mac(format_mac(mac), hosts)
+        else:
+            found = await self._async_find_by_identity(hosts)
+
+        if found is None:
+            _LOGGER.warning("Could not find %s again in %s", host, network)
+            return
+        _LOGGER.warning("Found %s at its new address %s", host, found)
+        await self.coordinator.async_set_host(found)
+
+    async def _async_find_by_mac(self, mac: str, hosts: list[str]) -> str | None:
+        """Return the address the MAC address belongs to."""
+        session = async_get_clientsession(self.hass)
+        password = self.coordinator.password or ""
+        wanted = set(hosts)
+
+        def lookup(table: dict[str, str]) -> str | None:
+            return next(
+                (address for address, known in table.items() if known == mac and address in wanted),
+                None,
+            )
+
+        # The ARP cache may already know the new address
+        table = await self.hass.async_add_executor_job(read_arp_table)
+        if (address := lookup(table)) is not None and await async_probe(
+            session, address, password
+        ):
+            return address
+
+        found = await async_scan(session, hosts, password)
+        table = await self.hass.async_add_executor_job(read_arp_table)
+        address = lookup(table)
+        return address if address in found else None
+
+    async def _async_find_by_identity(self, hosts: list[str]) -> str | None:
+        """Return the address of the only unit that continues the known data."""
+        data = self.coordinator.data or {}
+        known_live = data.get("live")
+        known_settings = data.get("settings")
+        if not isinstance(known_live, dict) or not isinstance(known_settings, dict):
+            _LOGGER.debug("Nothing known about %s to recognise it", self.coordinator.host)
+            return None
+        hours_lost = (self.hass.loop.time() - self._last_success) / 3600
+
+        session = async_get_clientsession(self.hass)
+        password = self.coordinator.password or ""
+        found = await async_scan(session, hosts, password)
+
+        matches = []
+        for address, live in found.items():
+            # The settings are only read from units with matching hours
+            if not hours_continue(live, known_live, hours_lost):
+                continue
+            client = FALS22Client(session, address, password, timeout=PROBE_TIMEOUT)
+            try:
+                settings = await client.get_settings()
+            except FALS22Error:
+                continue
+            if settings_match(settings, known_settings):
+                matches.append(address)
+
+        if len(matches) > 1:
+            _LOGGER.warning(
+                "Several units match %s, not moving it: %s", self.coordinator.host, matches
+            )
+            return None
+        return matches[0] if matches else None
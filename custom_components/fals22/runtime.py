@@ -0,0 +1,129 @@
+"""Ventilation runtime and moisture removal accounting for FALS22 devices."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+# Longer gaps between samples are not integrated, the state in between is unknown
+MAX_SAMPLE_GAP = 900  # seconds
+
+DAILY_COUNTERS = ("runtime_today", "moisture_removed_today", "cycles_today")
+TOTAL_COUNTERS = ("runtime_total", "moisture_removed_total", "cycles_total")
+
+
+class VentilationAccounting:
+    """Track ventilation cycles from the transitions of the live `on` value.
+
+    Runtime is counted in hours. The moisture removed is the absolute
+    humidity difference between indoor and outdoor air integrated over the
+    ventilation time in g·h/m³, multiplied with the airflow of the fan in
+    m³/h it gives the water removed in g.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the accounting."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.runtime.{entry_id}"
+        )
+        self.counters: dict[str, float] = dict.fromkeys(DAILY_COUNTERS + TOTAL_COUNTERS, 0)
+        self.day = dt_util.now().date().isoformat()
+        self.last_cycle: dict[str, float] | None = None
+        self._cycle: dict[str, float] | None = None
+        self._last_sample: tuple[float, bool, float | None] | None = None
+
+    async def async_load(self) -> None:
+        """Restore the counters."""
+        if (data := await self._store.async_load()) is None:
+            return
+        self.counters.update(data.get("counters", {}))
+        self.day = data.get("day", self.day)
+        self.last_cycle = data.get("last_cycle")
+        self._cycle = data.get("cycle")
+        if (sample := data.get("last_sample")) is not None:
+            self._last_sample = tuple(sample)  # type: ignore[assignment]
+
+    def update(self, timestamp: float, live: dict[str, Any]) -> dict[str, float] | None:
+        """Account for a live sample, returning the cycle that ended with it."""
+        on = live.get("on") == 1
+        try:
+            difference: float | None = live["abs_hum_in"] - live["abs_hum_out"]
+        except (KeyError, TypeError):
+            difference = None
+
+        today = dt_util.now().date().isoformat()
+        if today != self.day:
+            self.day = today
+            for counter in DAILY_COUNTERS:
+                self.counters[counter] = 0
+
+        if self._last_sample is not None:
+            last_time, last_on, last_difference = self._last_sample
+            elapsed = timestamp - last_time
+            if last_on and on and 0 < elapsed <= MAX_SAMPLE_GAP:
+                self._add_runtime(elapsed / 3600, last_difference, difference)
+
+        finished = None
+        if on and self._cycle is None:
+            self._cycle = {"start": timestamp, "runtime": 0.0, "moisture_removed": 0.0}
+        elif not on and self._cycle is not None:
+            finished = self.last_cycle = {
+                "duration": round(self._cycle["runtime"] * 60, 1),
+                "moisture_removed": round(self._cycle["moisture_removed"], 3),
+                "start": self._cycle["start"],
+                "end": timestamp,
+            }
+            self._cycle = None
+            self.counters["cycles_today"] += 1
+            self.counters["cycles_total"] += 1
+            _LOGGER.debug("Ventilation cycle finished: %s", finished)
+
+        self._last_sample = (timestamp, on, difference)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return finished
+
+    def _add_runtime(
+        self, hours: float, start_difference: float | None, end_difference: float | None
+    ) -> None:
+        """Add ventilation time and the moisture removed in it."""
+        differences = [value for value in (start_difference, end_difference) if value is not None]
+        moisture = hours * sum(differences) / len(differences) if differences else 0.0
+        # Outdoor air that is wetter brings moisture in, which is not removal.
+        # The counters are total_increasing and must never go down.
+        moisture = max(moisture, 0.0)
+
+        for counter in ("runtime_today", "runtime_total"):
+            self.counters[counter] += hours
+        for counter in ("moisture_removed_today", "moisture_removed_total"):
+            self.counters[counter] += moisture
+        if self._cycle is not None:
+            self._cycle["runtime"] += hours
+            self._cycle["moisture_removed"] += moisture
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for the coordinator data."""
+        data: dict[str, Any] = {
+            counter: round(value, 3) for counter, value in self.counters.items()
+        }
+        data["last_cycle"] = self.last_cycle
+        return data
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {
+            "counters": self.counters,
+            "day": self.day,
+            "last_cycle": self.last_cycle,
+            "cycle": self._cycle,
+            "last_sample": self._last_sample,
+        }
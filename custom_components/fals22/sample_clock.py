@@ -0,0 +1,189 @@
+"""Tracking of the FALS22 sample clock to poll right after device updates."""
+from __future__ import annotations
+
+from datetime import datetime
+import math
+from typing import Any
+
+# Uncertainty added to the update time for every device update predicted
+PHASE_SLACK = 0.25  # seconds
+# Probe inside the predicted window while the update time is less precise
+PROBE_WIDTH = 3.0  # seconds
+# Delay after the latest possible device update before polling
+POLL_MARGIN = 1.0  # seconds
+# Share of the configured interval a poll may come early to meet an update
+INTERVAL_TOLERANCE = 0.1
+# Shortest delay between polls
+MIN_POLL_DELAY = 2.0  # seconds
+# Device clock time between the updates the clock rate is measured from
+MIN_RATE_BASELINE = 600  # seconds
+MAX_RATE_BASELINE = 86400  # seconds
+# Collect at least this long before reporting a clock drift
+MIN_DRIFT_PERIOD = 3600  # seconds
+
+
+class DeviceSampleClock:
+    """Follow the timestamps in the live data of one device.
+
+    The device only refreshes its values periodically and stamps them with
+    its own clock. Repeated samples are recognised by their values. Every
+    device update happened after the previous poll and before the poll that
+    returned it, and the next update did not happen before any poll that
+    still returns the current one. This window, moved forward by the
+    cadence, predicts the next update and polls are scheduled just after
+    it. The cadence is the smallest step of the device timestamps scaled by
+    the rate of the device clock, which is measured between precisely timed
+    updates that are far apart. All times passed in are monotonic seconds.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the sample clock."""
+        self.repeated_samples = 0
+        self._live: dict[str, Any] | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget everything learned about the device clock."""
+        self.device_time: datetime | None = None
+        self.clock_offset: float | None = None
+        self.clock_drift: float | None = None
+        self._step: float | None = None
+        self._last_poll: float | None = None
+        # Window (earliest, latest] in which the update of device_time happened
+        self._earliest = -math.inf
+        self._latest = math.inf
+        # Seconds passing per second of the device clock
+        self._rate = 1.0
+        self._rate_anchor: tuple[datetime, float] | None = None
+        self._offset_reference: tuple[float, float] | None = None
+
+    def observe(
+        self,
+        device_time: datetime | None,
+        live: dict[str, Any],
+        now: float,
+        local_now: datetime,
+    ) -> bool:
+        """Record a live sample, returning False if it repeats the previous one."""
+        is_new = live != self._live
+        self._live = live
+        if not is_new:
+            self.repeated_samples += 1
+
+        previous_poll, self._last_poll = self._last_poll, now
+        if device_time is None:
+            return is_new
+
+        if self.device_time is not None and device_time < self.device_time:
+            # The device clock was set back
+            self._reset()
+            self._last_poll = now
+        if device_time != self.device_time:
+            self._start_update(device_time, previous_poll, now)
+            self._update_offset(local_now.replace(tzinfo=None), now)
+        elif (cadence := self.cadence) is not None:
+            # The next update has not happened yet
+            self._earliest = max(self._earliest, now - cadence)
+            if self._earliest >= self._latest:
+                # The device is late, only keep what this poll tells
+                self._earliest, self._latest = now - cadence, now
+        return is_new
+
+    @property
+    def cadence(self) -> float | None:
+        """Return the seconds between device updates."""
+        return None if self._step is None else self._step * self._rate
+
+    def _start_update(
+        self, device_time: datetime, previous_poll: float | None, now: float
+    ) -> None:
+        """Track a new device update seen between the previous poll and now."""
+        earliest = -math.inf if previous_poll is None else previous_poll
+        latest = now
+
+        if self.device_time is not None:
+            step = (device_time - self.device_time).total_seconds()
+            if self._step is None or step < self._step:
+                self._step = step
+            if not math.isinf(self._earliest):
+                # Narrow the window by the prediction if both agree
+                shift = step * self._rate
+                slack = PHASE_SLACK * max(1, round(step / self._step))
+                predicted_earliest = self._earliest + shift - slack
+                predicted_latest = self._latest + shift + slack
+                if max(earliest, predicted_earliest) < min(latest, predicted_latest):
+                    earliest = max(earliest, predicted_earliest)
+                    latest = min(latest, predicted_latest)
+            self._measure_rate(device_time, earliest, latest)
+
+        self.device_time = device_time
+        self._earliest, self._latest = earliest, latest
+
+    def _measure_rate(self, device_time: datetime, earliest: float, latest: float) -> None:
+        """Measure the device clock rate from updates whose time is known precisely."""
+        if latest - earliest > PROBE_WIDTH:
+            return
+        middle = (earliest + latest) / 2
+        if self._rate_anchor is None:
+            self._rate_anchor = (device_time, middle)
+            return
+        anchor_time, anchor_middle = self._rate_anchor
+        device_seconds = (device_time - anchor_time).total_seconds()
+        if device_seconds >= MIN_RATE_BASELINE:
+            self._rate = (middle - anchor_middle) / device_seconds
+        if device_seconds >= MAX_RATE_BASELINE:
+            self._rate_anchor = (device_time, middle)
+
+    def _update_offset(self, local_now: datetime, now: float) -> None:
+        """Update the offset of the device clock and its drift."""
+        if self.device_time is None or self._latest - self._earliest > PROBE_WIDTH:
+            return
+        # The device timestamp is exact at the moment the device updated
+        age = now - (self._earliest + self._latest) / 2
+        self.clock_offset = round((self.device_time - local_now).total_seconds() + age, 1)
+        if self._offset_reference is None:
+            self._offset_reference = (now, self.clock_offset)
+            return
+        reference_time, reference_offset = self._offset_reference
+        if (elapsed := now - reference_time) >= MIN_DRIFT_PERIOD:
+            self.clock_drift = round(
+                (self.clock_offset - reference_offset) * 86400 / elapsed, 1
+            )
+
+    def next_poll_delay(self, now: float, interval: float) -> float:
+        """Return the delay until the next poll for the configured interval.
+
+        Polls land just after an expected device update, but not much
+        earlier than the configured interval allows and never later than
+        the interval plus one device cadence.
+        """
+        cadence = self.cadence
+        if cadence is None or cadence <= 0 or math.isinf(self._earliest):
+            return interval
+
+        # First update window that ends after the configured interval
+        earliest_poll = now + interval * (1 - INTERVAL_TOLERANCE)
+        updates = max(1, math.ceil((earliest_poll - self._latest) / cadence))
+        start = self._earliest + updates * cadence
+        end = self._latest + updates * cadence
+
+        middle = start + (end - start) / 2
+        if end - start > PROBE_WIDTH and (
+            middle > earliest_poll
+            # Probing costs an extra poll when polling about as often as the device updates
+            or (middle > now and interval <= cadence * (1 + INTERVAL_TOLERANCE))
+        ):
+            # Halve the window, the poll lands either before or after the update
+            target = middle
+        else:
+            target = end + POLL_MARGIN
+        return min(max(target - now, MIN_POLL_DELAY), interval + cadence)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the clock diagnostics for the coordinator data."""
+        return {
+            "sample_interval": None if self.cadence is None else round(self.cadence, 1),
+            "clock_offset": self.clock_offset,
+            "clock_drift": self.clock_drift,
+            "repeated_samples": self.repeated_samples,
+        }
@@ -0,0 +1,311 @@
+"""In-memory history of FALS22 live samples with rolling statistics."""
+from __future__ import annotations
+
+import base64
+from array import array
+from collections import deque
+import logging
+import math
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    HISTORY_FIELDS,
+    STATISTIC_WINDOWS,
+    TREND_MIN_SAMPLES,
+    TREND_SENSOR_TYPES,
+    TREND_WINDOW,
+)
+from .psychrometrics import as_float
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 600
+
+# Recompute the regression sums around a new origin once the time offsets
+# grow this many windows large, to keep the sums numerically stable
+REBASE_WINDOWS = 8
+
+NAN = float("nan")
+
+
+def history_depth(depth: int, scan_interval: float) -> int:
+    """Return the samples to keep, at least enough for the longest window."""
+    return max(depth, math.ceil(max(STATISTIC_WINDOWS.values()) / scan_interval))
+
+
+def _as_float(value: Any) -> float:
+    """Return a live value as float, NaN if it is missing or not a number."""
+    number = as_float(value)
+    return NAN if number is None else number
+
+
+class _Window:
+    """Time window over the newest samples of one field of a SampleHistory.
+
+    The window only keeps sequence numbers into the ring buffer, samples
+    enter and leave it exactly once so every update is amortised O(1).
+    """
+
+    __slots__ = ("_times", "_values", "_depth", "span", "_start", "_end")
+
+    def __init__(self, history: SampleHistory, field: str, span: float) -> None:
+        """Initialize the window."""
+        self._times = history.times
+        self._values = history.values[field]
+        self._depth = history.depth
+        self.span = span
+        self._start = self._end = history.next_seq
+
+    def evict(self, now: float, min_seq: int) -> None:
+        """Remove samples older than the span or about to be overwritten."""
+        cutoff = now - self.span
+        while self._start < self._end:
+            index = self._start % self._depth
+            if self._start >= min_seq and self._times[index] >= cutoff:
+                break
+            value = self._values[index]
+            if not math.isnan(value):
+                self._remove(self._start, self._times[index], value)
+            self._start += 1
+
+    def push(self, seq: int) -> None:
+        """Add the sample that was just stored under the sequence number."""
+        index = seq % self._depth
+        value = self._values[index]
+        if not math.isnan(value):
+            self._add(seq, self._times[index], value)
+        self._end = seq + 1
+
+    def _value(self, seq: int) -> float:
+        """Return the stored value of a sequence number."""
+        return self._values[seq % self._depth]
+
+    def _add(self, seq: int, timestamp: float, value: float) -> None:
+        """Account for a sample entering the window."""
+        raise NotImplementedError
+
+    def _remove(self, seq: int, timestamp: float, value: float) -> None:
+        """Account for a sample leaving the window."""
+        raise NotImplementedError
+
+
+class RollingStats(_Window):
+    """Rolling minimum, maximum and mean over a time window."""
+
+    __slots__ = ("count", "_sum", "_min", "_max")
+
+    def __init__(self, history: SampleHistory, field: str, span: float) -> None:
+        """Initialize the statistics."""
+        super().__init__(history, field, span)
+        self.count = 0
+        self._sum = 0.0
+        # Monotonic queues of sequence numbers, the extreme value is in front
+        self._min: deque[int] = deque()
+        self._max: deque[int] = deque()
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the window."""
+        return self._sum / self.count if self.count else None
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the minimum of the window."""
+        return self._value(self._min[0]) if self._min else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the maximum of the window."""
+        return self._value(self._max[0]) if self._max else None
+
+    def _add(self, seq: int, timestamp: float, value: float) -> None:
+        """Account for a sample entering the window."""
+        self.count += 1
+        self._sum += value
+        while self._min and self._value(self._min[-1]) >= value:
+            self._min.pop()
+        self._min.append(seq)
+        while self._max and self._value(self._max[-1]) <= value:
+            self._max.pop()
+        self._max.append(seq)
+
+    def _remove(self, seq: int, timestamp: float, value: float) -> None:
+        """Account for a sample leaving the window."""
+        self.count -= 1
+        self._sum = self._sum - value if self.count else 0.0
+        if self._min and self._min[0] == seq:
+            self._min.popleft()
+        if self._max and self._max[0] == seq:
+            self._max.popleft()
+
+
+class RollingTrend(_Window):
+    """Least squares slope over a time window, updated incrementally."""
+
+    __slots__ = ("count", "_origin", "_sx", "_sy", "_sxx", "_sxy")
+
+    def __init__(self, history: SampleHistory, field: str, span: float) -> None:
+        """Initialize the trend."""
+        super().__init__(history, field, span)
+        self.count = 0
+        self._origin = 0.0
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
+
+    @property
+    def slope(self) -> float | None:
+        """Return the slope of the regression line per second."""
+        if self.count < TREND_MIN_SAMPLES:
+            return None
+        denominator = self.count * self._sxx - self._sx * self._sx
+        if denominator <= 0:
+            return None
+        return (self.count * self._sxy - self._sx * self._sy) / denominator
+
+    def _add(self, seq: int, timestamp: float, value: float) -> None:
+        """Account for a sample entering the window."""
+        if not self.count:
+            self._origin = timestamp
+        elif timestamp - self._origin > REBASE_WINDOWS * self.span:
+            self._rebase(timestamp)
+        offset = timestamp - self._origin
+        self.count += 1
+        self._sx += offset
+        self._sy += value
+        self._sxx += offset * offset
+        self._sxy += offset * value
+
+    def _remove(self, seq: int, timestamp: float, value: float) -> None:
+        """Account for a sample leaving the window."""
+        self.count -= 1
+        if not self.count:
+            self._sx = self._sy = self._sxx = self._sxy = 0.0
+            return
+        offset = timestamp - self._origin
+        self._sx -= offset
+        self._sy -= value
+        self._sxx -= offset * offset
+        self._sxy -= offset * value
+
+    def _rebase(self, origin: float) -> None:
+        """Recompute the sums of the samples in the window around a new origin."""
+        self._origin = origin
+        self.count = 0
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
+        for seq in range(self._start, self._end):
+            index = seq % self._depth
+            value = self._values[index]
+            if not math.isnan(value):
+                self._add(seq, self._times[index], value)
+
+
+class SampleHistory:
+    """Array-backed ring buffer of recent live samples of one device."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, depth: int) -> None:
+        """Initialize the history."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.history.{entry_id}"
+        )
+        self._reset(depth)
+
+    def _reset(self, depth: int) -> None:
+        """Create empty buffers and windows."""
+        self.depth = depth
+        self.next_seq = 0
+        self.times = array("d", [NAN]) * depth
+        self.values = {field: array("f", [NAN]) * depth for field in HISTORY_FIELDS}
+        self.stats = {
+            (field, window): RollingStats(self, field, span)
+            for field in HISTORY_FIELDS
+            for window, span in STATISTIC_WINDOWS.items()
+        }
+        self.trends = {
+            description.field: RollingTrend(self, description.field, TREND_WINDOW)
+            for description in TREND_SENSOR_TYPES
+        }
+        self._windows: list[_Window] = [*self.stats.values(), *self.trends.values()]
+
+    def add(self, timestamp: float, live: dict[str, Any]) -> None:
+        """Store a live sample and update the rolling windows."""
+        sample = {field: _as_float(live.get(field)) for field in HISTORY_FIELDS}
+        self._append(timestamp, sample)
+        self._store.async_delay_save(self._snapshot, SAVE_DELAY)
+
+    def samples(self) -> list[tuple[float, dict[str, float]]]:
+        """Return the stored samples from oldest to newest."""
+        first = max(0, self.next_seq - self.depth)
+        return [
+            (
+                self.times[seq % self.depth],
+                {field: values[seq % self.depth] for field, values in self.values.items()},
+            )
+            for seq in range(first, self.next_seq)
+        ]
+
+    def resize(self, depth: int) -> None:
+        """Change the number of stored samples, keeping the newest ones."""
+        if depth == self.depth:
+            return
+        samples = self.samples()
+        self._reset(depth)
+        for timestamp, sample in samples[-depth:]:
+            self._append(timestamp, sample)
+
+    async def async_load(self) -> None:
+        """Restore the samples from the last snapshot."""
+        if (data := await self._store.async_load()) is None:
+            return
+        try:
+            times = array("d", base64.b64decode(data["times"]))
+            columns = {}
+            for field in HISTORY_FIELDS:
+                columns[field] = array("f", base64.b64decode(data["fields"][field]))
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Discarding invalid sample history snapshot: %s", err)
+            return
+        if any(len(column) != len(times) for column in columns.values()):
+            _LOGGER.warning("Discarding inconsistent sample history snapshot")
+            return
+
+        first = max(0, len(times) - self.depth)
+        for position in range(first, len(times)):
+            self._append(
+                times[position],
+                {field: column[position] for field, column in columns.items()},
+            )
+
+    def _append(self, timestamp: float, sample: dict[str, float]) -> None:
+        """Write a sample into the ring buffer and move the windows."""
+        seq = self.next_seq
+        for window in self._windows:
+            window.evict(timestamp, seq + 1 - self.depth)
+
+        index = seq % self.depth
+        self.times[index] = timestamp
+        for field, values in self.values.items():
+            values[index] = sample[field]
+        self.next_seq = seq + 1
+
+        for window in self._windows:
+            window.push(seq)
+
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the samples as a compact binary snapshot."""
+        split = self.next_seq % self.depth
+
+        def ordered(column: array) -> str:
+            if self.next_seq < self.depth:
+                data = column[:self.next_seq]
+            else:
+                data = column[split:] + column[:split]
+            return base64.b64encode(data.tobytes()).decode()
+
+        return {
+            "times": ordered(self.times),
+            "fields": {field: ordered(values) for field, values in self.values.items()},
+        }
@@ -6,13 +6,29 @@ from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, SENSOR_TYPES
-from .device_helper import get_device_info, get_entity_name_prefix
+from .const import (
+    CONF_ENTRY_TYPE,
+    DATA_FLEET,
+    DOMAIN,
+    ENTRY_TYPE_FLEET,
+    FLEET_MODEL,
+    FLEET_SENSOR_TYPES,
+    MANUFACTURER,
+    SENSOR_TYPES,
+    STATISTIC_SENSOR_TYPES,
+    TREND_SENSOR_TYPES,
+    FALS22FleetSensorEntityDescription,
+    FALS22SensorEntityDescription,
+    FALS22StatisticSensorEntityDescription,
+    FALS22TrendSensorEntityDescription,
+)
+from .entity import FALS22Entity
+from .fleet import FleetAggregator
+from .sample_history import RollingStats
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,92 +39,139 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up FALS22 sensors from a config entry."""
+    if config_entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_FLEET:
+        aggregator = hass.data[DATA_FLEET][config_entry.entry_id]
+        async_add_entities(
+            FALS22FleetSensor(aggregator, config_entry, description)
+            for description in FLEET_SENSOR_TYPES
+        )
+        return
+
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    sensors = []
-    for sensor_type, sensor_config in SENSOR_TYPES.items():
-        sensors.append(FALS22Sensor(coordinator, config_entry, sensor_type, sensor_config))
+    sensors: list[SensorEntity] = [
+        FALS22Sensor(coordinator, description) for description in SENSOR_TYPES
+    ]
+    sensors.extend(
+        FALS22StatisticSensor(coordinator, description) for description in STATISTIC_SENSOR_TYPES
+    )
+    sensors.extend(
+        FALS22TrendSensor(coordinator, description) for description in TREND_SENSOR_TYPES
+    )
 
     async_add_entities(sensors)
 
 
-class FALS22Sensor(CoordinatorEntity, SensorEntity):
+class FALS22Sensor(FALS22Entity, SensorEntity):
     """Representation of a FALS22 sensor."""
 
-    _attr_has_entity_name = True
+    entity_description: FALS22SensorEntityDescription
 
-    def __init__(
-        self,
-        coordinator,
-        config_entry: ConfigEntry,
-        sensor_type: str,
-        sensor_config: dict[str, Any],
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._config_entry = config_entry
-        self._sensor_type = sensor_type
-        self._sensor_config = sensor_config
-        
-        # Generate entity ID based on device name
-        entity_prefix = get_entity_name_prefix(config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_{sensor_type}"
-        
-        # Set translation key for localization
-        if "translation_key" in sensor_config:
-            self._attr_translation_key = sensor_config["translation_key"]
-        
-        # Set sensor properties
-        if "native_unit_of_measurement" in sensor_config:
-            self._attr_native_unit_of_measurement = sensor_config["native_unit_of_measurement"]
-        if "device_class" in sensor_config:
-            self._attr_device_class = sensor_config["device_class"]
-        if "state_class" in sensor_config:
-            self._attr_state_class = sensor_config["state_class"]
-        if "icon" in sensor_config:
-            self._attr_icon = sensor_config["icon"]
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator.data)
 
     @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info."""
-        return get_device_info(self._config_entry)
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return additional state attributes."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator.data)
+
+
+class FALS22StatisticSensor(FALS22Entity, SensorEntity):
+    """Rolling mean of a live value from the coordinator's sample history."""
+
+    entity_description: FALS22StatisticSensorEntityDescription
 
     @property
-    def native_value(self) -> Any:
-        """Return the state of the sensor."""
-        data_key = self._sensor_config["data_key"]
-        data = self.coordinator.data.get(data_key, {})
-        
-        if not data:
+    def native_value(self) -> float | None:
+        """Return the rolling mean."""
+        mean = self._stats.mean
+        return None if mean is None else round(mean, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the rolling minimum and maximum."""
+        stats = self._stats
+        if not stats.count:
             return None
-            
-        value = data.get(self._sensor_type)
-        
-        # Handle special cases
-        if self._sensor_type == "message" and isinstance(value, str):
-            # Clean up message text
-            return value.strip()
-        
-        return value
+        return {
+            "min": round(stats.minimum, 2),
+            "max": round(stats.maximum, 2),
+            "samples": stats.count,
+        }
 
     @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
+    def _stats(self) -> RollingStats:
+        """Return the rolling statistic of this sensor."""
+        description = self.entity_description
+        return self.coordinator.history.stats[(description.field, description.window)]
+
+
+class FALS22TrendSensor(FALS22Entity, SensorEntity):
+    """Hourly rate of change of a live value from a sliding regression."""
+
+    entity_description: FALS22TrendSensorEntityDescription
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the rate of change per hour."""
+        slope = self.coordinator.history.trends[self.entity_description.field].slope
+        return None if slope is None else round(slope * 3600, 3)
+
+
+class FALS22FleetSensor(SensorEntity):
+    """Aggregate over the units of a fleet entry."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    entity_description: FALS22FleetSensorEntityDescription
+
+    def __init__(
+        self,
+        aggregator: FleetAggregator,
+        config_entry: ConfigEntry,
+        description: FALS22FleetSensorEntityDescription,
+    ) -> None:
+        """Initialize the fleet sensor."""
+        self._aggregator = aggregator
+        self.entity_description = description
+
+        self._attr_unique_id = f"{config_entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name=config_entry.title,
+            manufacturer=MANUFACTURER,
+            model=FLEET_MODEL,
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the aggregates."""
+        self.async_on_remove(self._aggregator.async_add_listener(self._handle_update))
+        self._attr_native_value = self._value()
+
+    @callback
+    def _handle_update(self) -> None:
+        """Write the state if the aggregate of this sensor changed."""
+        value = self._value()
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
+
+    def _value(self) -> Any:
+        """Return the current aggregate."""
+        return self.entity_description.value_fn(self._aggregator)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
         """Return additional state attributes."""
-        if self._sensor_type == "temp_in":
-            # Add datetime info for the main temperature sensor
-            live_data = self.coordinator.data.get("live", {})
-            if live_data:
-                return {
-                    "last_update": f"{live_data.get('day', 0):02d}.{live_data.get('month', 0):02d}.{live_data.get('year', 0)} {live_data.get('hours', 0):02d}:{live_data.get('minutes', 0):02d}",
-                    "working_hours_from": f"{self.coordinator.data.get('settings', {}).get('working_hours_from', 0):02d}:{self.coordinator.data.get('settings', {}).get('working_minutes_from', 0):02d}",
-                    "working_hours_to": f"{self.coordinator.data.get('settings', {}).get('working_hours_to', 0):02d}:{self.coordinator.data.get('settings', {}).get('working_minutes_to', 0):02d}",
-                }
-        return None
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self._aggregator)
 
 
 # End of sensor.py
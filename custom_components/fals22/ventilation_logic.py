@@ -0,0 +1,122 @@
+"""Local evaluation of the FALS22 ventilation decision."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from .psychrometrics import as_float, dewpoints
+
+# Reasons that keep the device from ventilating
+REASON_OUTSIDE_WORKING_HOURS = "outside_working_hours"
+REASON_INDOOR_TOO_COLD = "indoor_too_cold"
+REASON_OUTDOOR_TOO_WARM = "outdoor_too_warm"
+REASON_TARGET_HUMIDITY_REACHED = "target_humidity_reached"
+REASON_OUTDOOR_TOO_HUMID = "outdoor_too_humid"
+REASON_MISSING_DATA = "missing_data"
+
+
+def in_working_window(settings: dict[str, Any], hour: int, minute: int) -> bool:
+    """Return True if the time of day is inside the configured working hours.
+
+    Equal start and end times mean the device works all day, a start after
+    the end means the window wraps around midnight.
+    """
+    start = _setting_minutes(settings, "working_hours_from", "working_minutes_from")
+    end = _setting_minutes(settings, "working_hours_to", "working_minutes_to")
+    now = hour * 60 + minute
+    if start == end:
+        return True
+    if start < end:
+        return start <= now < end
+    return now >= start or now < end
+
+
+def _setting_minutes(settings: dict[str, Any], hours_key: str, minutes_key: str) -> int:
+    """Return a time of day from the settings in minutes, missing parts count as 0."""
+    hours = as_float(settings.get(hours_key)) or 0
+    minutes = as_float(settings.get(minutes_key)) or 0
+    return int(hours * 60 + minutes)
+
+
+def seconds_until_working_window(settings: dict[str, Any], now: datetime) -> float:
+    """Return the seconds until the working hours start, 0 inside the window."""
+    if in_working_window(settings, now.hour, now.minute):
+        return 0
+    start = 60 * _setting_minutes(settings, "working_hours_from", "working_minutes_from")
+    elapsed = now.hour * 3600 + now.minute * 60 + now.second
+    return (start - elapsed) % 86400
+
+
+def device_time(live: dict[str, Any]) -> datetime | None:
+    """Return the timestamp of a live sample from the device clock."""
+    try:
+        return datetime(
+            live["year"], live["month"], live["day"], live["hours"], live["minutes"]
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def evaluate_ventilation(
+    samples: Sequence[tuple[dict[str, Any], dict[str, Any], datetime]],
+) -> list[dict[str, Any]]:
+    """Evaluate the ventilation decision for a batch of devices.
+
+    Each sample holds the live data, the settings and the local time of one
+    device. The dewpoints of all samples are calculated in one pass.
+    """
+    temperatures: list[float | None] = []
+    humidities: list[float | None] = []
+    for live, _, _ in samples:
+        temperatures += [live.get("temp_in"), live.get("temp_out")]
+        humidities += [live.get("hum_in"), live.get("hum_out")]
+    points = dewpoints(temperatures, humidities)
+
+    results = []
+    for position, (live, settings, now) in enumerate(samples):
+        reasons = _blocking_reasons(live, settings, now)
+        dewpoint_in, dewpoint_out = points[2 * position], points[2 * position + 1]
+        results.append(
+            {
+                "dewpoint_in": None if dewpoint_in is None else round(dewpoint_in, 1),
+                "dewpoint_out": None if dewpoint_out is None else round(dewpoint_out, 1),
+                "ventilation_allowed": (
+                    None if REASON_MISSING_DATA in reasons else not reasons
+                ),
+                "ventilation_blockers": reasons,
+            }
+        )
+    return results
+
+
+def _blocking_reasons(
+    live: dict[str, Any], settings: dict[str, Any], now: datetime
+) -> list[str]:
+    """Return the reasons why the device should not ventilate."""
+    # Values the device could not measure are reported as "" or "--"
+    values = [
+        as_float(live.get(key))
+        for key in ("temp_in", "temp_out", "hum_in", "abs_hum_in", "abs_hum_out")
+    ]
+    limits = [
+        as_float(settings.get(key))
+        for key in ("min_temp", "max_temp", "min_hum", "difference")
+    ]
+    if None in values or None in limits:
+        return [REASON_MISSING_DATA]
+    temp_in, temp_out, hum_in, abs_hum_in, abs_hum_out = values
+    min_temp, max_temp, min_hum, difference = limits
+
+    reasons = []
+    if not in_working_window(settings, now.hour, now.minute):
+        reasons.append(REASON_OUTSIDE_WORKING_HOURS)
+    if temp_in < min_temp:
+        reasons.append(REASON_INDOOR_TOO_COLD)
+    if temp_out > max_temp:
+        reasons.append(REASON_OUTDOOR_TOO_WARM)
+    if hum_in <= min_hum:
+        reasons.append(REASON_TARGET_HUMIDITY_REACHED)
+    if abs_hum_in - abs_hum_out < difference:
+        reasons.append(REASON_OUTDOOR_TOO_HUMID)
+    return reasons
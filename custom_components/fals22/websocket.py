@@ -0,0 +1,215 @@
+"""WebSocket subscription streaming the data of all FALS22 devices."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, SIGNAL_UNITS_CHANGED
+
+if TYPE_CHECKING:
+    from . import FALS22DataUpdateCoordinator
+
+# Coordinator data streamed to subscribers
+DATA_SECTIONS = ["live", "settings", "derived", "runtime", "clock", "export"]
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "fals22/subscribe",
+        vol.Optional("throttle", default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=3600)
+        ),
+        vol.Optional("config_entry_ids"): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream a snapshot of all units followed by the fields that changed."""
+    subscription = _Subscription(
+        hass, connection, msg["id"], msg["throttle"], msg.get("config_entry_ids")
+    )
+    connection.subscriptions[msg["id"]] = subscription.async_unsubscribe
+    connection.send_result(msg["id"])
+    subscription.async_start()
+
+
+def unit_state(coordinator: FALS22DataUpdateCoordinator) -> dict[str, Any]:
+    """Return the streamed state of a unit."""
+    data = coordinator.data or {}
+    state: dict[str, Any] = {"available": coordinator.last_update_success}
+    for section in DATA_SECTIONS:
+        if isinstance(values := data.get(section), dict):
+            state[section] = dict(values)
+    return state
+
+
+def state_delta(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """Return the fields of new that differ from old, removed fields as None."""
+    delta: dict[str, Any] = {}
+    if old.get("available") != new["available"]:
+        delta["available"] = new["available"]
+    for section in DATA_SECTIONS:
+        old_values = old.get(section, {})
+        new_values = new.get(section, {})
+        changed = {
+            key: value
+            for key, value in new_values.items()
+            if key not in old_values or old_values[key] != value
+        }
+        changed.update({key: None for key in old_values if key not in new_values})
+        if changed:
+            delta[section] = changed
+    return delta
+
+
+class _Subscription:
+    """One websocket subscription to the units.
+
+    Coordinator updates only mark their unit as changed. Messages are sent
+    at most once per throttle interval and carry, per unit, the fields that
+    differ from what this subscriber received last, so several updates in
+    one interval collapse into one message.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        throttle: float,
+        entry_ids: list[str] | None,
+    ) -> None:
+        """Initialize the subscription."""
+        self.hass = hass
+        self.connection = connection
+        self.msg_id = msg_id
+        self.throttle = throttle
+        self.entry_ids = set(entry_ids) if entry_ids is not None else None
+        # Unit state as last sent to the subscriber
+        self._sent: dict[str, dict[str, Any]] = {}
+        self._changed: set[str] = set()
+        self._last_send: float | None = None
+        self._unsub_listeners: dict[str, CALLBACK_TYPE] = {}
+        self._unsub_units: CALLBACK_TYPE | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Send the snapshot and start following the units."""
+        self._unsub_units = async_dispatcher_connect(
+            self.hass, SIGNAL_UNITS_CHANGED, self._async_units_changed
+        )
+        self._async_units_changed()
+
+    @callback
+    def async_unsubscribe(self) -> None:
+        """Stop following the units."""
+        if self._unsub_units is not None:
+            self._unsub_units()
+            self._unsub_units = None
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        for unsub in self._unsub_listeners.values():
+            unsub()
+        self._unsub_listeners.clear()
+
+    @callback
+    def _async_units_changed(self) -> None:
+        """Send the full state of new units and the ids of removed ones."""
+        coordinators: dict[str, FALS22DataUpdateCoordinator] = self.hass.data.get(DOMAIN, {})
+        units = {}
+        for entry_id, coordinator in coordinators.items():
+            if entry_id in self._unsub_listeners or (
+                self.entry_ids is not None and entry_id not in self.entry_ids
+            ):
+                continue
+            self._unsub_listeners[entry_id] = coordinator.async_add_listener(
+                self._listener(entry_id)
+            )
+            state = unit_state(coordinator)
+            self._sent[entry_id] = state
+            units[entry_id] = {
+                "name": coordinator.entry.title,
+                "host": coordinator.host,
+                **state,
+            }
+
+        removed = [entry_id for entry_id in self._unsub_listeners if entry_id not in coordinators]
+        for entry_id in removed:
+            self._unsub_listeners.pop(entry_id)()
+            self._sent.pop(entry_id, None)
+            self._changed.discard(entry_id)
+
+        if units or removed or self._last_send is None:
+            event: dict[str, Any] = {"units": units}
+            if removed:
+                event["removed"] = removed
+            self._last_send = self.hass.loop.time()
+            self.connection.send_message(websocket_api.event_message(self.msg_id, event))
+
+    def _listener(self, entry_id: str) -> CALLBACK_TYPE:
+        """Return the coordinator listener of a unit."""
+
+        @callback
+        def _async_updated() -> None:
+            self._changed.add(entry_id)
+            self._async_schedule()
+
+        return _async_updated
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Send the changes now or when the throttle interval ends."""
+        if self._unsub_timer is not None:
+            return
+        now = self.hass.loop.time()
+        if self._last_send is None or now - self._last_send >= self.throttle:
+            self._async_send_changes()
+            return
+        self._unsub_timer = async_call_later(
+            self.hass, self._last_send + self.throttle - now, self._async_throttle_ended
+        )
+
+    @callback
+    def _async_throttle_ended(self, _now: Any) -> None:
+        """Send the changes collected during the throttle interval."""
+        self._unsub_timer = None
+        self._async_send_changes()
+
+    @callback
+    def _async_send_changes(self) -> None:
+        """Send the fields of the changed units that differ from the last message."""
+        coordinators: dict[str, FALS22DataUpdateCoordinator] = self.hass.data.get(DOMAIN, {})
+        changes = {}
+        for entry_id in self._changed:
+            if (coordinator := coordinators.get(entry_id)) is None:
+                continue
+            state = unit_state(coordinator)
+            if delta := state_delta(self._sent.get(entry_id, {}), state):
+                changes[entry_id] = delta
+                self._sent[entry_id] = state
+        self._changed.clear()
+        if not changes:
+            return
+        self._last_send = self.hass.loop.time()
+        self.connection.send_message(
+            websocket_api.event_message(self.msg_id, {"changes": changes})
+        )
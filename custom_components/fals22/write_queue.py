@@ -0,0 +1,134 @@
+"""Persistent queue for FALS22 writes that could not be delivered."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+
+class FALS22WriteQueue:
+    """Queue of pending setting and manual mode writes for one device.
+
+    Later values for a setting replace earlier ones, so replaying the queue
+    always results in a single settings request with the newest values.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, max_age: int) -> None:
+        """Initialize the write queue."""
+        self.max_age = max_age
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.write_queue.{entry_id}"
+        )
+        # setting -> {"value": ..., "queued": timestamp}
+        self._settings: dict[str, dict[str, Any]] = {}
+        # {"duration": ..., "on": ..., "queued": timestamp}
+        self._manual: dict[str, Any] | None = None
+
+    def __bool__(self) -> bool:
+        """Return True if writes that have not expired are pending."""
+        return bool(self.pending_settings()) or self.pending_manual() is not None
+
+    async def async_load(self) -> None:
+        """Load pending writes from storage."""
+        if (data := await self._store.async_load()) is None:
+            return
+        self._settings = data.get("settings", {})
+        self._manual = data.get("manual")
+        self.drop_expired()
+
+    def queue_settings(self, settings: dict[str, Any]) -> None:
+        """Queue settings, replacing earlier values for the same fields."""
+        now = time.time()
+        for key, value in settings.items():
+            self._settings[key] = {"value": value, "queued": now}
+        self._async_schedule_save()
+
+    def queue_manual(self, duration: int, turn_on: bool) -> None:
+        """Queue a manual mode request, replacing an earlier one."""
+        self._manual = {"duration": duration, "on": turn_on, "queued": time.time()}
+        self._async_schedule_save()
+
+    def pending_settings(self) -> dict[str, Any]:
+        """Return the queued settings that have not expired."""
+        cutoff = time.time() - self.max_age
+        return {
+            key: item["value"]
+            for key, item in self._settings.items()
+            if item["queued"] >= cutoff
+        }
+
+    def pending_manual(self) -> tuple[int, bool] | None:
+        """Return the queued manual mode request with its remaining duration."""
+        now = time.time()
+        if self._manual is None or self._manual["queued"] < now - self.max_age:
+            return None
+        if not self._manual["on"]:
+            return self._manual["duration"], False
+
+        # Only run the fan for the part of the duration that is left
+        elapsed = int((now - self._manual["queued"]) // 60)
+        remaining = self._manual["duration"] - elapsed
+        if remaining <= 0:
+            return None
+        return remaining, True
+
+    def clear_settings(self, settings: dict[str, Any]) -> None:
+        """Remove replayed settings unless they were replaced meanwhile."""
+        for key, value in settings.items():
+            if key in self._settings and self._settings[key]["value"] == value:
+                del self._settings[key]
+        self._async_schedule_save()
+
+    def drop_settings(self, keys: Iterable[str]) -> None:
+        """Remove queued settings that were written directly in the meantime."""
+        if dropped := [key for key in keys if self._settings.pop(key, None) is not None]:
+            _LOGGER.debug("Dropping pending writes replaced by a direct write: %s", dropped)
+            self._async_schedule_save()
+
+    def clear_manual(self) -> None:
+        """Remove the queued manual mode request."""
+        self._manual = None
+        self._async_schedule_save()
+
+    def as_attributes(self) -> dict[str, Any]:
+        """Return the pending writes for state attributes."""
+        pending: dict[str, Any] = dict(self.pending_settings())
+        if (manual := self.pending_manual()) is not None:
+            pending["manual_duration"], pending["manual_on"] = manual
+        return pending
+
+    def drop_expired(self) -> None:
+        """Remove writes that are older than the maximum age from storage.
+
+        A manual mode request also expires once its duration ran out.
+        """
+        cutoff = time.time() - self.max_age
+        expired = [key for key, item in self._settings.items() if item["queued"] < cutoff]
+        for key in expired:
+            _LOGGER.warning("Dropping expired pending write %s", key)
+            del self._settings[key]
+        if self._manual is not None and self.pending_manual() is None:
+            _LOGGER.warning("Dropping expired pending manual mode request")
+            self._manual = None
+            expired.append("manual")
+        if expired:
+            self._async_schedule_save()
+
+    def _async_schedule_save(self) -> None:
+        """Schedule saving the queue."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {"settings": self._settings, "manual": self._manual}
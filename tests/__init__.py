@@ -0,0 +1 @@
+"""Tests for the FaLs22 integration."""
@@ -0,0 +1,77 @@
+"""Fixtures for FaLs22 tests."""
+from collections.abc import AsyncGenerator
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.fals22.client import FALS22Client
+from custom_components.fals22.const import DOMAIN
+
+LIVE = {
+    "temp_in": 15.0,
+    "temp_out": 8.0,
+    "hum_in": 70.0,
+    "hum_out": 80.0,
+    "abs_hum_in": 9.0,
+    "abs_hum_out": 6.8,
+    "on": 0,
+    "operating_hours": 1234,
+    "year": 2024,
+    "month": 3,
+    "day": 1,
+    "hours": 12,
+    "minutes": 0,
+}
+SETTINGS = {
+    "min_temp": 10,
+    "max_temp": 30,
+    "ventilation": 20,
+    "break": 10,
+    "min_hum": 55,
+    "difference": 1.5,
+    "working_hours_from": 6,
+    "working_minutes_from": 0,
+    "working_hours_to": 22,
+    "working_minutes_to": 0,
+    "code": 0,
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components in all tests."""
+    yield
+
+
+@pytest.fixture
+async def client() -> AsyncGenerator[type[FALS22Client], None]:
+    """Patch the requests of the client, answering with LIVE and SETTINGS."""
+    with patch.multiple(
+        FALS22Client,
+        get_live=AsyncMock(side_effect=lambda *args: dict(LIVE)),
+        get_settings=AsyncMock(side_effect=lambda *args: dict(SETTINGS)),
+        post_settings=AsyncMock(return_value=True),
+        post_manual=AsyncMock(return_value=True),
+    ):
+        yield FALS22Client
+
+
+@pytest.fixture
+async def init_integration(
+    hass: HomeAssistant, client: type[FALS22Client]
+) -> MockConfigEntry:
+    """Set up a unit answered by the patched client."""
+    assert await async_setup_component(hass, "http", {})
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="FaLs22 192.0.2.1",
+        data={"host": "192.0.2.1"},
+        unique_id="192.0.2.1",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
@@ -0,0 +1,268 @@
+"""Tests for the FaLs22 client."""
+import asyncio
+import time
+from typing import Any
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+from yarl import URL
+
+from custom_components.fals22.client import (
+    HEDGE_RATIO,
+    MIN_ATTEMPT_TIME,
+    MIN_LATENCY_SAMPLES,
+    RETRY_BACKOFF,
+    CannotConnect,
+    DeviceAddress,
+    FALS22Client,
+    InvalidAuth,
+    InvalidData,
+    is_fals22_live_data,
+)
+
+HOST = "192.0.2.1"
+LIVE = {"temp_in": 15.0, "temp_out": 8.0, "hum_in": 70.0, "hum_out": 80.0}
+
+
+@pytest.fixture
+async def session(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker):
+    """Return a session answered by the aiohttp mocker."""
+    session = aioclient_mock.create_session(hass.loop)
+    yield session
+    await session.close()
+
+
+async def test_get_live(
+    session: aiohttp.ClientSession, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """The object the unit wraps in an array is returned."""
+    aioclient_mock.get(f"http://{HOST}/data/live", json=[LIVE])
+    client = FALS22Client(session, HOST)
+
+    assert await client.get_live() == LIVE
+    assert client.host == HOST
+
+
+async def test_password_in_url(
+    session: aiohttp.ClientSession, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """The password is sent as query parameter."""
+    aioclient_mock.get(f"http://{HOST}/data/settings?pass=secret", json={"min_temp": 10})
+    client = FALS22Client(session, HOST, "secret")
+
+    assert await client.get_settings() == {"min_temp": 10}
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "error"),
+    [
+        ({"json": {"auth": False}}, InvalidAuth),
+        ({"text": "not json"}, InvalidData),
+        ({"json": []}, InvalidData),
+        ({"json": "text"}, InvalidData),
+        ({"status": 500}, CannotConnect),
+        ({"exc": aiohttp.ClientError()}, CannotConnect),
+        ({"exc": TimeoutError()}, CannotConnect),
+    ],
+)
+async def test_get_errors(
+    session: aiohttp.ClientSession,
+    aioclient_mock: AiohttpClientMocker,
+    kwargs: dict,
+    error: type[Exception],
+) -> None:
+    """Failures are raised as the errors of the client."""
+    aioclient_mock.get(f"http://{HOST}/data/live", **kwargs)
+    client = FALS22Client(session, HOST)
+
+    with pytest.raises(error):
+        await client.get_live()
+
+
+async def test_post(
+    session: aiohttp.ClientSession, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Writes report whether the unit accepted them."""
+    aioclient_mock.post(f"http://{HOST}/postsettings", status=200)
+    aioclient_mock.post(f"http://{HOST}/postmanually", status=400)
+    client = FALS22Client(session, HOST)
+
+    assert await client.post_settings({"min_temp": 10})
+    assert not await client.post_manual(30, True)
+    assert aioclient_mock.mock_calls[0][2] == {"min_temp": 10}
+    assert aioclient_mock.mock_calls[1][2] == {"duration": 30, "on": 1}
+
+
+async def test_post_error(
+    session: aiohttp.ClientSession, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """A write that does not reach the unit raises CannotConnect."""
+    aioclient_mock.post(f"http://{HOST}/postmanually", exc=aiohttp.ClientError())
+    client = FALS22Client(session, HOST)
+
+    with pytest.raises(CannotConnect):
+        await client.post_manual(30, False)
+
+
+def test_url_format() -> None:
+    """IPv6 literals are bracketed, ports are kept."""
+    assert DeviceAddress(["fe80::1"]).url("/data/live") == "http://[fe80::1]/data/live"
+    assert DeviceAddress(["[fe80::1]:8080"]).url("/data/live") == (
+        "http://[fe80::1]:8080/data/live"
+    )
+    assert DeviceAddress(["fals22.local:8080"], "pw").url("/postsettings") == (
+        "http://fals22.local:8080/postsettings?pass=pw"
+    )
+
+
+def test_is_fals22_live_data() -> None:
+    """Live data is recognised by the fields every unit reports."""
+    assert is_fals22_live_data(LIVE)
+    assert not is_fals22_live_data({"temp_in": 15.0})
+    assert not is_fals22_live_data([LIVE])
+
+
+def _response(url: URL) -> AiohttpClientMockResponse:
+    """Return a response with live data."""
+    return AiohttpClientMockResponse("get", url, json=[LIVE])
+
+
+async def test_retry(
+    session: aiohttp.ClientSession, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Connection errors are retried up to max_retries times."""
+    failures = 2
+
+    async def side_effect(method: str, url: URL, data: Any) -> AiohttpClientMockResponse:
+        nonlocal failures
+        if failures:
+            failures -= 1
+            raise aiohttp.ClientError
+        return _response(url)
+
+    aioclient_mock.get(f"http://{HOST}/data/live", side_effect=side_effect)
+    client = FALS22Client(session, HOST, max_retries=2)
+
+    assert await client.get_live(time.monotonic() + 10) == LIVE
+    assert client.retries == 2
+    assert aioclient_mock.call_count == 3
+
+
+async def test_retries_exhausted(
+    session: aiohttp.ClientSession, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """The error of the last attempt is raised."""
+    aioclient_mock.get(f"http://{HOST}/data/live", exc=aiohttp.ClientError())
+    client = FALS22Client(session, HOST, max_retries=1)
+
+    with pytest.raises(CannotConnect):
+        await client.get_live()
+    assert aioclient_mock.call_count == 2
+
+
+async def test_retry_within_deadline(
+    session: aiohttp.ClientSession, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """No retry is started that would not finish before the deadline."""
+    aioclient_mock.get(f"http://{HOST}/data/live", exc=aiohttp.ClientError())
+    client = FALS22Client(session, HOST, max_retries=10)
+
+    started = time.monotonic()
+    with pytest.raises(CannotConnect):
+        await client.get_live(started + MIN_ATTEMPT_TIME + 3 * RETRY_BACKOFF + 0.1)
+
+    # The first two pauses fit, the third does not
+    assert aioclient_mock.call_count == 3
+    assert time.monotonic() - started < MIN_ATTEMPT_TIME + 3 * RETRY_BACKOFF
+
+
+async def test_expired_deadline(
+    session: aiohttp.ClientSession, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """A request is not sent once the deadline passed."""
+    aioclient_mock.get(f"http://{HOST}/data/live", json=[LIVE])
+    client = FALS22Client(session, HOST, max_retries=3)
+
+    with pytest.raises(CannotConnect):
+        await client.get_live(time.monotonic() - 1)
+    with pytest.raises(CannotConnect):
+        await client.post_manual(30, True, time.monotonic() - 1)
+    assert aioclient_mock.call_count == 0
+
+
+async def test_hedge_budget(
+    session: aiohttp.ClientSession, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Slow reads are hedged, at most one in HEDGE_RATIO requests."""
+    slow = False
+    calls = 0
+
+    async def side_effect(method: str, url: URL, data: Any) -> AiohttpClientMockResponse:
+        nonlocal calls
+        calls += 1
+        # Only the first request of a read is slow
+        if slow and calls % 2:
+            await asyncio.sleep(0.5)
+        return _response(url)
+
+    aioclient_mock.get(f"http://{HOST}/data/live", side_effect=side_effect)
+    client = FALS22Client(session, HOST, hedging=True)
+    for _ in range(MIN_LATENCY_SAMPLES):
+        await client.get_live()
+    assert client.hedges == 0
+
+    slow = True
+    budget = int(MIN_LATENCY_SAMPLES * HEDGE_RATIO)
+    for _ in range(budget + 1):
+        calls = 0
+        started = time.monotonic()
+        assert await client.get_live() == LIVE
+        elapsed = time.monotonic() - started
+
+    assert client.hedges == budget
+    # The last read had no hedge left and waited for the slow request
+    assert elapsed >= 0.5
+
+
+async def test_race_bounded_by_timeout(
+    session: aiohttp.ClientSession, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """The address race takes no longer than the time it is given."""
+
+    async def side_effect(method: str, url: URL, data: Any) -> AiohttpClientMockResponse:
+        await asyncio.sleep(10)
+        return _response(url)
+
+    aioclient_mock.get("http://192.0.2.1/data/live", side_effect=side_effect)
+    aioclient_mock.get("http://192.0.2.2/data/live", side_effect=side_effect)
+    address = DeviceAddress(["192.0.2.1", "192.0.2.2"])
+
+    started = time.monotonic()
+    await address.async_ensure(session, 0.2)
+
+    assert time.monotonic() - started < 1
+    assert address.host == "192.0.2.1"
+
+
+async def test_race_picks_first_answer(
+    session: aiohttp.ClientSession, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """The candidate that answers first is used."""
+
+    async def slow(method: str, url: URL, data: Any) -> AiohttpClientMockResponse:
+        await asyncio.sleep(10)
+        return _response(url)
+
+    aioclient_mock.get("http://192.0.2.1/data/live", side_effect=slow)
+    aioclient_mock.get("http://192.0.2.2/data/live", json=[LIVE])
+    address = DeviceAddress(["192.0.2.1", "192.0.2.2"])
+
+    await address.async_ensure(session)
+
+    assert address.host == "192.0.2.2"
+    assert address.url("/data/live") == "http://192.0.2.2/data/live"
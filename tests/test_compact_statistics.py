@@ -0,0 +1,146 @@
+"""Tests for the hourly FaLs22 statistics."""
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.fals22.client import FALS22Client
+from custom_components.fals22.compact_statistics import (
+    MAX_PENDING_HOURS,
+    HourlyStatistics,
+    statistic_id,
+)
+from custom_components.fals22.const import CONF_COMPACT_STATISTICS, DOMAIN
+
+# Start of an hour
+HOUR = 1_700_002_800.0
+
+
+@pytest.fixture
+def add_statistics() -> MagicMock:
+    """Patch the import of external statistics."""
+    with patch(
+        "custom_components.fals22.compact_statistics.async_add_external_statistics"
+    ) as add_statistics:
+        yield add_statistics
+
+
+def _statistics(hass: HomeAssistant, recorder: bool = True) -> HourlyStatistics:
+    """Return the statistics of a new config entry."""
+    if recorder:
+        hass.config.components.add("recorder")
+    entry = MockConfigEntry(domain=DOMAIN, title="FaLs22", data={"host": "192.0.2.1"})
+    return HourlyStatistics(hass, entry)
+
+
+def _imported(add_statistics: MagicMock, field: str) -> list[dict]:
+    """Return the hours imported for a field."""
+    return [
+        hour
+        for (_hass, metadata, hours), _kwargs in add_statistics.call_args_list
+        if metadata["statistic_id"].endswith(f"_{field}")
+        for hour in hours
+    ]
+
+
+def test_hour_rollover(hass: HomeAssistant, add_statistics: MagicMock) -> None:
+    """A finished hour is imported once a sample of a later hour arrives."""
+    statistics = _statistics(hass)
+    statistics.add(HOUR + 60, {"temp_in": 14.0, "hum_in": "--"})
+    statistics.add(HOUR + 1800, {"temp_in": 16.0})
+    statistics.add(HOUR + 3540, {"temp_in": 18.0})
+    add_statistics.assert_not_called()
+
+    statistics.add(HOUR + 3600, {"temp_in": 20.0})
+
+    metadata = add_statistics.call_args[0][1]
+    assert metadata["statistic_id"] == statistic_id(statistics.entry.entry_id, "temp_in")
+    assert metadata["unit_of_measurement"] == "°C"
+    assert _imported(add_statistics, "temp_in") == [
+        {
+            "start": datetime.fromtimestamp(HOUR, timezone.utc),
+            "mean": 16.0,
+            "min": 14.0,
+            "max": 18.0,
+        }
+    ]
+    # Fields without values in the hour are not imported
+    assert _imported(add_statistics, "hum_in") == []
+    assert statistics.hour_start == HOUR + 3600
+
+
+def test_seed(hass: HomeAssistant, add_statistics: MagicMock) -> None:
+    """Only the samples of the running hour are restored from the history."""
+    statistics = _statistics(hass)
+    statistics.seed(
+        [
+            (HOUR - 60, {"temp_in": 30.0}),
+            (HOUR + 60, {"temp_in": 10.0}),
+            (HOUR + 120, {"temp_in": 12.0}),
+        ]
+    )
+
+    statistics.add(HOUR + 3600, {"temp_in": 20.0})
+
+    assert add_statistics.call_count == 1
+    assert [hour["mean"] for hour in _imported(add_statistics, "temp_in")] == [11.0]
+
+
+def test_pending_hours_capped(hass: HomeAssistant, add_statistics: MagicMock) -> None:
+    """Without recorder the newest finished hours are kept up to the limit."""
+    statistics = _statistics(hass, recorder=False)
+    for hour in range(MAX_PENDING_HOURS + 10):
+        statistics.add(HOUR + 3600 * hour, {"temp_in": float(hour)})
+    add_statistics.assert_not_called()
+
+    hass.config.components.add("recorder")
+    statistics.async_import()
+
+    imported = _imported(add_statistics, "temp_in")
+    assert len(imported) == MAX_PENDING_HOURS
+    assert imported[0]["mean"] == 9.0
+    assert imported[-1]["mean"] == MAX_PENDING_HOURS + 8
+    # Imported hours are not imported again
+    statistics.async_import()
+    assert len(_imported(add_statistics, "temp_in")) == MAX_PENDING_HOURS
+
+
+def test_clock_went_back(hass: HomeAssistant, add_statistics: MagicMock) -> None:
+    """Samples of an earlier hour do not reopen an imported hour."""
+    statistics = _statistics(hass)
+    statistics.add(HOUR + 3600, {"temp_in": 10.0})
+    statistics.add(HOUR + 60, {"temp_in": 40.0})
+    statistics.add(HOUR + 7200, {"temp_in": 20.0})
+
+    assert statistics.hour_start == HOUR + 7200
+    assert [hour["mean"] for hour in _imported(add_statistics, "temp_in")] == [10.0]
+
+
+async def test_import_on_unload(
+    hass: HomeAssistant, client: type[FALS22Client], add_statistics: MagicMock
+) -> None:
+    """Finished hours waiting for the recorder are imported on unload."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="FaLs22",
+        data={"host": "192.0.2.1"},
+        options={CONF_COMPACT_STATISTICS: True},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    statistics = hass.data[DOMAIN][entry.entry_id].compact_statistics
+    next_hour = (dt_util.utcnow().timestamp() // 3600 + 1) * 3600
+    hass.config.components.discard("recorder")
+    # Finishes the hour of the sample read during setup
+    statistics.add(next_hour + 60, {"temp_in": 20.0})
+    statistics.add(next_hour + 3600, {"temp_in": 21.0})
+    add_statistics.assert_not_called()
+
+    hass.config.components.add("recorder")
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+    assert [hour["mean"] for hour in _imported(add_statistics, "temp_in")] == [15.0, 20.0]
@@ -0,0 +1,250 @@
+"""Tests for the FaLs22 data update coordinator."""
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_capture_events
+
+from custom_components.fals22 import FALS22DataUpdateCoordinator
+from custom_components.fals22.client import CannotConnect, FALS22Client
+from custom_components.fals22.exporter import SampleExporter
+from custom_components.fals22.const import (
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_THIN_POLLING,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    EVENT_FALS22,
+)
+
+LIVE = {
+    "temp_in": 15.0,
+    "temp_out": 8.0,
+    "hum_in": 70.0,
+    "hum_out": 80.0,
+    "abs_hum_in": 9.0,
+    "abs_hum_out": 6.8,
+    "on": 1,
+    "year": 2024,
+    "month": 3,
+    "day": 1,
+    "hours": 12,
+    "minutes": 0,
+}
+SETTINGS = {"min_temp": 10, "max_temp": 30, "min_hum": 55, "difference": 1.5}
+
+
+def _coordinator(
+    hass: HomeAssistant, options: dict | None = None
+) -> FALS22DataUpdateCoordinator:
+    """Return the coordinator of a new config entry."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "192.0.2.1"}, options=options or {})
+    entry.add_to_hass(hass)
+    return FALS22DataUpdateCoordinator(hass, entry)
+
+
+async def test_events_on_repeated_sample(hass: HomeAssistant) -> None:
+    """The end of manual mode is reported even if the device sample repeats."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "192.0.2.1"})
+    entry.add_to_hass(hass)
+    dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, entry.entry_id)}
+    )
+    coordinator = FALS22DataUpdateCoordinator(hass, entry)
+    assert not coordinator.sync_polling
+    events = async_capture_events(hass, EVENT_FALS22)
+
+    with patch.object(
+        coordinator.client, "get_live", AsyncMock(return_value=dict(LIVE))
+    ), patch.object(
+        coordinator.client, "get_settings", AsyncMock(return_value=dict(SETTINGS))
+    ) as get_settings:
+        await coordinator.async_refresh()
+        data = coordinator.data
+        # Manual mode ended locally between two polls of the same sample
+        coordinator._manual_until = hass.loop.time() - 1
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert coordinator.data is data
+    assert get_settings.await_count == 1
+    assert coordinator.sample_clock.repeated_samples == 1
+    assert [event.data["type"] for event in events] == ["manual_mode_ended"]
+
+
+async def test_direct_write_replaces_queued_writes(hass: HomeAssistant) -> None:
+    """A replay does not undo a newer write that reached the device."""
+    coordinator = _coordinator(hass)
+    client = coordinator.client
+
+    with patch.object(
+        client, "post_settings", AsyncMock(side_effect=CannotConnect)
+    ), patch.object(client, "post_manual", AsyncMock(side_effect=CannotConnect)):
+        assert not await coordinator.async_update_settings({"min_temp": 12, "min_hum": 60})
+        assert not await coordinator.async_set_manual_mode(30, True)
+    assert coordinator.write_queue
+
+    with patch.object(
+        client, "post_settings", AsyncMock(return_value=True)
+    ) as post_settings, patch.object(
+        client, "post_manual", AsyncMock(return_value=True)
+    ) as post_manual, patch.object(
+        client, "get_live", AsyncMock(return_value=dict(LIVE))
+    ), patch.object(client, "get_settings", AsyncMock(return_value=dict(SETTINGS))):
+        assert await coordinator.async_update_settings({"min_temp": 14})
+        assert await coordinator.async_set_manual_mode(10, False)
+        post_settings.reset_mock()
+        post_manual.reset_mock()
+
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    post_settings.assert_awaited_once()
+    assert post_settings.await_args.args[0] == {"min_hum": 60}
+    post_manual.assert_not_awaited()
+    assert not coordinator.write_queue
+
+
+@pytest.mark.parametrize("rejected", [True, False])
+async def test_rejected_write_keeps_queue(hass: HomeAssistant, rejected: bool) -> None:
+    """Only writes the device accepted replace queued ones."""
+    coordinator = _coordinator(hass)
+    coordinator.write_queue.queue_settings({"min_temp": 12})
+
+    with patch.object(
+        coordinator.client, "post_settings", AsyncMock(return_value=not rejected)
+    ):
+        await coordinator.async_update_settings({"min_temp": 14})
+
+    assert coordinator.write_queue.pending_settings() == (
+        {"min_temp": 12} if rejected else {}
+    )
+
+
+@pytest.mark.parametrize(
+    "post_manual",
+    [AsyncMock(return_value=False), AsyncMock(side_effect=CannotConnect)],
+    ids=["rejected", "unreachable"],
+)
+async def test_failed_manual_start_is_not_tracked(
+    hass: HomeAssistant, post_manual: AsyncMock
+) -> None:
+    """Manual mode the device did not accept never ends with an event."""
+    coordinator = _coordinator(hass)
+    dr.async_get(hass).async_get_or_create(
+        config_entry_id=coordinator.entry.entry_id,
+        identifiers={(DOMAIN, coordinator.entry.entry_id)},
+    )
+    events = async_capture_events(hass, EVENT_FALS22)
+
+    with patch.object(coordinator.client, "post_manual", post_manual):
+        assert not await coordinator.async_set_manual_mode(30, True, queue_on_failure=False)
+    assert coordinator.manual_remaining == 0
+
+    with patch.object(
+        coordinator.client, "get_live", AsyncMock(return_value=dict(LIVE))
+    ), patch.object(coordinator.client, "get_settings", AsyncMock(return_value=dict(SETTINGS))):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert events == []
+
+
+async def test_manual_mode_tracked_once_accepted(hass: HomeAssistant) -> None:
+    """Manual mode is tracked from a direct or a replayed request the device accepted."""
+    coordinator = _coordinator(hass)
+    client = coordinator.client
+
+    with patch.object(client, "post_manual", AsyncMock(return_value=True)):
+        assert await coordinator.async_set_manual_mode(30, True)
+    assert 29 * 60 < coordinator.manual_remaining <= 30 * 60
+
+    with patch.object(client, "post_manual", AsyncMock(return_value=True)):
+        assert await coordinator.async_set_manual_mode(30, False)
+    assert coordinator.manual_remaining == 0
+
+    coordinator.write_queue.queue_manual(20, True)
+    with patch.object(
+        client, "post_manual", AsyncMock(return_value=True)
+    ) as post_manual, patch.object(
+        client, "get_live", AsyncMock(return_value=dict(LIVE))
+    ), patch.object(client, "get_settings", AsyncMock(return_value=dict(SETTINGS))):
+        await coordinator.async_refresh()
+
+    post_manual.assert_awaited_once()
+    assert 19 * 60 < coordinator.manual_remaining <= 20 * 60
+
+
+@pytest.mark.parametrize(("accepted", "interval"), [(False, 900), (True, DEFAULT_SCAN_INTERVAL)])
+async def test_heartbeat_after_manual_start(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, accepted: bool, interval: int
+) -> None:
+    """Only a manual mode the device accepted ends heartbeat polling."""
+    freezer.move_to(datetime(2024, 3, 1, 23, 0, tzinfo=dt_util.DEFAULT_TIME_ZONE))
+    coordinator = _coordinator(
+        hass, {CONF_THIN_POLLING: True, CONF_HEARTBEAT_INTERVAL: 900}
+    )
+    live = {**LIVE, "on": 0}
+    settings = {
+        **SETTINGS,
+        "working_hours_from": 6,
+        "working_minutes_from": 0,
+        "working_hours_to": 22,
+        "working_minutes_to": 0,
+    }
+
+    with patch.object(
+        coordinator.client, "get_live", AsyncMock(return_value=live)
+    ), patch.object(
+        coordinator.client, "get_settings", AsyncMock(return_value=settings)
+    ), patch.object(
+        coordinator.client, "post_manual", AsyncMock(return_value=accepted)
+    ):
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=900)
+
+        assert await coordinator.async_set_manual_mode(30, True) is accepted
+        await coordinator.async_refresh()
+
+    assert coordinator.update_interval == timedelta(seconds=interval)
+
+
+async def test_export_without_live_data(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Live data that is not an object is not exported and does not fail the poll."""
+    coordinator = _coordinator(hass)
+    coordinator.exporter = SampleExporter(hass, "entry", "192.0.2.1", 10**6, 86400)
+    coordinator.exporter.directory = str(tmp_path)
+
+    with patch.object(
+        coordinator.client, "get_live", AsyncMock(return_value=[])
+    ), patch.object(coordinator.client, "get_settings", AsyncMock(return_value=dict(SETTINGS))):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data["export"]["buffered"] == 0
+
+
+async def test_poll_after_setup(
+    hass: HomeAssistant, client: type[FALS22Client], init_integration: MockConfigEntry
+) -> None:
+    """Polls keep working once all platforms, the time platform too, are loaded."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    samples = len(coordinator.history.samples())
+
+    client.get_live.side_effect = lambda *args: {**LIVE, "minutes": 1}
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert len(coordinator.history.samples()) == samples + 1
+
+
+async def test_history_covers_day(hass: HomeAssistant) -> None:
+    """The sample history holds 24 h at short scan intervals."""
+    coordinator = _coordinator(hass, {"scan_interval": 30})
+
+    assert coordinator.history.depth == 2880
@@ -0,0 +1,79 @@
+"""Tests for the FaLs22 device triggers."""
+from homeassistant.components import automation
+from homeassistant.components.device_automation import (
+    DeviceAutomationType,
+    async_get_device_automations,
+)
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import device_registry as dr
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_mock_service
+
+from custom_components.fals22.client import FALS22Client
+from custom_components.fals22.const import DOMAIN, FLEET_MODEL
+from custom_components.fals22.device_trigger import TRIGGER_TYPES
+
+from .conftest import LIVE
+
+
+def _device(hass: HomeAssistant, entry: MockConfigEntry) -> dr.DeviceEntry:
+    """Return the device of a config entry."""
+    return dr.async_get(hass).async_get_device(identifiers={(DOMAIN, entry.entry_id)})
+
+
+async def test_get_triggers(hass: HomeAssistant, init_integration: MockConfigEntry) -> None:
+    """A unit offers every trigger type, a fleet none."""
+    device = _device(hass, init_integration)
+    fleet_entry = MockConfigEntry(domain=DOMAIN)
+    fleet_entry.add_to_hass(hass)
+    fleet = dr.async_get(hass).async_get_or_create(
+        config_entry_id=fleet_entry.entry_id,
+        identifiers={(DOMAIN, fleet_entry.entry_id)},
+        model=FLEET_MODEL,
+    )
+
+    triggers = await async_get_device_automations(
+        hass, DeviceAutomationType.TRIGGER, [device.id, fleet.id]
+    )
+
+    # The entity triggers of the sensors are offered as well
+    unit_triggers = [trigger for trigger in triggers[device.id] if trigger["domain"] == DOMAIN]
+    assert sorted(trigger["type"] for trigger in unit_triggers) == sorted(TRIGGER_TYPES)
+    assert all(trigger["device_id"] == device.id for trigger in unit_triggers)
+    assert not [trigger for trigger in triggers[fleet.id] if trigger["domain"] == DOMAIN]
+
+
+async def test_trigger_fires(
+    hass: HomeAssistant, client: type[FALS22Client], init_integration: MockConfigEntry
+) -> None:
+    """An automation runs when the fan of its unit starts."""
+    device = _device(hass, init_integration)
+    calls: list[ServiceCall] = async_mock_service(hass, "test", "automation")
+    assert await async_setup_component(
+        hass,
+        automation.DOMAIN,
+        {
+            automation.DOMAIN: [
+                {
+                    "trigger": {
+                        "platform": "device",
+                        "domain": DOMAIN,
+                        "device_id": device.id,
+                        "type": trigger_type,
+                    },
+                    "action": {
+                        "service": "test.automation",
+                        "data": {"type": trigger_type},
+                    },
+                }
+                for trigger_type in ("ventilation_started", "ventilation_stopped")
+            ]
+        },
+    )
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+
+    client.get_live.side_effect = lambda *args: {**LIVE, "on": 1, "minutes": 1}
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert [call.data["type"] for call in calls] == ["ventilation_started"]
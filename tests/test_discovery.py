@@ -0,0 +1,134 @@
+"""Tests for the discovery of FaLs22 units."""
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.fals22.const import CONF_ADDITIONAL_HOSTS, DOMAIN
+from custom_components.fals22.discovery import (
+    MAX_SCAN_HOSTS,
+    async_resolve_addresses,
+    async_scan,
+    parse_host_range,
+)
+
+RESOLVED = {"fals22.local": "192.0.2.3", "fals22.local:8080": "192.0.2.3:8080"}
+
+LIVE = {"temp_in": 15.0, "temp_out": 8.0, "hum_in": 70.0, "hum_out": 80.0}
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("192.168.1.10", ["192.168.1.10"]),
+        (" 192.168.1.10 ", ["192.168.1.10"]),
+        ("192.168.1.10-12", ["192.168.1.10", "192.168.1.11", "192.168.1.12"]),
+        (
+            "192.168.1.254-192.168.2.1",
+            ["192.168.1.254", "192.168.1.255", "192.168.2.0", "192.168.2.1"],
+        ),
+        ("192.168.1.8/30", ["192.168.1.9", "192.168.1.10"]),
+        ("192.168.1.9/31", ["192.168.1.8", "192.168.1.9"]),
+        ("192.168.1.9/32", ["192.168.1.9"]),
+    ],
+)
+def test_parse_host_range(text: str, expected: list[str]) -> None:
+    """Subnets, ranges and single addresses are expanded."""
+    assert parse_host_range(text) == expected
+
+
+def test_parse_subnet_skips_network_and_broadcast() -> None:
+    """A /24 has 254 hosts."""
+    hosts = parse_host_range("10.0.0.77/24")
+    assert len(hosts) == 254
+    assert hosts[0] == "10.0.0.1"
+    assert hosts[-1] == "10.0.0.254"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "fals22.local",
+        "192.168.1.300",
+        "192.168.1.20-10",
+        "192.168.1.10-x",
+        "10.0.0.0/21",
+        "10.0.0.0-10.0.8.0",
+    ],
+)
+def test_parse_host_range_invalid(text: str) -> None:
+    """Invalid and too large ranges are rejected."""
+    with pytest.raises(ValueError):
+        parse_host_range(text)
+
+
+def test_parse_largest_range() -> None:
+    """A /22 is the largest subnet scanned."""
+    assert len(parse_host_range("10.0.0.0/22")) == MAX_SCAN_HOSTS - 2
+    assert len(parse_host_range(f"10.0.0.0-10.0.{MAX_SCAN_HOSTS // 256 - 1}.255")) == (
+        MAX_SCAN_HOSTS
+    )
+
+
+async def test_scan(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker) -> None:
+    """Only hosts answering with FaLs22 live data are found."""
+    aioclient_mock.get("http://192.0.2.1/data/live", json=[LIVE])
+    aioclient_mock.get("http://192.0.2.2/data/live", json={"temperature": 20})
+    aioclient_mock.get("http://192.0.2.3/data/live", status=404)
+    aioclient_mock.get("http://192.0.2.4/data/live", exc=aiohttp.ClientError())
+    aioclient_mock.get("http://192.0.2.5/data/live", text="<html></html>")
+    session = aioclient_mock.create_session(hass.loop)
+
+    found = await async_scan(session, [f"192.0.2.{host}" for host in range(1, 6)])
+
+    assert found == {"192.0.2.1": LIVE}
+    await session.close()
+
+
+async def _resolve(host: str) -> str:
+    """Resolve the hostnames of the tests, keep anything else."""
+    return RESOLVED.get(host, host)
+
+
+async def test_resolve_addresses() -> None:
+    """Hostnames are added with their address, ports and brackets are dropped."""
+    with patch("custom_components.fals22.discovery.async_resolve", _resolve):
+        addresses = await async_resolve_addresses(
+            ["fals22.local:8080", "192.0.2.4:80", "[2001:db8::1]:8080", "2001:db8::2"]
+        )
+
+    assert addresses == {"fals22.local", "192.0.2.3", "192.0.2.4", "2001:db8::1", "2001:db8::2"}
+
+
+async def test_scan_skips_configured_units(hass: HomeAssistant) -> None:
+    """Units configured by hostname or as additional address are not probed."""
+    MockConfigEntry(
+        domain=DOMAIN,
+        data={"host": "fals22.local"},
+        options={CONF_ADDITIONAL_HOSTS: "192.0.2.4, 192.0.2.5:8080"},
+    ).add_to_hass(hass)
+    MockConfigEntry(domain=DOMAIN, data={"host": "192.0.2.1"}).add_to_hass(hass)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "scan"}
+    )
+    with patch("custom_components.fals22.discovery.async_resolve", _resolve), patch(
+        "custom_components.fals22.config_flow.async_scan",
+        AsyncMock(return_value={"192.0.2.2": LIVE}),
+    ) as scan:
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"host_range": "192.0.2.1-6"}
+        )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "select"
+    assert scan.call_args[0][1] == ["192.0.2.2", "192.0.2.6"]
@@ -0,0 +1,128 @@
+"""Tests for the shared FaLs22 entity descriptions."""
+import json
+from pathlib import Path
+
+import pytest
+
+from custom_components.fals22.const import (
+    BINARY_SENSOR_TYPES,
+    FLEET_SENSOR_TYPES,
+    MANUAL_DURATION_NUMBER,
+    NUMBER_TYPES,
+    SENSOR_TYPES,
+    STATISTIC_SENSOR_TYPES,
+    SWITCH_TYPES,
+    TIME_TYPES,
+    TREND_SENSOR_TYPES,
+    FALS22SensorEntityDescription,
+)
+
+DATA = {
+    "live": {
+        "temp_in": 15.0,
+        "operating_hours": 1234,
+        "message": "  Lüftung aktiv  ",
+        "on": 1,
+        "year": 2024,
+        "month": 3,
+        "day": 1,
+        "hours": 9,
+        "minutes": 5,
+    },
+    "settings": {
+        "working_hours_from": 6,
+        "working_minutes_from": 0,
+        "working_hours_to": 22,
+        "working_minutes_to": 30,
+    },
+    "derived": {"dewpoint_in": 9.6, "ventilation_allowed": False},
+    "runtime": {
+        "runtime_today": 1.5,
+        "last_cycle": {"duration": 20.0, "moisture_removed": 0.4},
+    },
+    "clock": {"sample_interval": 60.0, "clock_offset": -2.5, "clock_drift": 1.2},
+}
+SENSORS = {description.key: description for description in SENSOR_TYPES}
+BINARY_SENSORS = {description.key: description for description in BINARY_SENSOR_TYPES}
+
+
+@pytest.mark.parametrize(
+    ("key", "value"),
+    [
+        ("temp_in", 15.0),
+        ("temp_out", None),
+        ("message", "Lüftung aktiv"),
+        ("dewpoint_in", 9.6),
+        ("runtime_today", 1.5),
+        ("cycles_today", None),
+        ("sample_interval", 60.0),
+        ("export_dropped", None),
+    ],
+)
+def test_sensor_values(key: str, value: object) -> None:
+    """Values are read from their part of the coordinator data."""
+    assert SENSORS[key].value_fn(DATA) == value
+
+
+@pytest.mark.parametrize("description", SENSOR_TYPES, ids=lambda description: description.key)
+def test_sensor_values_without_data(description: FALS22SensorEntityDescription) -> None:
+    """Parts of the data that are missing give no value and no attributes."""
+    empty = {"live": None, "settings": None}
+    assert description.value_fn(empty) is None
+    if description.attributes_fn is not None:
+        assert description.attributes_fn(empty) is None
+
+
+def test_sensor_attributes() -> None:
+    """Attributes are built from the coordinator data."""
+    assert SENSORS["temp_in"].attributes_fn(DATA) == {
+        "last_update": "01.03.2024 09:05",
+        "working_hours_from": "06:00",
+        "working_hours_to": "22:30",
+    }
+    assert SENSORS["runtime_today"].attributes_fn(DATA) == {
+        "last_cycle_duration": 20.0,
+        "last_cycle_moisture_removed": 0.4,
+    }
+    assert SENSORS["clock_offset"].attributes_fn(DATA) == {"drift_per_day": 1.2}
+
+
+def test_binary_sensor_values() -> None:
+    """The fan state and the ventilation decision are read from the data."""
+    running = BINARY_SENSORS["ventilation_running"]
+    assert running.is_on_fn(DATA) is True
+    assert running.is_on_fn({"live": {"on": 0}}) is False
+    assert running.is_on_fn({"live": {}}) is None
+    assert BINARY_SENSORS["ventilation_allowed"].is_on_fn(DATA) is False
+
+
+def test_descriptions_are_shared_and_frozen() -> None:
+    """Descriptions cannot be changed by the entities sharing them."""
+    with pytest.raises(AttributeError):
+        SENSOR_TYPES[0].key = "changed"  # type: ignore[misc]
+
+
+def test_translations() -> None:
+    """Every description has a name in the translations."""
+    translations = json.loads(
+        (
+            Path(__file__).parents[1] / "custom_components/fals22/translations/en.json"
+        ).read_text(encoding="utf-8")
+    )["entity"]
+    platforms = {
+        "sensor": (
+            *SENSOR_TYPES,
+            *STATISTIC_SENSOR_TYPES,
+            *TREND_SENSOR_TYPES,
+            *FLEET_SENSOR_TYPES,
+        ),
+        "binary_sensor": BINARY_SENSOR_TYPES,
+        "switch": SWITCH_TYPES,
+        "number": (*NUMBER_TYPES, MANUAL_DURATION_NUMBER),
+        "time": TIME_TYPES,
+    }
+    for platform, descriptions in platforms.items():
+        keys = [description.key for description in descriptions]
+        assert len(keys) == len(set(keys)), platform
+        for description in descriptions:
+            assert description.translation_key in translations[platform], description.key
@@ -0,0 +1,150 @@
+"""Tests for the FaLs22 sample export."""
+import asyncio
+import csv
+import gzip
+from pathlib import Path
+from unittest.mock import patch
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant
+
+from custom_components.fals22.exporter import EXPORT_FIELDS, SampleExporter
+
+LIVE = {
+    "temp_in": 15.0,
+    "temp_out": 8.0,
+    "hum_in": 70.0,
+    "hum_out": 80.0,
+    "abs_hum_in": 9.0,
+    "abs_hum_out": 6.8,
+    "on": 1,
+    "operating_hours": 1234,
+    "year": 2024,
+    "month": 3,
+    "day": 1,
+    "hours": 9,
+    "minutes": 5,
+}
+DERIVED = {"dewpoint_in": 9.6, "dewpoint_out": 4.8}
+
+
+def _exporter(hass: HomeAssistant, path: Path, max_file_size: int = 10**6) -> SampleExporter:
+    """Return an exporter writing to path."""
+    exporter = SampleExporter(hass, "entry", "192.0.2.1", max_file_size, 86400)
+    exporter.directory = str(path)
+    return exporter
+
+
+def _read(path: Path) -> list[list[str]]:
+    """Return the rows of all export files in order."""
+    rows = []
+    for file in sorted(path.iterdir()):
+        with gzip.open(file, "rt", encoding="utf-8", newline="") as export:
+            rows += list(csv.reader(export))
+    return rows
+
+
+async def test_export(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Samples are written below a header once flushed."""
+    exporter = _exporter(hass, tmp_path)
+    exporter.add(1_709_283_900, LIVE, DERIVED)
+    exporter.add(1_709_283_960, {"temp_in": 15.1, "year": None}, None)
+    assert exporter.as_dict()["buffered"] == 2
+
+    await exporter.async_flush()
+
+    assert _read(tmp_path) == [
+        EXPORT_FIELDS,
+        [
+            "2024-03-01T09:05:00+00:00",
+            "entry",
+            "192.0.2.1",
+            "2024-03-01T09:05",
+            "15.0",
+            "8.0",
+            "70.0",
+            "80.0",
+            "9.0",
+            "6.8",
+            "9.6",
+            "4.8",
+            "1",
+            "1234",
+        ],
+        ["2024-03-01T09:06:00+00:00", "entry", "192.0.2.1", "", "15.1"] + [""] * 9,
+    ]
+    assert exporter.as_dict() == {
+        "export_dropped": 0,
+        "exported": 2,
+        "buffered": 0,
+        "file": exporter._path,
+    }
+
+
+async def test_rotate_by_size(hass: HomeAssistant, tmp_path: Path) -> None:
+    """A file that reached the maximum size is continued in a new one."""
+    exporter = _exporter(hass, tmp_path, max_file_size=1)
+    for batch in range(3):
+        exporter.add(1_709_283_900 + batch, LIVE, DERIVED)
+        await exporter.async_flush()
+
+    files = list(tmp_path.iterdir())
+    assert len(files) == 3
+    rows = _read(tmp_path)
+    assert rows.count(EXPORT_FIELDS) == 3
+    assert len(rows) == 6
+
+
+async def test_full_buffer_drops(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Samples are dropped and counted while the buffer is full."""
+    exporter = _exporter(hass, tmp_path)
+    with patch("custom_components.fals22.exporter.MAX_BUFFER", 2), patch(
+        "custom_components.fals22.exporter.FLUSH_BATCH", 10
+    ):
+        for second in range(4):
+            exporter.add(1_709_283_900 + second, LIVE, DERIVED)
+
+    assert exporter.as_dict()["buffered"] == 2
+    assert exporter.dropped == 2
+
+
+async def test_write_error_drops(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Samples that could not be written are counted as dropped."""
+    exporter = _exporter(hass, tmp_path / "file")
+    (tmp_path / "file").write_text("")
+    exporter.add(1_709_283_900, LIVE, DERIVED)
+
+    await exporter.async_flush()
+
+    assert exporter.dropped == 1
+    assert exporter.exported == 0
+
+
+async def test_stop_waits_for_running_flush(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Stopping writes the samples added while a batch was written."""
+    exporter = _exporter(hass, tmp_path)
+    exporter.add(1_709_283_900, LIVE, DERIVED)
+    flush = hass.async_create_task(exporter.async_flush())
+    await asyncio.sleep(0)
+    exporter.add(1_709_283_960, LIVE, DERIVED)
+
+    await exporter.async_stop()
+
+    assert flush.done()
+    assert exporter.as_dict()["buffered"] == 0
+    assert len(_read(tmp_path)) == 3
+
+
+async def test_flush_on_home_assistant_stop(hass: HomeAssistant, tmp_path: Path) -> None:
+    """The buffered samples are written when Home Assistant stops."""
+    exporter = _exporter(hass, tmp_path)
+    exporter.start()
+    exporter.add(1_709_283_900, LIVE, DERIVED)
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+
+    assert exporter.exported == 1
+    assert len(_read(tmp_path)) == 2
+    # Unloading after the stop event does not remove the listener again
+    await exporter.async_stop()
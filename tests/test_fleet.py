@@ -0,0 +1,135 @@
+"""Tests for the FaLs22 fleet aggregates."""
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar, device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.fals22.const import (
+    CONF_AREA,
+    CONF_ENTRY_TYPE,
+    CONF_GROUP_BY,
+    DOMAIN,
+    ENTRY_TYPE_FLEET,
+    GROUP_BY_ALL,
+    GROUP_BY_AREA,
+    SIGNAL_UNITS_CHANGED,
+)
+from custom_components.fals22.fleet import FleetAggregator
+
+
+class FakeCoordinator:
+    """Coordinator with the data and listeners the aggregator reads."""
+
+    def __init__(self, abs_hum_in: float, on: int = 0, operating_hours: int = 100) -> None:
+        """Initialize the coordinator."""
+        self.last_update_success = True
+        self.data: dict[str, Any] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self.set_live(abs_hum_in=abs_hum_in, on=on, operating_hours=operating_hours)
+
+    def set_live(self, **live: Any) -> None:
+        """Set the live data and call the listeners."""
+        self.data = {"live": {**self.data.get("live", {}), **live}}
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Add a listener."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+
+def _aggregator(hass: HomeAssistant, **data: Any) -> FleetAggregator:
+    """Return the aggregator of a new fleet entry."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_ENTRY_TYPE: ENTRY_TYPE_FLEET, CONF_GROUP_BY: GROUP_BY_ALL, **data},
+    )
+    return FleetAggregator(hass, entry)
+
+
+async def test_aggregates_follow_updates(hass: HomeAssistant) -> None:
+    """Every update of a unit replaces its share of the aggregates."""
+    cellar, attic = FakeCoordinator(9.0, on=1), FakeCoordinator(7.0, operating_hours=50)
+    hass.data[DOMAIN] = {"cellar": cellar, "attic": attic}
+    aggregator = _aggregator(hass)
+    updates = []
+    aggregator.async_add_listener(lambda: updates.append(aggregator.as_dict()))
+    aggregator.async_start()
+
+    assert aggregator.as_dict() == {
+        "abs_hum_in_mean": 8.0,
+        "abs_hum_in_max": 9.0,
+        "units_ventilating": 1,
+        "units_available": 2,
+        "operating_hours_total": 150.0,
+    }
+
+    cellar.set_live(abs_hum_in=6.0, on=0, operating_hours=101)
+    assert updates[-1] == {
+        "abs_hum_in_mean": 6.5,
+        "abs_hum_in_max": 7.0,
+        "units_ventilating": 0,
+        "units_available": 2,
+        "operating_hours_total": 151.0,
+    }
+
+    # An update that changes nothing the aggregates use is not passed on
+    count = len(updates)
+    cellar.set_live(temp_in=15.0)
+    assert len(updates) == count
+
+    # An unavailable unit keeps its operating hours in the total
+    attic.last_update_success = False
+    attic.set_live()
+    assert aggregator.as_dict() == {
+        "abs_hum_in_mean": 6.0,
+        "abs_hum_in_max": 6.0,
+        "units_ventilating": 0,
+        "units_available": 1,
+        "operating_hours_total": 151.0,
+    }
+
+    del hass.data[DOMAIN]["cellar"]
+    async_dispatcher_send(hass, SIGNAL_UNITS_CHANGED)
+    assert aggregator.members == ["attic"]
+    assert aggregator.as_dict() == {
+        "abs_hum_in_mean": None,
+        "abs_hum_in_max": None,
+        "units_ventilating": 0,
+        "units_available": 0,
+        "operating_hours_total": None,
+    }
+
+    aggregator.async_stop()
+    assert not cellar._listeners and not attic._listeners
+
+
+async def test_members_by_area(hass: HomeAssistant) -> None:
+    """Units join and leave the group with the area of their device."""
+    attic = ar.async_get(hass).async_create("Attic")
+    device_registry = dr.async_get(hass)
+    devices = {}
+    for entry_id in ("cellar", "attic"):
+        entry = MockConfigEntry(domain=DOMAIN, entry_id=entry_id)
+        entry.add_to_hass(hass)
+        devices[entry_id] = device_registry.async_get_or_create(
+            config_entry_id=entry_id, identifiers={(DOMAIN, entry_id)}
+        )
+    device_registry.async_update_device(devices["attic"].id, area_id=attic.id)
+    hass.data[DOMAIN] = {"cellar": FakeCoordinator(9.0), "attic": FakeCoordinator(7.0)}
+    aggregator = _aggregator(hass, **{CONF_GROUP_BY: GROUP_BY_AREA, CONF_AREA: attic.id})
+    aggregator.async_start()
+
+    assert aggregator.members == ["attic"]
+    assert aggregator.abs_hum_in_max == 7.0
+
+    device_registry.async_update_device(devices["cellar"].id, area_id=attic.id)
+    await hass.async_block_till_done()
+
+    assert sorted(aggregator.members) == ["attic", "cellar"]
+    assert aggregator.abs_hum_in_max == 9.0
+    aggregator.async_stop()
@@ -0,0 +1,58 @@
+"""Tests for the FaLs22 Prometheus metrics."""
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from custom_components.fals22.const import DOMAIN
+from custom_components.fals22.metrics import CONTENT_TYPE, METRICS, render_metrics
+
+
+async def test_render_metrics(hass: HomeAssistant, init_integration: MockConfigEntry) -> None:
+    """Every metric is written in one block with its help and type."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    lines = render_metrics([coordinator]).splitlines()
+
+    labels = f'entry_id="{init_integration.entry_id}",name="FaLs22 192.0.2.1",host="192.0.2.1"'
+    assert f'fals22_temperature_celsius{{{labels},location="indoor"}} 15.0' in lines
+    assert f'fals22_temperature_celsius{{{labels},location="outdoor"}} 8.0' in lines
+    assert f'fals22_setting{{{labels},setting="min_hum"}} 55.0' in lines
+    assert f"fals22_up{{{labels}}} 1.0" in lines
+    assert f"fals22_polls_total{{{labels}}} 1.0" in lines
+
+    names = [line.split(" ")[2] for line in lines if line.startswith("# TYPE ")]
+    assert len(names) == len(set(names))
+    for name in names:
+        metric_type, help_text = METRICS[name]
+        index = lines.index(f"# HELP {name} {help_text}")
+        assert lines[index + 1] == f"# TYPE {name} {metric_type}"
+        samples = [line for line in lines if line.startswith(f"{name}{{")]
+        # The samples of a metric follow its type line without a gap
+        assert lines[index + 2 : index + 2 + len(samples)] == samples
+
+
+async def test_label_escaping(hass: HomeAssistant, init_integration: MockConfigEntry) -> None:
+    """Quotes, backslashes and newlines in label values are escaped."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    hass.config_entries.async_update_entry(
+        init_integration, data={**init_integration.data, "name": 'Cellar "A"\\\nB'}
+    )
+
+    assert 'name="Cellar \\"A\\"\\\\\\nB"' in render_metrics([coordinator])
+
+
+async def test_metrics_view(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_client: ClientSessionGenerator,
+) -> None:
+    """The view serves the metrics with the staleness of every unit."""
+    client = await hass_client()
+
+    response = await client.get("/api/fals22/metrics")
+
+    assert response.status == 200
+    assert response.headers["Content-Type"] == CONTENT_TYPE
+    text = await response.text()
+    assert "# TYPE fals22_up gauge" in text
+    assert "# TYPE fals22_staleness_seconds gauge" in text
+    assert text.endswith("\n")
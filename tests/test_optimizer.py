@@ -0,0 +1,193 @@
+"""Tests for the FaLs22 settings optimiser."""
+import argparse
+from datetime import datetime, tzinfo
+import itertools
+import math
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+from custom_components.fals22.optimizer import (
+    STEP,
+    local_minute_of_day,
+    parse_range,
+    parse_time_zone,
+    parse_window,
+    resample,
+    simulate,
+)
+
+GRID = {
+    "min_temp": [5.0, 12.0],
+    "min_hum": [50.0, 65.0],
+    "difference": [0.5, 2.0],
+    "ventilation": [0.0, 10.0, 20.0],
+    "break": [0.0, 15.0],
+}
+AIRFLOW = 120.0
+MAX_TEMP = 25.0
+
+
+def _data(minutes: int = 1500, seed: int = 4) -> dict[str, np.ndarray]:
+    """Return resampled data with slowly changing values and gaps."""
+    rng = np.random.default_rng(seed)
+    time = 1_700_000_040.0 + STEP * np.arange(minutes)
+
+    def walk(start: float, scale: float) -> np.ndarray:
+        return np.round(start + np.cumsum(rng.normal(0, scale, minutes)), 1)
+
+    data = {
+        "time": time,
+        "temp_in": walk(12, 0.1),
+        "temp_out": walk(15, 0.3),
+        "hum_in": walk(60, 0.3),
+        "abs_hum_in": walk(9, 0.05),
+        "abs_hum_out": walk(8, 0.08),
+    }
+    data["hum_in"][100:130] = np.nan
+    return data
+
+
+def _simulate_scalar(
+    data: dict[str, np.ndarray],
+    window: tuple[int, int] | None,
+    candidate: dict[str, float],
+    time_zone: tzinfo | None = None,
+) -> tuple[int, float]:
+    """Return the minutes and moisture of one candidate, minute by minute."""
+    minutes, removed = 0, 0.0
+    run_start = None
+    for position, timestamp in enumerate(data["time"]):
+        values = [data[field][position] for field in ("temp_in", "temp_out", "hum_in")]
+        difference = data["abs_hum_in"][position] - data["abs_hum_out"][position]
+        local = datetime.fromtimestamp(timestamp, time_zone).astimezone(time_zone)
+        minute = local.hour * 60 + local.minute
+        in_window = window is None or window[0] == window[1] or (
+            window[0] <= minute < window[1]
+            if window[0] < window[1]
+            else minute >= window[0] or minute < window[1]
+        )
+        allowed = (
+            not any(math.isnan(value) for value in [*values, difference])
+            and in_window
+            and values[1] <= MAX_TEMP
+            and values[0] >= candidate["min_temp"]
+            and values[2] > candidate["min_hum"]
+            and difference >= candidate["difference"]
+        )
+        if not allowed:
+            run_start = None
+            continue
+        if run_start is None:
+            run_start = position
+        elapsed = position - run_start
+        ventilation, pause = candidate["ventilation"], candidate["break"]
+        if ventilation > 0 and (pause <= 0 or elapsed % (ventilation + pause) < ventilation):
+            minutes += 1
+            removed += difference * AIRFLOW / 60
+    return minutes, removed
+
+
+@pytest.mark.parametrize("window", [None, (6 * 60, 22 * 60), (22 * 60, 6 * 60)])
+def test_simulate_matches_scalar_replay(window: tuple[int, int] | None) -> None:
+    """The vectorised replay gives the hours and moisture of a plain replay."""
+    data = _data()
+    results = simulate(data, window, MAX_TEMP, AIRFLOW, GRID)
+
+    assert len(results) == math.prod(len(values) for values in GRID.values())
+    for result in results:
+        candidate = {key: result[key] for key in GRID}
+        minutes, removed = _simulate_scalar(data, window, candidate)
+        assert result["ventilation_hours"] == round(minutes / 60, 1)
+        assert result["moisture_removed_g"] == pytest.approx(round(removed, 1), abs=0.051)
+
+
+def test_simulate_in_time_zone() -> None:
+    """Working hours are taken in the given time zone."""
+    data = _data()
+    window = (6 * 60, 22 * 60)
+    time_zone = ZoneInfo("America/New_York")
+
+    results = simulate(data, window, MAX_TEMP, AIRFLOW, GRID, time_zone)
+
+    assert results != simulate(data, window, MAX_TEMP, AIRFLOW, GRID, ZoneInfo("Asia/Tokyo"))
+    for result in results:
+        candidate = {key: result[key] for key in GRID}
+        minutes, _removed = _simulate_scalar(data, window, candidate, time_zone)
+        assert result["ventilation_hours"] == round(minutes / 60, 1)
+
+
+def test_simulate_without_allowed_minutes() -> None:
+    """Candidates that never allow ventilation report nothing."""
+    grid = {**GRID, "min_temp": [99.0]}
+
+    results = simulate(_data(200), None, MAX_TEMP, AIRFLOW, grid)
+
+    assert {result["ventilation_hours"] for result in results} == {0.0}
+    assert {result["moisture_removed_g"] for result in results} == {0.0}
+
+
+def test_local_minute_of_day() -> None:
+    """Minutes follow the daylight saving change of the time zone."""
+    # 2024-03-31 00:30 UTC, Berlin switches to summer time at 01:00 UTC
+    times = 1_711_845_000.0 + 3600 * np.arange(2)
+
+    minutes = local_minute_of_day(times, ZoneInfo("Europe/Berlin"))
+
+    assert minutes.tolist() == [90, 210]
+
+
+def test_parse_time_zone() -> None:
+    """Time zones are given by their IANA name."""
+    assert parse_time_zone("Europe/Berlin") == ZoneInfo("Europe/Berlin")
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_time_zone("Mars/Olympus_Mons")
+
+
+def test_simulate_reports_every_candidate() -> None:
+    """Every combination of the grid is reported once."""
+    results = simulate(_data(200), None, MAX_TEMP, AIRFLOW, GRID)
+    combinations = {
+        tuple(result[key] for key in ("min_temp", "min_hum", "difference", "ventilation", "break"))
+        for result in results
+    }
+    assert combinations == set(
+        itertools.product(
+            GRID["min_temp"],
+            GRID["min_hum"],
+            GRID["difference"],
+            GRID["ventilation"],
+            GRID["break"],
+        )
+    )
+
+
+def test_parse_range() -> None:
+    """Ranges include their end, lists are taken as given."""
+    assert parse_range("0.5:2:0.5") == [0.5, 1.0, 1.5, 2.0]
+    assert parse_range("0.1:0.3:0.1") == [0.1, 0.2, 0.3]
+    assert parse_range("10,25,5") == [10.0, 25.0, 5.0]
+
+
+def test_parse_window() -> None:
+    """Working hours are converted to minutes of the day."""
+    assert parse_window("06:30-22:00") == (390, 1320)
+
+
+def test_resample_holds_values() -> None:
+    """Values are held on the minute grid until they are too old."""
+    times = np.asarray([0.5, 30.5, 200.5, 5000.5, 6000.5])
+    series = {
+        field: (times, np.asarray([1.0, 2.0, 3.0, 4.0, 5.0]))
+        for field in ("temp_in", "temp_out", "hum_in", "abs_hum_in", "abs_hum_out")
+    }
+
+    data = resample(series, max_gap=3600)
+
+    assert data["time"][0] == STEP
+    assert data["temp_in"][0] == 2.0
+    assert data["temp_in"][3] == 3.0
+    # More than max_gap after the value of 200 s
+    assert math.isnan(data["temp_in"][int(4000 / STEP) - 1])
+    assert data["temp_in"][-1] == 4.0
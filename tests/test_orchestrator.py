@@ -0,0 +1,169 @@
+"""Tests for the staggered manual ventilation of FaLs22 units."""
+import asyncio
+from collections.abc import Callable
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.fals22.const import DOMAIN
+from custom_components.fals22.orchestrator import ManualVentilationOrchestrator, RequestPacer
+
+
+class FakeCoordinator:
+    """Coordinator of a unit that starts its fan when asked to."""
+
+    def __init__(self, entry_id: str, fan_follows: bool = True) -> None:
+        """Initialize the coordinator."""
+        self.entry = SimpleNamespace(entry_id=entry_id)
+        self.host = entry_id
+        self.fan_follows = fan_follows
+        self.last_update_success = True
+        self.data = {"live": {"on": 0}}
+        self.manual_remaining = 0.0
+        self.manual_confirmed = False
+        self.writes: list[bool] = []
+        self.sample_clock = SimpleNamespace(
+            device_time=0, next_poll_delay=lambda now, margin: 0.01
+        )
+        self._fan = 0
+        self._listeners: list[Callable[[], None]] = []
+
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Add a listener."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    async def async_set_manual_mode(
+        self, duration: int, turn_on: bool, queue_on_failure: bool = True
+    ) -> bool:
+        """Start or end manual mode."""
+        self.writes.append(turn_on)
+        self.manual_remaining = 60.0 * duration if turn_on else 0.0
+        self._fan = int(turn_on and self.fan_follows)
+        return True
+
+    async def async_refresh(self) -> None:
+        """Read the fan state, the device takes a new sample every read."""
+        self.sample_clock.device_time += 1
+        self.data = {"live": {"on": self._fan}}
+
+    async def async_request_refresh(self) -> None:
+        """Read the fan state."""
+        await self.async_refresh()
+
+    def end_manual_mode(self) -> None:
+        """Let the manual time run out."""
+        self.manual_remaining = 0.0
+        self._fan = 0
+        self.data = {"live": {"on": 0}}
+        for update_callback in list(self._listeners):
+            update_callback()
+
+
+@pytest.fixture(autouse=True)
+def no_confirm_delay():
+    """Read the fan state back right after a start."""
+    with patch("custom_components.fals22.orchestrator.CONFIRM_DELAY", 0):
+        yield
+
+
+async def _until(condition: Callable[[], bool]) -> None:
+    """Let the orchestrator run until the condition holds."""
+    async with asyncio.timeout(2):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+def _orchestrator(
+    hass: HomeAssistant, units: list[FakeCoordinator], max_running: int | None = None
+) -> ManualVentilationOrchestrator:
+    """Return a started orchestrator of the units."""
+    hass.data[DOMAIN] = {unit.entry.entry_id: unit for unit in units}
+    orchestrator = ManualVentilationOrchestrator(hass, units, 30, max_running, 100)
+    orchestrator.async_start()
+    return orchestrator
+
+
+async def test_request_pacer(hass: HomeAssistant) -> None:
+    """Requests are spaced by the rate, several requests take several slots."""
+    pacer = RequestPacer(hass, 20)
+    started = hass.loop.time()
+
+    await pacer.async_wait()
+    await pacer.async_wait(2)
+    await pacer.async_wait()
+
+    assert hass.loop.time() - started >= 3 / 20 - 0.01
+
+
+async def test_staggered_start(hass: HomeAssistant) -> None:
+    """A unit waits for a free place and is confirmed from its fan state."""
+    cellar, attic = FakeCoordinator("cellar"), FakeCoordinator("attic")
+    garage = FakeCoordinator("garage")
+    # A fan running on its own takes one of the two places
+    garage.data = {"live": {"on": 1}}
+    orchestrator = _orchestrator(hass, [cellar, attic], max_running=2)
+    orchestrator.entry_ids.append("garage")
+    hass.data[DOMAIN]["garage"] = garage
+
+    await _until(lambda: cellar.manual_confirmed)
+    assert orchestrator.as_dict() == {
+        "pending": ["attic"],
+        "running": {"cellar": 1800},
+        "finished": [],
+        "failed": [],
+    }
+
+    cellar.end_manual_mode()
+    await _until(lambda: attic.manual_confirmed)
+    assert orchestrator.running == {"attic"}
+    assert orchestrator.finished == ["cellar"]
+
+    attic.end_manual_mode()
+    await _until(lambda: orchestrator.done)
+    assert orchestrator.finished == ["cellar", "attic"]
+    assert not cellar._listeners and not attic._listeners
+
+
+async def test_unconfirmed_start(hass: HomeAssistant) -> None:
+    """A fan that stays off after a new sample fails and frees its place."""
+    cellar, attic = FakeCoordinator("cellar", fan_follows=False), FakeCoordinator("attic")
+    orchestrator = _orchestrator(hass, [cellar, attic], max_running=1)
+
+    await _until(lambda: attic.manual_confirmed)
+
+    assert orchestrator.failed == ["cellar"]
+    # Manual mode of the failed unit is ended again
+    assert cellar.writes == [True, False]
+    assert orchestrator.running == {"attic"}
+    await orchestrator.async_stop()
+
+
+async def test_unreachable_unit_skipped(hass: HomeAssistant) -> None:
+    """Units that failed their last poll are not started."""
+    cellar, attic = FakeCoordinator("cellar"), FakeCoordinator("attic")
+    cellar.last_update_success = False
+    orchestrator = _orchestrator(hass, [cellar, attic], max_running=1)
+
+    await _until(lambda: attic.manual_confirmed)
+
+    assert orchestrator.failed == ["cellar"]
+    assert cellar.writes == []
+    await orchestrator.async_stop()
+
+
+async def test_stop(hass: HomeAssistant) -> None:
+    """Stopping drops the waiting units and ends manual mode of the running ones."""
+    cellar, attic = FakeCoordinator("cellar"), FakeCoordinator("attic")
+    orchestrator = _orchestrator(hass, [cellar, attic], max_running=1)
+    await _until(lambda: cellar.manual_confirmed)
+
+    await orchestrator.async_stop()
+
+    assert orchestrator.done
+    assert cellar.writes == [True, False]
+    assert attic.writes == []
+    assert not cellar.manual_confirmed
+    assert orchestrator.as_dict()["pending"] == []
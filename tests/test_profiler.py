@@ -0,0 +1,147 @@
+"""Tests for profiling FaLs22 update cycles."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.fals22.client import FALS22Client
+from custom_components.fals22.const import (
+    CONF_AREA,
+    CONF_ENTRY_TYPE,
+    CONF_GROUP_BY,
+    DOMAIN,
+    ENTRY_TYPE_FLEET,
+    GROUP_BY_AREA,
+)
+from custom_components.fals22.profiler import CYCLE_FAILED, CYCLE_REPEATED, CycleProfiler
+
+from .conftest import LIVE
+
+
+class FakeEntity:
+    """Entity with the properties a state write reads."""
+
+    entity_id = "sensor.fals22_temp_in"
+    available = True
+    state = 15.0
+    extra_state_attributes = None
+
+    def __init__(self) -> None:
+        """Initialize the entity."""
+        self.writes = 0
+
+    def async_write_ha_state(self) -> None:
+        """Count the state writes."""
+        self.writes += 1
+
+
+def _cycle(profiler: CycleProfiler, kind: str | None = None) -> None:
+    """Run a cycle with a request and a listener."""
+    entity = FakeEntity()
+    profiler.start_cycle()
+    profiler.record("request", 0.01)
+    profiler.record("decode", 0.001)
+    if kind is not None:
+        profiler.mark_cycle(kind)
+    profiler.dispatch([entity.async_write_ha_state])
+    profiler.end_cycle()
+    assert entity.writes == 1
+
+
+async def test_full_cycles() -> None:
+    """The profile is done after the requested number of cycles."""
+    profiler = CycleProfiler(2)
+    _cycle(profiler)
+    assert not profiler.done.done()
+    _cycle(profiler)
+
+    assert profiler.done.done()
+    summary = profiler.summary()
+    assert summary["cycles"] == 2
+    assert summary["cycle"]["count"] == 2
+    assert summary["skipped_cycles"] == {}
+    assert summary["phases"]["request"]["count"] == 2
+    assert summary["phases"]["request"]["total_ms"] == pytest.approx(20)
+    assert summary["phases"]["dispatch"]["count"] == 2
+    assert summary["listeners"]["sensor.fals22_temp_in"]["state_write"]["count"] == 2
+
+
+async def test_skipped_cycles() -> None:
+    """Repeated and failed cycles are counted apart and left out of the timings."""
+    profiler = CycleProfiler(1)
+    _cycle(profiler, CYCLE_REPEATED)
+    _cycle(profiler, CYCLE_FAILED)
+    _cycle(profiler, CYCLE_FAILED)
+    assert not profiler.done.done()
+    _cycle(profiler)
+
+    assert profiler.done.done()
+    summary = profiler.summary()
+    assert summary["cycles"] == 1
+    assert summary["skipped_cycles"][CYCLE_REPEATED]["count"] == 1
+    assert summary["skipped_cycles"][CYCLE_FAILED]["count"] == 2
+    assert summary["phases"]["request"]["count"] == 1
+    assert summary["phases"]["dispatch"]["count"] == 1
+    assert summary["listeners"]["sensor.fals22_temp_in"]["state_write"]["count"] == 1
+
+
+async def test_record_outside_cycle() -> None:
+    """Requests outside a poll, such as writes, are recorded directly."""
+    profiler = CycleProfiler(1)
+    profiler.record("request", 0.02)
+
+    assert profiler.summary()["phases"]["request"]["count"] == 1
+
+
+async def test_profile_service(
+    hass: HomeAssistant, client: type[FALS22Client], init_integration: MockConfigEntry
+) -> None:
+    """A repeated sample is reported apart from the cycles the service waits for."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    call = hass.async_create_task(
+        hass.services.async_call(
+            DOMAIN, "profile", {"cycles": 1}, blocking=True, return_response=True
+        )
+    )
+    while coordinator.profiler is None:
+        await asyncio.sleep(0)
+
+    # The unit still reports the sample read during setup
+    await coordinator.async_refresh()
+    await asyncio.sleep(0)
+    assert not call.done()
+
+    client.get_live.side_effect = lambda *args: {**LIVE, "minutes": 1}
+    await coordinator.async_refresh()
+    async with asyncio.timeout(5):
+        result = await call
+
+    summary = result[init_integration.entry_id]
+    assert summary["host"] == "192.0.2.1"
+    assert summary["cycles"] == 1
+    assert summary["cycle"]["count"] == 1
+    assert summary["skipped_cycles"][CYCLE_REPEATED]["count"] == 1
+    assert coordinator.profiler is None
+
+
+async def test_profile_service_without_units(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """A fleet without units is an error instead of an empty profile."""
+    fleet = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_ENTRY_TYPE: ENTRY_TYPE_FLEET, CONF_GROUP_BY: GROUP_BY_AREA, CONF_AREA: "attic"},
+    )
+    fleet.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(fleet.entry_id)
+
+    with pytest.raises(HomeAssistantError, match="no FaLs22 units"):
+        await hass.services.async_call(
+            DOMAIN,
+            "profile",
+            {"config_entry_id": fleet.entry_id},
+            blocking=True,
+            return_response=True,
+        )
@@ -0,0 +1,133 @@
+"""Tests for applying FaLs22 settings profiles."""
+from datetime import time
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.fals22 import (
+    WRITE_ACCEPTED,
+    WRITE_QUEUED,
+    WRITE_REJECTED,
+    FALS22DataUpdateCoordinator,
+    _profile_from_call,
+)
+from custom_components.fals22.client import CannotConnect
+from custom_components.fals22.const import DOMAIN
+from custom_components.fals22.device_helper import settings_equal
+
+SETTINGS = {
+    "min_temp": 10,
+    "max_temp": 30,
+    "ventilation": 20,
+    "break": 10,
+    "min_hum": 55,
+    "difference": 1.5,
+}
+
+
+def _coordinator(hass: HomeAssistant) -> FALS22DataUpdateCoordinator:
+    """Return a coordinator that last read SETTINGS from the device."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "192.0.2.1"})
+    entry.add_to_hass(hass)
+    coordinator = FALS22DataUpdateCoordinator(hass, entry)
+    coordinator.data = {"live": {}, "settings": dict(SETTINGS)}
+    return coordinator
+
+
+def test_settings_equal() -> None:
+    """The humidity difference is compared with the precision of the device."""
+    assert settings_equal(1.5, "1.5")
+    assert settings_equal(1.52, 1.5)
+    assert not settings_equal(1.6, 1.5)
+    assert settings_equal(None, None)
+    assert not settings_equal(None, 0)
+    assert settings_equal("auto", "auto")
+
+
+def test_profile_from_call() -> None:
+    """Working times become the hour and minute settings of the device."""
+    profile = _profile_from_call(
+        {
+            "name": "winter",
+            "min_temp": 8,
+            "working_time_from": time(6, 30),
+            "working_time_to": time(22, 0),
+        }
+    )
+    assert profile == {
+        "min_temp": 8,
+        "working_hours_from": 6,
+        "working_minutes_from": 30,
+        "working_hours_to": 22,
+        "working_minutes_to": 0,
+    }
+
+
+async def test_apply_settings_writes_only_differences(hass: HomeAssistant) -> None:
+    """Only settings that differ from the device are written."""
+    coordinator = _coordinator(hass)
+    target = {**SETTINGS, "min_temp": 12, "difference": 1.5}
+
+    async def refresh() -> None:
+        coordinator.data = {"live": {}, "settings": {**SETTINGS, "min_temp": 12}}
+
+    with patch.object(
+        coordinator.client, "post_settings", AsyncMock(return_value=True)
+    ) as post_settings, patch.object(coordinator, "async_refresh", side_effect=refresh):
+        assert await coordinator.async_apply_settings(target) == (WRITE_ACCEPTED, {})
+
+    post_settings.assert_awaited_once_with({"min_temp": 12})
+
+
+async def test_apply_settings_matching_profile(hass: HomeAssistant) -> None:
+    """A profile the device already has is not written."""
+    coordinator = _coordinator(hass)
+
+    with patch.object(coordinator.client, "post_settings", AsyncMock()) as post_settings:
+        assert await coordinator.async_apply_settings(dict(SETTINGS)) == (WRITE_ACCEPTED, {})
+
+    post_settings.assert_not_awaited()
+
+
+async def test_apply_settings_reports_mismatches(hass: HomeAssistant) -> None:
+    """Settings that do not read back as written are reported."""
+    coordinator = _coordinator(hass)
+    target = {**SETTINGS, "min_temp": 12, "min_hum": 60}
+
+    async def refresh() -> None:
+        coordinator.data = {"live": {}, "settings": {**SETTINGS, "min_temp": 12}}
+
+    with patch.object(
+        coordinator.client, "post_settings", AsyncMock(return_value=True)
+    ), patch.object(coordinator, "async_refresh", side_effect=refresh):
+        status, mismatches = await coordinator.async_apply_settings(target)
+
+    assert status == WRITE_ACCEPTED
+    assert mismatches == {"min_hum": {"expected": 60, "actual": 55}}
+
+
+async def test_apply_settings_write_failed(hass: HomeAssistant) -> None:
+    """A rejected write is reported and not queued."""
+    coordinator = _coordinator(hass)
+
+    with patch.object(coordinator.client, "post_settings", AsyncMock(return_value=False)):
+        assert await coordinator.async_apply_settings({**SETTINGS, "break": 0}) == (
+            WRITE_REJECTED,
+            {},
+        )
+    assert not coordinator.write_queue
+
+
+async def test_apply_settings_queued(hass: HomeAssistant) -> None:
+    """Settings for an unreachable device are reported as queued."""
+    coordinator = _coordinator(hass)
+
+    with patch.object(
+        coordinator.client, "post_settings", AsyncMock(side_effect=CannotConnect)
+    ):
+        assert await coordinator.async_apply_settings({**SETTINGS, "break": 0}) == (
+            WRITE_QUEUED,
+            {},
+        )
+    assert coordinator.write_queue.pending_settings() == {"break": 0}
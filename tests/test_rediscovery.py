@@ -0,0 +1,97 @@
+"""Tests for recognising a FaLs22 unit at a new address."""
+from pathlib import Path
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.fals22.const import DOMAIN
+from custom_components.fals22.rediscovery import (
+    OPERATING_HOURS_SLACK,
+    hours_continue,
+    read_arp_table,
+    settings_match,
+)
+
+KNOWN_SETTINGS = {"min_temp": 10, "min_hum": 55, "difference": 1.5, "working_hours_from": 6}
+ARP_TABLE = """\
+IP address       HW type     Flags       HW address            Mask     Device
+192.168.1.20     0x1         0x2         AA:BB:CC:00:11:22     *        eth0
+192.168.1.21     0x1         0x0         00:00:00:00:00:00     *        eth0
+192.168.1.22     0x1         0x2         aa:bb:cc:00:11:33     *        eth0
+"""
+
+
+@pytest.mark.parametrize(
+    ("hours", "hours_lost", "expected"),
+    [
+        (1000, 0.5, True),
+        (1000 + OPERATING_HOURS_SLACK, 0.5, True),
+        (1002, 0.5, False),
+        (1005, 4.5, True),
+        (999, 4.5, False),
+        (None, 1, False),
+        ("1000", 1, False),
+    ],
+)
+def test_hours_continue(hours: object, hours_lost: float, expected: bool) -> None:
+    """The counter may only have advanced by the time the unit was lost."""
+    live = {"operating_hours": hours}
+    assert hours_continue(live, {"operating_hours": 1000}, hours_lost) is expected
+
+
+def test_hours_continue_without_known_hours() -> None:
+    """A unit is not recognised without known operating hours."""
+    assert not hours_continue({"operating_hours": 1000}, {}, 1)
+
+
+def test_settings_match() -> None:
+    """All known profile settings must be found on the unit."""
+    assert settings_match({**KNOWN_SETTINGS, "code": 1}, KNOWN_SETTINGS)
+    assert settings_match({**KNOWN_SETTINGS, "difference": "1.5"}, KNOWN_SETTINGS)
+    assert not settings_match({**KNOWN_SETTINGS, "min_hum": 60}, KNOWN_SETTINGS)
+    assert not settings_match({"min_temp": 10}, KNOWN_SETTINGS)
+    assert not settings_match(None, KNOWN_SETTINGS)
+    # Nothing to compare is no match
+    assert not settings_match(KNOWN_SETTINGS, {"code": 1})
+
+
+def test_read_arp_table(tmp_path: Path) -> None:
+    """Complete entries of the ARP cache are read with formatted MAC addresses."""
+    table = tmp_path / "arp"
+    table.write_text(ARP_TABLE, encoding="ascii")
+
+    with patch("custom_components.fals22.rediscovery.ARP_TABLE", str(table)):
+        assert read_arp_table() == {
+            "192.168.1.20": "aa:bb:cc:00:11:22",
+            "192.168.1.22": "aa:bb:cc:00:11:33",
+        }
+
+
+def test_read_arp_table_missing(tmp_path: Path) -> None:
+    """Hosts without an ARP cache give an empty table."""
+    with patch("custom_components.fals22.rediscovery.ARP_TABLE", str(tmp_path / "missing")):
+        assert read_arp_table() == {}
+
+
+async def test_set_host(hass: HomeAssistant, init_integration: MockConfigEntry) -> None:
+    """The entry, the device and its entities move to the new address."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+
+    await coordinator.async_set_host("192.0.2.5")
+
+    assert init_integration.data["host"] == "192.0.2.5"
+    assert init_integration.unique_id == "192.0.2.5"
+    assert init_integration.title == "FaLs22 192.0.2.5"
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, init_integration.entry_id)}
+    )
+    assert device.configuration_url == "http://192.0.2.5"
+    assert device.name == "FaLs22 192.0.2.5"
+    entity_id = er.async_entries_for_config_entry(
+        er.async_get(hass), init_integration.entry_id
+    )[0].entity_id
+    entity = hass.data[entity_id.split(".")[0]].get_entity(entity_id)
+    assert entity.device_info["configuration_url"] == "http://192.0.2.5"
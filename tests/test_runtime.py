@@ -0,0 +1,91 @@
+"""Tests for the FaLs22 runtime and moisture accounting."""
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+
+from custom_components.fals22.runtime import MAX_SAMPLE_GAP, VentilationAccounting
+
+
+def _live(on: bool, abs_hum_in: float = 9.0, abs_hum_out: float = 7.0) -> dict[str, Any]:
+    """Return live data with the fan state and the absolute humidities."""
+    return {"on": 1 if on else 0, "abs_hum_in": abs_hum_in, "abs_hum_out": abs_hum_out}
+
+
+def test_cycle_accounting(hass: HomeAssistant) -> None:
+    """Runtime and moisture are integrated while the fan runs."""
+    accounting = VentilationAccounting(hass, "entry")
+
+    assert accounting.update(0, _live(False)) is None
+    assert accounting.update(60, _live(True, 9.0, 7.0)) is None
+    assert accounting.update(660, _live(True, 9.0, 8.0)) is None
+    finished = accounting.update(1260, _live(False, 9.0, 8.0))
+
+    # Ten minutes at a mean difference of 1.5 g/m³, then the fan was off
+    assert finished == {
+        "duration": 10.0,
+        "moisture_removed": 0.25,
+        "start": 60,
+        "end": 1260,
+    }
+    data = accounting.as_dict()
+    assert data["runtime_today"] == data["runtime_total"] == 0.167
+    assert data["moisture_removed_today"] == data["moisture_removed_total"] == 0.25
+    assert data["cycles_today"] == data["cycles_total"] == 1
+    assert data["last_cycle"] == finished
+
+
+def test_gaps_are_not_integrated(hass: HomeAssistant) -> None:
+    """The fan state between samples far apart is unknown."""
+    accounting = VentilationAccounting(hass, "entry")
+    accounting.update(0, _live(True))
+    accounting.update(MAX_SAMPLE_GAP + 1, _live(True))
+
+    assert accounting.counters["runtime_total"] == 0
+
+
+def test_missing_humidity(hass: HomeAssistant) -> None:
+    """The runtime counts without the humidity, the moisture uses what is known."""
+    accounting = VentilationAccounting(hass, "entry")
+    accounting.update(0, _live(True, 9.0, 7.0))
+    accounting.update(900, {"on": 1, "abs_hum_in": None})
+    accounting.update(1800, {"on": 1})
+
+    assert accounting.counters["runtime_total"] == pytest.approx(0.5)
+    assert accounting.counters["moisture_removed_total"] == pytest.approx(0.5)
+
+
+def test_moisture_never_decreases(hass: HomeAssistant) -> None:
+    """Wetter outdoor air does not count as negative removal."""
+    accounting = VentilationAccounting(hass, "entry")
+    accounting.update(0, _live(True, 9.0, 8.0))
+    accounting.update(900, _live(True, 9.0, 8.0))
+    removed = accounting.counters["moisture_removed_total"]
+
+    accounting.update(1800, _live(True, 8.0, 10.0))
+    accounting.update(2700, _live(True, 8.0, 10.0))
+
+    assert removed == pytest.approx(0.25)
+    assert accounting.counters["moisture_removed_total"] == removed
+    assert accounting.counters["runtime_total"] == pytest.approx(0.75)
+
+
+def test_daily_counters_reset(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """The daily counters start from zero on a new day."""
+    accounting = VentilationAccounting(hass, "entry")
+    accounting.update(0, _live(True))
+    accounting.update(600, _live(True))
+    accounting.update(1200, _live(False))
+
+    freezer.tick(timedelta(days=1))
+    accounting.update(1800, _live(True))
+    accounting.update(2400, _live(True))
+
+    assert accounting.day == dt_util.now().date().isoformat()
+    assert accounting.counters["runtime_today"] == pytest.approx(600 / 3600)
+    assert accounting.counters["runtime_total"] == pytest.approx(1200 / 3600)
+    assert accounting.counters["cycles_today"] == 0
+    assert accounting.counters["cycles_total"] == 1
@@ -0,0 +1,124 @@
+"""Tests for tracking the FaLs22 sample clock."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from custom_components.fals22.sample_clock import (
+    MIN_POLL_DELAY,
+    POLL_MARGIN,
+    PROBE_WIDTH,
+    DeviceSampleClock,
+)
+
+BASE = datetime(2024, 3, 1, 12, 0)
+CADENCE = 60.0
+
+
+class FakeDevice:
+    """Device that updates its values every CADENCE seconds of the host."""
+
+    def __init__(self, phase: float, offset: float = 0.0) -> None:
+        """Initialize the device, its clock is offset seconds ahead."""
+        self.phase = phase
+        self.offset = offset
+
+    def update_number(self, now: float) -> int:
+        """Return the number of the last update before now."""
+        return int((now - self.phase) // CADENCE)
+
+    def poll(self, clock: DeviceSampleClock, now: float) -> bool:
+        """Let the clock observe the sample the device returns at now."""
+        number = self.update_number(now)
+        # The device stamps its samples with whole minutes
+        local_now = BASE + timedelta(seconds=now - self.phase - self.offset)
+        return clock.observe(
+            BASE + timedelta(minutes=number), {"sample": number}, now, local_now
+        )
+
+
+def _run(
+    device: FakeDevice, interval: float, polls: int
+) -> tuple[DeviceSampleClock, list[tuple[float, bool]]]:
+    """Poll the device as the clock schedules it.
+
+    Returns the clock and the time of every poll with whether it returned a
+    new sample.
+    """
+    clock = DeviceSampleClock()
+    now = 1000.0
+    seen = []
+    for _ in range(polls):
+        seen.append((now, device.poll(clock, now)))
+        delay = clock.next_poll_delay(now, interval)
+        assert MIN_POLL_DELAY <= delay <= interval + (clock.cadence or 0)
+        now += delay
+    return clock, seen
+
+
+def test_unknown_cadence_polls_at_interval() -> None:
+    """The configured interval is used until the device updates are known."""
+    clock = DeviceSampleClock()
+    assert clock.next_poll_delay(0, 30) == 30
+    FakeDevice(0).poll(clock, 10)
+    assert clock.cadence is None
+    assert clock.next_poll_delay(10, 30) == 30
+
+
+@pytest.mark.parametrize("phase", [3.3, 17.0, 42.8, 59.5])
+@pytest.mark.parametrize("interval", [30, 60])
+def test_polls_follow_device_updates(phase: float, interval: float) -> None:
+    """Polls land shortly after the device updates once the cadence is known."""
+    device = FakeDevice(phase)
+    clock, seen = _run(device, interval, 120)
+
+    assert clock.cadence == pytest.approx(CADENCE, rel=1e-3)
+    news = [now for now, is_new in seen[20:] if is_new]
+    repeats = len(seen[20:]) - len(news)
+    # Occasional probes may land just before an update to find its time
+    assert repeats <= len(seen[20:]) / 5
+    for now in news:
+        update = device.phase + device.update_number(now) * CADENCE
+        assert now - update <= POLL_MARGIN + PROBE_WIDTH
+
+
+def test_long_interval_is_kept() -> None:
+    """Aligning polls to updates does not poll much more often than configured."""
+    device = FakeDevice(21.0)
+    _, seen = _run(device, 300, 40)
+
+    elapsed = seen[-1][0] - seen[0][0]
+    assert elapsed / (len(seen) - 1) >= 300 * 0.9
+
+
+def test_repeated_samples() -> None:
+    """A sample equal to the previous one is reported as repeated."""
+    clock = DeviceSampleClock()
+    device = FakeDevice(0)
+    assert device.poll(clock, 10)
+    assert not device.poll(clock, 20)
+    assert not device.poll(clock, 30)
+    assert device.poll(clock, 70)
+    assert clock.repeated_samples == 2
+    assert clock.as_dict()["repeated_samples"] == 2
+
+
+def test_clock_offset() -> None:
+    """The offset of the device clock is measured from precisely timed updates."""
+    device = FakeDevice(17.0, offset=-42.0)
+    clock, _ = _run(device, 60, 60)
+
+    assert clock.clock_offset == pytest.approx(-42.0, abs=PROBE_WIDTH)
+
+
+def test_clock_set_back() -> None:
+    """A device clock that goes back starts the learning again."""
+    clock = DeviceSampleClock()
+    clock.observe(BASE, {"sample": 1}, 0, BASE)
+    clock.observe(BASE + timedelta(minutes=1), {"sample": 2}, 61, BASE)
+    assert clock.cadence == CADENCE
+
+    clock.observe(BASE - timedelta(hours=1), {"sample": 3}, 122, BASE)
+
+    assert clock.cadence is None
+    assert clock.device_time == BASE - timedelta(hours=1)
+    assert clock.next_poll_delay(122, 30) == 30
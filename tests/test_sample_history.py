@@ -0,0 +1,141 @@
+"""Tests for the FaLs22 sample history."""
+import math
+import random
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.fals22.sample_history import (
+    STORAGE_VERSION,
+    SampleHistory,
+    history_depth,
+)
+
+DEPTH = 100
+
+
+def _fill(history: SampleHistory, count: int, seed: int = 1) -> list[tuple[float, float]]:
+    """Add samples of the indoor temperature at uneven intervals."""
+    rng = random.Random(seed)
+    timestamp = 1_700_000_000.0
+    added = []
+    for _ in range(count):
+        timestamp += rng.choice((30, 60, 60, 120, 900))
+        # Halves are exact in the float32 buffers
+        value = rng.randint(-20, 60) / 2
+        history.add(timestamp, {"temp_in": value})
+        added.append((timestamp, value))
+    return added
+
+
+def test_rolling_stats_match_window(hass: HomeAssistant) -> None:
+    """Mean, minimum and maximum cover the span and the depth of the buffer."""
+    history = SampleHistory(hass, "entry", DEPTH)
+    added = []
+    rng = random.Random(2)
+    timestamp = 1_700_000_000.0
+    for _ in range(3 * DEPTH):
+        timestamp += rng.choice((30, 60, 60, 120, 900))
+        value = rng.randint(-20, 60) / 2
+        history.add(timestamp, {"temp_in": value})
+        added.append((timestamp, value))
+
+        for window, span in (("1h", 3600), ("24h", 86400)):
+            expected = [
+                sample for time, sample in added[-DEPTH:] if time >= timestamp - span
+            ]
+            stats = history.stats[("temp_in", window)]
+            assert stats.count == len(expected)
+            assert stats.minimum == min(expected)
+            assert stats.maximum == max(expected)
+            assert stats.mean == pytest.approx(sum(expected) / len(expected))
+
+
+def test_missing_values_are_skipped(hass: HomeAssistant) -> None:
+    """Values the device could not measure do not enter the statistics."""
+    history = SampleHistory(hass, "entry", DEPTH)
+    history.add(1000.0, {"temp_in": 20.0})
+    history.add(1060.0, {"temp_in": "--"})
+    history.add(1120.0, {"temp_in": ""})
+    history.add(1180.0, {"temp_in": None})
+    history.add(1240.0, {"temp_in": "21.5"})
+
+    stats = history.stats[("temp_in", "1h")]
+    assert stats.count == 2
+    assert stats.mean == 20.75
+    assert math.isnan(history.samples()[1][1]["temp_in"])
+    assert history.stats[("temp_out", "1h")].mean is None
+
+
+def test_samples_and_resize(hass: HomeAssistant) -> None:
+    """The buffer returns the newest samples in order and keeps them on resize."""
+    history = SampleHistory(hass, "entry", DEPTH)
+    added = _fill(history, DEPTH + 30)
+
+    assert [(time, sample["temp_in"]) for time, sample in history.samples()] == added[-DEPTH:]
+
+    history.resize(40)
+    assert [(time, sample["temp_in"]) for time, sample in history.samples()] == added[-40:]
+    stats = history.stats[("temp_in", "24h")]
+    expected = [value for time, value in added[-40:] if time >= added[-1][0] - 86400]
+    assert stats.count == len(expected)
+    assert stats.maximum == max(expected)
+
+
+@pytest.mark.parametrize("count", [DEPTH // 2, DEPTH + 30])
+async def test_snapshot_round_trip(
+    hass: HomeAssistant, hass_storage: dict[str, Any], count: int
+) -> None:
+    """A restored history has the same samples and statistics."""
+    history = SampleHistory(hass, "entry", DEPTH)
+    _fill(history, count)
+    hass_storage["fals22.history.entry"] = {
+        "version": STORAGE_VERSION,
+        "key": "fals22.history.entry",
+        "data": history._snapshot(),
+    }
+
+    restored = SampleHistory(hass, "entry", DEPTH)
+    await restored.async_load()
+
+    def values(history: SampleHistory) -> list:
+        return [
+            (time, [None if math.isnan(value) else value for value in sample.values()])
+            for time, sample in history.samples()
+        ]
+
+    assert values(restored) == values(history)
+    for key, stats in history.stats.items():
+        assert restored.stats[key].count == stats.count
+        assert restored.stats[key].mean == pytest.approx(stats.mean)
+        assert restored.stats[key].minimum == stats.minimum
+
+
+async def test_invalid_snapshot_is_discarded(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """A damaged snapshot is not restored."""
+    history = SampleHistory(hass, "entry", DEPTH)
+    _fill(history, 10)
+    snapshot = history._snapshot()
+    snapshot["fields"]["temp_in"] = snapshot["fields"]["temp_in"][:8]
+    hass_storage["fals22.history.entry"] = {
+        "version": STORAGE_VERSION,
+        "key": "fals22.history.entry",
+        "data": snapshot,
+    }
+
+    restored = SampleHistory(hass, "entry", DEPTH)
+    await restored.async_load()
+
+    assert restored.samples() == []
+
+
+@pytest.mark.parametrize(
+    ("depth", "scan_interval", "expected"),
+    [(1440, 60, 1440), (1440, 30, 2880), (1440, 45, 1920), (5000, 30, 5000), (60, 3600, 60)],
+)
+def test_history_depth(depth: int, scan_interval: int, expected: int) -> None:
+    """The depth covers the 24 h window at the scan interval."""
+    assert history_depth(depth, scan_interval) == expected
@@ -0,0 +1,63 @@
+"""Tests for the FaLs22 trend regression."""
+import random
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.fals22.const import TREND_MIN_SAMPLES, TREND_WINDOW
+from custom_components.fals22.sample_history import SampleHistory
+
+
+def _least_squares_slope(points: list[tuple[float, float]]) -> float:
+    """Return the slope of the least squares line through the points."""
+    count = len(points)
+    mean_x = sum(x for x, _ in points) / count
+    mean_y = sum(y for _, y in points) / count
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    return covariance / variance
+
+
+def test_slope_matches_least_squares(hass: HomeAssistant) -> None:
+    """The incremental slope equals the regression over the window."""
+    history = SampleHistory(hass, "entry", 500)
+    trend = history.trends["abs_hum_in"]
+    rng = random.Random(3)
+    timestamp = 1_700_000_000.0
+    added = []
+    # Long enough for the sums to be rebased several times
+    for _ in range(2000):
+        timestamp += rng.choice((20, 60, 60, 90))
+        # Quarters are exact in the float32 buffers
+        value = round(4 * (10 + rng.uniform(-2, 2) + (timestamp % 7200) / 3600)) / 4
+        history.add(timestamp, {"abs_hum_in": value})
+        added.append((timestamp, value))
+
+        window = [point for point in added[-100:] if point[0] >= timestamp - TREND_WINDOW]
+        if len(window) < TREND_MIN_SAMPLES:
+            assert trend.slope is None
+        else:
+            assert trend.slope == pytest.approx(
+                _least_squares_slope(window), rel=1e-6, abs=1e-12
+            )
+
+
+def test_slope_needs_samples(hass: HomeAssistant) -> None:
+    """The slope is unknown with too few samples or without values."""
+    history = SampleHistory(hass, "entry", 100)
+    trend = history.trends["temp_in"]
+
+    history.add(1000.0, {"temp_in": 20.0})
+    history.add(1060.0, {"temp_in": 21.0})
+    assert trend.slope is None
+
+    history.add(1120.0, {"temp_in": "--"})
+    assert trend.slope is None
+
+    history.add(1180.0, {"temp_in": 23.0})
+    assert trend.slope == pytest.approx(_least_squares_slope([(0, 20), (60, 21), (180, 23)]))
+
+    # The window empties after a long gap
+    history.add(1180.0 + 2 * TREND_WINDOW, {"temp_in": 20.0})
+    assert trend.count == 1
+    assert trend.slope is None
@@ -0,0 +1,208 @@
+"""Tests for the FaLs22 dewpoint tables and ventilation decision."""
+from datetime import datetime
+import math
+
+import pytest
+
+from custom_components.fals22.psychrometrics import MAGNUS_A, MAGNUS_B, dewpoint, dewpoints
+from custom_components.fals22.ventilation_logic import (
+    REASON_INDOOR_TOO_COLD,
+    REASON_MISSING_DATA,
+    REASON_OUTDOOR_TOO_HUMID,
+    REASON_OUTDOOR_TOO_WARM,
+    REASON_OUTSIDE_WORKING_HOURS,
+    REASON_TARGET_HUMIDITY_REACHED,
+    device_time,
+    evaluate_ventilation,
+    in_working_window,
+    seconds_until_working_window,
+)
+
+SETTINGS = {
+    "min_temp": 10,
+    "max_temp": 30,
+    "min_hum": 55,
+    "difference": 1.5,
+    "working_hours_from": 6,
+    "working_minutes_from": 0,
+    "working_hours_to": 22,
+    "working_minutes_to": 0,
+}
+LIVE = {
+    "temp_in": 15.0,
+    "temp_out": 8.0,
+    "hum_in": 70.0,
+    "hum_out": 80.0,
+    "abs_hum_in": 9.0,
+    "abs_hum_out": 6.8,
+}
+NOON = datetime(2024, 3, 1, 12, 0)
+
+
+def _magnus_dewpoint(temperature: float, humidity: float) -> float:
+    """Return the dewpoint from the Magnus formula."""
+    gamma = math.log(humidity / 100) + MAGNUS_A * temperature / (MAGNUS_B + temperature)
+    return MAGNUS_B * gamma / (MAGNUS_A - gamma)
+
+
+@pytest.mark.parametrize("temperature", [-40.0, -12.3, 0.0, 0.1, 19.9, 25.4, 60.0])
+@pytest.mark.parametrize("humidity", [0.1, 5.5, 42.0, 63.7, 99.9, 100.0])
+def test_dewpoint_matches_formula(temperature: float, humidity: float) -> None:
+    """The tables give the formula for every value the device reports."""
+    assert dewpoint(temperature, humidity) == pytest.approx(
+        _magnus_dewpoint(temperature, humidity), rel=1e-12, abs=1e-12
+    )
+
+
+@pytest.mark.parametrize("temperature", [-45.2, 70.0])
+def test_dewpoint_outside_table(temperature: float) -> None:
+    """Temperatures outside the table fall back to the formula."""
+    assert dewpoint(temperature, 50.0) == pytest.approx(_magnus_dewpoint(temperature, 50.0))
+
+
+def test_dewpoint_undefined() -> None:
+    """Missing values and dry air have no dewpoint."""
+    assert dewpoint(None, 50.0) is None
+    assert dewpoint(20.0, None) is None
+    assert dewpoint(20.0, 0.0) is None
+    assert dewpoint(20.0, 0.04) is None
+    assert dewpoint("--", 50.0) is None
+    assert dewpoint(20.0, "") is None
+    assert dewpoint("20.0", "50") == dewpoint(20.0, 50.0)
+
+
+def test_dewpoints_batch() -> None:
+    """The batch gives the same values as single calls."""
+    temperatures = [20.0, None, -5.5, 30.1]
+    humidities = [50.0, 60.0, 85.2, 0.0]
+    assert dewpoints(temperatures, humidities) == [
+        dewpoint(temperature, humidity)
+        for temperature, humidity in zip(temperatures, humidities)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "hour", "minute", "expected"),
+    [
+        ((6, 0), (22, 0), 5, 59, False),
+        ((6, 0), (22, 0), 6, 0, True),
+        ((6, 0), (22, 0), 22, 0, False),
+        ((22, 30), (6, 0), 23, 0, True),
+        ((22, 30), (6, 0), 5, 59, True),
+        ((22, 30), (6, 0), 12, 0, False),
+        ((8, 0), (8, 0), 3, 0, True),
+    ],
+)
+def test_working_window(
+    start: tuple[int, int], end: tuple[int, int], hour: int, minute: int, expected: bool
+) -> None:
+    """The window may span midnight, equal times mean all day."""
+    settings = {
+        "working_hours_from": start[0],
+        "working_minutes_from": start[1],
+        "working_hours_to": end[0],
+        "working_minutes_to": end[1],
+    }
+    assert in_working_window(settings, hour, minute) is expected
+
+
+def test_seconds_until_working_window() -> None:
+    """The wait ends at the next start of the working hours."""
+    assert seconds_until_working_window(SETTINGS, NOON) == 0
+    assert seconds_until_working_window(SETTINGS, datetime(2024, 3, 1, 5, 30, 15)) == 1785
+    assert seconds_until_working_window(SETTINGS, datetime(2024, 3, 1, 23, 0)) == 7 * 3600
+
+
+def test_device_time() -> None:
+    """The device clock is read from the live data."""
+    live = {"year": 2024, "month": 3, "day": 1, "hours": 12, "minutes": 5}
+    assert device_time(live) == datetime(2024, 3, 1, 12, 5)
+    assert device_time({**live, "month": 13}) is None
+    assert device_time({}) is None
+
+
+def test_ventilation_allowed() -> None:
+    """Ventilation is allowed when nothing blocks it."""
+    result = evaluate_ventilation([(LIVE, SETTINGS, NOON)])[0]
+    assert result == {
+        "dewpoint_in": round(_magnus_dewpoint(15.0, 70.0), 1),
+        "dewpoint_out": round(_magnus_dewpoint(8.0, 80.0), 1),
+        "ventilation_allowed": True,
+        "ventilation_blockers": [],
+    }
+
+
+@pytest.mark.parametrize(
+    ("live", "now", "reasons"),
+    [
+        (LIVE, datetime(2024, 3, 1, 23, 0), [REASON_OUTSIDE_WORKING_HOURS]),
+        ({**LIVE, "temp_in": 9.9}, NOON, [REASON_INDOOR_TOO_COLD]),
+        ({**LIVE, "temp_out": 30.1}, NOON, [REASON_OUTDOOR_TOO_WARM]),
+        ({**LIVE, "hum_in": 55.0}, NOON, [REASON_TARGET_HUMIDITY_REACHED]),
+        ({**LIVE, "abs_hum_out": 7.6}, NOON, [REASON_OUTDOOR_TOO_HUMID]),
+        (
+            {**LIVE, "temp_in": 5.0, "abs_hum_out": 9.5},
+            NOON,
+            [REASON_INDOOR_TOO_COLD, REASON_OUTDOOR_TOO_HUMID],
+        ),
+    ],
+)
+def test_ventilation_blockers(live: dict, now: datetime, reasons: list[str]) -> None:
+    """Every condition that keeps the fan off is reported."""
+    result = evaluate_ventilation([(live, SETTINGS, now)])[0]
+    assert result["ventilation_blockers"] == reasons
+    assert result["ventilation_allowed"] is False
+
+
+def test_ventilation_missing_data() -> None:
+    """The decision is unknown without all values and settings."""
+    live = {key: value for key, value in LIVE.items() if key != "abs_hum_out"}
+    settings = {key: value for key, value in SETTINGS.items() if key != "min_hum"}
+
+    results = evaluate_ventilation([(live, SETTINGS, NOON), (LIVE, settings, NOON)])
+
+    for result in results:
+        assert result["ventilation_allowed"] is None
+        assert result["ventilation_blockers"] == [REASON_MISSING_DATA]
+    assert results[0]["dewpoint_in"] is not None
+
+
+def test_evaluate_batch() -> None:
+    """A batch gives the same results as devices evaluated one by one."""
+    samples = [
+        (LIVE, SETTINGS, NOON),
+        ({**LIVE, "temp_in": 5.0, "hum_in": 40.5}, SETTINGS, NOON),
+        ({**LIVE, "hum_out": None}, SETTINGS, datetime(2024, 3, 1, 2, 0)),
+    ]
+    assert evaluate_ventilation(samples) == [
+        evaluate_ventilation([sample])[0] for sample in samples
+    ]
+
+
+@pytest.mark.parametrize("value", ["--", ""])
+@pytest.mark.parametrize("key", ["temp_in", "abs_hum_out"])
+def test_ventilation_unparsable_live_value(key: str, value: str) -> None:
+    """Values the device could not measure count as missing."""
+    result = evaluate_ventilation([({**LIVE, key: value}, SETTINGS, NOON)])[0]
+    assert result["ventilation_allowed"] is None
+    assert result["ventilation_blockers"] == [REASON_MISSING_DATA]
+    if key == "temp_in":
+        assert result["dewpoint_in"] is None
+
+
+@pytest.mark.parametrize("value", ["--", ""])
+def test_ventilation_unparsable_setting(value: str) -> None:
+    """Settings that are not numbers count as missing."""
+    settings = {**SETTINGS, "min_hum": value, "working_hours_to": value}
+    result = evaluate_ventilation([(LIVE, settings, NOON)])[0]
+    assert result["ventilation_allowed"] is None
+    assert result["ventilation_blockers"] == [REASON_MISSING_DATA]
+    assert seconds_until_working_window(settings, datetime(2024, 3, 1, 5, 0)) == 3600
+
+
+def test_ventilation_numbers_as_text() -> None:
+    """Numbers sent as text are compared as numbers."""
+    live = {key: str(value) for key, value in LIVE.items()}
+    assert evaluate_ventilation([(live, SETTINGS, NOON)]) == evaluate_ventilation(
+        [(LIVE, SETTINGS, NOON)]
+    )
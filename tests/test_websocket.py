@@ -0,0 +1,78 @@
+"""Tests for the FaLs22 websocket subscription."""
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from custom_components.fals22.const import DOMAIN
+from custom_components.fals22.websocket import state_delta
+
+
+def test_state_delta() -> None:
+    """Only changed fields are sent, removed fields as None."""
+    old = {"available": True, "live": {"temp_in": 15.0, "on": 0}, "settings": {"min_temp": 10}}
+
+    assert state_delta(old, {**old}) == {}
+    assert state_delta(
+        old,
+        {"available": False, "live": {"temp_in": 15.5, "on": 0}, "derived": {"dewpoint_in": 9.6}},
+    ) == {
+        "available": False,
+        "live": {"temp_in": 15.5},
+        "settings": {"min_temp": None},
+        "derived": {"dewpoint_in": 9.6},
+    }
+
+
+async def test_subscribe(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """A snapshot is followed by the fields changed by an update."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id({"type": "fals22/subscribe"})
+    assert (await client.receive_json())["success"]
+    snapshot = (await client.receive_json())["event"]["units"][init_integration.entry_id]
+    assert snapshot["host"] == "192.0.2.1"
+    assert snapshot["live"]["temp_in"] == 15.0
+
+    coordinator.async_set_updated_data(
+        {**coordinator.data, "live": {**coordinator.data["live"], "temp_in": 16.0}}
+    )
+
+    event = (await client.receive_json())["event"]
+    assert event == {"changes": {init_integration.entry_id: {"live": {"temp_in": 16.0}}}}
+
+
+async def test_subscribe_throttled(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Updates within the throttle interval collapse into one message."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "fals22/subscribe", "throttle": 60})
+    assert (await client.receive_json())["success"]
+    await client.receive_json()
+
+    data = coordinator.data
+    for temp_in, on in ((16.0, 1), (17.0, 1), (17.0, 0)):
+        coordinator.async_set_updated_data(
+            {**data, "live": {**data["live"], "temp_in": temp_in, "on": on}}
+        )
+        await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=61))
+    event = (await client.receive_json())["event"]
+
+    # The fan ran in between, but the subscriber last saw it off
+    assert event == {"changes": {init_integration.entry_id: {"live": {"temp_in": 17.0}}}}
@@ -0,0 +1,126 @@
+"""Tests for the FaLs22 write queue."""
+import time
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+
+from custom_components.fals22.write_queue import STORAGE_VERSION, FALS22WriteQueue
+
+MAX_AGE = 600
+
+
+def test_settings_coalesce(hass: HomeAssistant) -> None:
+    """Later values of a setting replace earlier ones."""
+    queue = FALS22WriteQueue(hass, "entry", MAX_AGE)
+    assert not queue
+
+    queue.queue_settings({"min_temp": 10})
+    queue.queue_settings({"min_temp": 12, "min_hum": 60})
+
+    assert queue
+    assert queue.pending_settings() == {"min_temp": 12, "min_hum": 60}
+
+
+def test_clear_keeps_replaced_settings(hass: HomeAssistant) -> None:
+    """Settings queued again while a replay ran stay queued."""
+    queue = FALS22WriteQueue(hass, "entry", MAX_AGE)
+    queue.queue_settings({"min_temp": 12, "min_hum": 60})
+    replayed = queue.pending_settings()
+
+    queue.queue_settings({"min_temp": 14})
+    queue.clear_settings(replayed)
+
+    assert queue.pending_settings() == {"min_temp": 14}
+
+
+def test_settings_expire(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Settings older than the maximum age are dropped."""
+    queue = FALS22WriteQueue(hass, "entry", MAX_AGE)
+    queue.queue_settings({"min_temp": 12})
+    freezer.tick(MAX_AGE / 2)
+    queue.queue_settings({"min_hum": 60})
+
+    freezer.tick(MAX_AGE / 2 + 1)
+    assert queue.pending_settings() == {"min_hum": 60}
+
+    freezer.tick(MAX_AGE / 2)
+    assert queue.pending_settings() == {}
+    assert not queue
+
+
+def test_drop_settings(hass: HomeAssistant) -> None:
+    """Settings written directly are removed whatever value was queued."""
+    queue = FALS22WriteQueue(hass, "entry", MAX_AGE)
+    queue.queue_settings({"min_temp": 12, "min_hum": 60})
+
+    queue.drop_settings({"min_temp": 14, "difference": 2.0})
+
+    assert queue.pending_settings() == {"min_hum": 60}
+
+
+def test_reading_does_not_drop(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Expired writes are left out when read and only removed by drop_expired."""
+    queue = FALS22WriteQueue(hass, "entry", MAX_AGE)
+    queue.queue_settings({"min_temp": 12})
+    queue.queue_manual(5, True)
+    freezer.tick(MAX_AGE + 1)
+
+    with patch.object(queue, "_async_schedule_save") as schedule_save:
+        assert queue.as_attributes() == {}
+        assert not queue
+        schedule_save.assert_not_called()
+
+        queue.drop_expired()
+        schedule_save.assert_called_once()
+
+
+def test_manual_replaces_and_shortens(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Only the newest manual request is kept, for the time that is left of it."""
+    queue = FALS22WriteQueue(hass, "entry", 3600)
+    queue.queue_manual(60, False)
+    queue.queue_manual(30, True)
+
+    freezer.tick(10 * 60)
+    assert queue.pending_manual() == (20, True)
+
+    freezer.tick(20 * 60)
+    assert queue.pending_manual() is None
+    assert not queue
+
+
+def test_manual_off_is_not_shortened(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A request to switch the fan off keeps its duration."""
+    queue = FALS22WriteQueue(hass, "entry", 3600)
+    queue.queue_manual(30, False)
+
+    freezer.tick(40 * 60)
+    assert queue.pending_manual() == (30, False)
+    assert queue.as_attributes() == {"manual_duration": 30, "manual_on": False}
+
+
+async def test_load_drops_expired(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Writes restored from storage are subject to the maximum age."""
+    now = time.time()
+    hass_storage["fals22.write_queue.entry"] = {
+        "version": STORAGE_VERSION,
+        "key": "fals22.write_queue.entry",
+        "data": {
+            "settings": {
+                "min_temp": {"value": 12, "queued": now - 60},
+                "min_hum": {"value": 60, "queued": now - MAX_AGE - 60},
+            },
+            "manual": {"duration": 30, "on": True, "queued": now - MAX_AGE - 60},
+        },
+    }
+    queue = FALS22WriteQueue(hass, "entry", MAX_AGE)
+
+    await queue.async_load()
+
+    assert queue.pending_settings() == {"min_temp": 12}
+    assert queue.pending_manual() is None